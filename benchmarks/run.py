@@ -0,0 +1,121 @@
+"""Runs the surfinpy benchmark suite.
+
+Every workload in workloads.py is timed with time.perf_counter, taking the
+best and median of several repeats, and run once more under tracemalloc to
+find its peak memory. Results are written to results/<commit>.json so that
+runs from different commits can be compared.
+
+Usage::
+
+    python benchmarks/run.py
+    python benchmarks/run.py --filter mu_vs_mu --repeat 5
+    python benchmarks/run.py --compare results/abc1234.json results/def5678.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from workloads import WORKLOADS  # noqa: E402
+
+
+def commit():
+    """Short hash of the checked out commit, with a suffix if the tree has
+    uncommitted changes."""
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                      cwd=HERE, universal_newlines=True).strip()
+        dirty = subprocess.call(['git', 'diff', '--quiet', 'HEAD', '--',
+                                 '../surfinpy'], cwd=HERE)
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return sha + ('-dirty' if dirty else '')
+
+
+def measure(make, params, repeat):
+    """Times one workload and measures its peak traced memory."""
+    run = make(**params)
+    run()
+    times = []
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'time_min': min(times),
+            'time_median': float(np.median(times)),
+            'peak_bytes': peak}
+
+
+def run(pattern=None, repeat=3):
+    results = []
+    for name, make, parameters in WORKLOADS:
+        if pattern and pattern not in name:
+            continue
+        for params in parameters:
+            result = {'name': name, 'params': params}
+            result.update(measure(make, params, repeat))
+            results.append(result)
+            print('{:32} {:40} {:10.4f} s {:10.1f} MiB'.format(
+                name, json.dumps(params), result['time_min'],
+                result['peak_bytes'] / 2**20))
+    return results
+
+
+def compare(before, after):
+    """Prints the change in time and peak memory of every workload present
+    in both result files."""
+    with open(before) as file:
+        old = json.load(file)
+    with open(after) as file:
+        new = json.load(file)
+    key = lambda r: (r['name'], json.dumps(r['params'], sort_keys=True))
+    previous = {key(r): r for r in old['results']}
+    print('{} -> {}'.format(old['commit'], new['commit']))
+    for result in new['results']:
+        if key(result) not in previous:
+            continue
+        was = previous[key(result)]
+        print('{:32} {:40} time x{:7.3f} memory x{:7.3f}'.format(
+            result['name'], json.dumps(result['params']),
+            result['time_min'] / was['time_min'],
+            result['peak_bytes'] / max(was['peak_bytes'], 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', help='only run workloads matching this')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=os.path.join(HERE, 'results'))
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    results = run(args.filter, args.repeat)
+    name = commit()
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, name + '.json')
+    with open(path, 'w') as file:
+        json.dump({'commit': name,
+                   'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'python': platform.python_version(),
+                   'numpy': np.__version__,
+                   'machine': platform.machine(),
+                   'results': results}, file, indent=1)
+    print('Results written to {}'.format(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""Workloads for the surfinpy benchmark suite.
+
+Each workload is a function taking its parameters and returning a callable
+that performs the timed work. Anything that should not be timed, such as
+building DataSets or writing synthetic files, happens before the callable
+is returned.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+import numpy as np
+import yaml
+from surfinpy import data
+from surfinpy import mu_vs_mu
+from surfinpy import bulk_mu_vs_mu
+from surfinpy import bulk_mu_vs_t
+from surfinpy import p_vs_t
+from surfinpy import wulff
+from surfinpy import thermo
+from surfinpy import utils as ut
+from surfinpy import vibrational_data as vd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REF_FILES = os.path.join(ROOT, 'examples', 'Notebooks', 'Bulk', 'ref_files')
+NIST = os.path.join(REF_FILES, 'H2O.txt')
+VIB_FILES = ['bulk_vib.yaml', 'A_vib.yaml', 'B_vib.yaml', 'C_vib.yaml',
+             'D_vib.yaml', 'E_vib.yaml', 'F_vib.yaml']
+
+_scratch = tempfile.mkdtemp(prefix='surfinpy-bench-')
+
+
+@contextmanager
+def _uncached():
+    """Runs a workload without any cached vibrational or NIST data, putting
+    the NIST cache directory back afterwards."""
+    vd.clear_cache()
+    thermo.clear_cache()
+    previous = thermo._cache_dir
+    thermo.set_cache_dir(None)
+    try:
+        yield
+    finally:
+        thermo.set_cache_dir(previous)
+
+
+def _surfaces(nphases, seed=0):
+    """Synthetic surface DataSets with a range of excesses and energies."""
+    rng = np.random.default_rng(seed)
+    phases = [data.DataSet(cation=24, x=48, y=0, area=60.22, energy=-575.0,
+                           label='Stoich', nspecies=1)]
+    for i in range(1, nphases):
+        x = int(rng.integers(44, 53))
+        y = int(rng.integers(0, 9))
+        energy = -575.0 - 4.9 * (x - 48) - 12.5 * y + rng.normal(0, 2.0)
+        phases.append(data.DataSet(cation=24, x=x, y=y, area=60.22,
+                                   energy=energy, label='S{}'.format(i),
+                                   nspecies=1))
+    return phases
+
+
+def _bulk_phases(nphases, entropy=False, temp_range=None, seed=0):
+    """Synthetic bulk DataSets, cycling through the tutorial vibrational
+    files when entropy is wanted."""
+    rng = np.random.default_rng(seed)
+    phases = []
+    for i in range(0, nphases):
+        x = int(rng.integers(0, 11))
+        y = int(rng.integers(0, 51))
+        energy = -92.0 - 21.7 * x - 13.6 * y + rng.normal(0, 5.0)
+        vib_file = os.path.join(REF_FILES, VIB_FILES[i % len(VIB_FILES)])
+        phases.append(data.DataSet(cation=10, x=x, y=y, energy=energy,
+                                   label='P{}'.format(i), funits=10,
+                                   file=vib_file, entropy=entropy,
+                                   zpe=entropy, temp_range=temp_range))
+    return phases
+
+
+def _vib_file(nmodes, seed=0):
+    """Writes a synthetic vibrational frequency file."""
+    path = os.path.join(_scratch, 'modes_{}_{}.yaml'.format(nmodes, seed))
+    if not os.path.exists(path):
+        rng = np.random.default_rng(seed)
+        frequencies = np.sort(rng.uniform(50, 3600, nmodes))[::-1]
+        with open(path, 'w') as file:
+            yaml.safe_dump({'F-Units': 4,
+                            'Frequencies': frequencies.round(1).tolist()},
+                           file)
+    return path
+
+
+def surface_mu_vs_mu(nphases, increments, precision='double'):
+    phases = _surfaces(nphases)
+    bulk = data.ReferenceDataSet(cation=1, anion=2, energy=-780.0, funits=4)
+    deltaX = {'Range': [-3, 2], 'Label': 'O'}
+    deltaY = {'Range': [-3, 2], 'Label': 'H_2O'}
+    return lambda: mu_vs_mu.calculate(phases, bulk, deltaX, deltaY, -20.0,
+                                      -14.0, increments=increments,
+                                      precision=precision)
+
+
+def bulk_chemical_potentials(nphases, width):
+    phases = _bulk_phases(nphases)
+    bulk = data.ReferenceDataSet(cation=1, anion=1, energy=-92.0, funits=10)
+    deltaX = {'Range': [-width, 0], 'Label': 'CO_2'}
+    deltaY = {'Range': [-width, 0], 'Label': 'H_2O'}
+    return lambda: bulk_mu_vs_mu.calculate(phases, bulk, deltaX, deltaY,
+                                           -20.53, -12.83)
+
+
+def bulk_temperature(nphases, temperatures):
+    temp_range = [273, 273 + temperatures]
+    phases = _bulk_phases(nphases, True, temp_range)
+    bulk = data.ReferenceDataSet(cation=1, anion=1, energy=-92.0, funits=10,
+                                 file=os.path.join(REF_FILES, 'bulk_vib.yaml'),
+                                 entropy=True, zpe=True,
+                                 temp_range=temp_range)
+    deltaX = {'Range': [-1, 0.6], 'Label': 'CO_2'}
+    deltaZ = {'Range': temp_range, 'Label': 'T'}
+    exp_x = ut.temperature_correction_range(os.path.join(REF_FILES, 'CO2.txt'),
+                                            deltaZ)
+    exp_y = ut.temperature_correction_range(os.path.join(REF_FILES, 'H2O.txt'),
+                                            deltaZ)
+
+    def run():
+        vd.clear_cache()
+        bulk_mu_vs_t.calculate(phases, bulk, deltaX, deltaZ, -20.53, -12.83,
+                               0, exp_x, exp_y)
+    return run
+
+
+def pressure_temperature(nphases, max_t):
+    phases = _surfaces(nphases + 1)
+    stoich, adsorbed = phases[0], phases[1:]
+    for i, phase in enumerate(adsorbed):
+        phase.y = i + 1
+    thermochem = ut.read_nist(NIST)
+    return lambda: p_vs_t.calculate(stoich, adsorbed, 1.0, -14.0, thermochem,
+                                    max_t=max_t)
+
+
+def wulff_surface_energy(nphases, points):
+    phases = _surfaces(nphases + 1)
+    stoich, adsorbed = phases[0], phases[1:]
+    for i, phase in enumerate(adsorbed):
+        phase.y = i + 1
+    thermochem = ut.read_nist(NIST)
+    T = np.linspace(300, 1000, points)
+
+    def run():
+        with _uncached():
+            for t in T:
+                wulff.calculate_surface_energy(stoich, adsorbed, 1.0, -14.0,
+                                               thermochem, t, 0.0)
+    return run
+
+
+def vib_calc(nmodes, temp_step):
+    vib_file = _vib_file(nmodes)
+    temp_r = np.arange(0, 1000, temp_step)
+
+    def run():
+        with _uncached():
+            vd.vib_calc(vib_file, temp_r)
+    return run
+
+
+def fit_nist(increments):
+    def run():
+        with _uncached():
+            ut.fit_nist(NIST, increments=increments)
+    return run
+
+
+WORKLOADS = [
+    ('mu_vs_mu.calculate', surface_mu_vs_mu,
+     [{'nphases': n, 'increments': i} for n in (2, 10, 50)
+      for i in (0.025, 0.005)] +
+     [{'nphases': n, 'increments': 0.005, 'precision': 'single'}
+      for n in (10, 50)]),
+    ('bulk_mu_vs_mu.calculate', bulk_chemical_potentials,
+     [{'nphases': n, 'width': w} for n in (2, 10, 50) for w in (2, 5)]),
+    ('bulk_mu_vs_t.calculate', bulk_temperature,
+     [{'nphases': n, 'temperatures': t} for n in (2, 7) for t in (10, 100)]),
+    ('p_vs_t.calculate', pressure_temperature,
+     [{'nphases': n, 'max_t': t} for n in (2, 20) for t in (1000, 3000)]),
+    ('wulff.calculate_surface_energy', wulff_surface_energy,
+     [{'nphases': n, 'points': p} for n in (2, 20) for p in (10, 100)]),
+    ('vibrational_data.vib_calc', vib_calc,
+     [{'nmodes': n, 'temp_step': s} for n in (30, 300, 3000)
+      for s in (1, 0.01)]),
+    ('utils.fit_nist', fit_nist,
+     [{'increments': i} for i in (1, 0.01)]),
+]
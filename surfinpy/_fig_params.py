@@ -7,10 +7,9 @@ Plot formatting
 # author: Adam R. Symington
 
 from collections import OrderedDict
-from matplotlib import rcParams, cycler
+from matplotlib import cycler
 import seaborn as sns
 
-sns.set_palette('colorblind')
 colors = sns.palettes.SEABORN_PALETTES['colorblind']
 
 FONTSIZE = 15
@@ -52,7 +51,5 @@ MASTER_FORMATTING = {
     "ytick.labelsize": FONTSIZE,
     "legend.fontsize": FONTSIZE * 0.8,
     "lines.linewidth": 2,
-}
-
-for k, v in MASTER_FORMATTING.items():
-    rcParams[k] = v
\ No newline at end of file
+    "axes.prop_cycle": cycler(color=colors),
+}
\ No newline at end of file
@@ -0,0 +1,202 @@
+import numpy as np
+
+# Points of a grid cell are stored at twice their grid index, so that edge
+# midpoints and cell centres have integer coordinates. For the cell whose
+# lower left corner is point (i, j) these are the (column, row) offsets
+# from (2j, 2i) of the midpoint of each edge and of the centre.
+_POINTS = {'bottom': (1, 0),
+           'right': (2, 1),
+           'top': (1, 2),
+           'left': (0, 1),
+           'centre': (1, 1)}
+
+
+def boundary_segments(z):
+    r"""Finds the line segments separating neighbouring phases in a grid of
+    phases, with a marching squares pass over every cell at once.
+
+    Each cell of four neighbouring grid points containing two phases is cut
+    by a segment joining the midpoints of the edges between them, or by two
+    segments when the phases sit on opposite corners. Each cell containing
+    three or four phases is cut by a segment from the midpoint of each
+    such edge to the centre of the cell, where the boundaries meet.
+
+    Parameters
+    ----------
+    z : :py:attr:`array_like`
+        two dimensional grid of ints, one for each phase
+
+    Returns
+    -------
+    start : :py:attr:`array_like`
+        (n, 2) array of ints, column and row of the first end of each
+        segment at twice its grid index
+    end : :py:attr:`array_like`
+        (n, 2) array of ints, the second end of each segment
+    pairs : :py:attr:`array_like`
+        (n, 2) array of the two phases either side of each segment, lower
+        phase first
+    """
+    z = np.asarray(z)
+    # Only the cells with more than one phase are looked at further
+    across = z[:, :-1] != z[:, 1:]
+    up = z[:-1, :] != z[1:, :]
+    i, j = np.nonzero(across[:-1] | across[1:] | up[:, :-1] | up[:, 1:])
+    a, b, c, d = z[i, j], z[i, j + 1], z[i + 1, j + 1], z[i + 1, j]
+    edges = {}
+    for name, p, q in (('bottom', a, b), ('right', b, c),
+                       ('top', c, d), ('left', d, a)):
+        edges[name] = (np.minimum(p, q), np.maximum(p, q))
+    active = {name: p != q for name, (p, q) in edges.items()}
+    distinct = (1 + (b != a) + ((c != a) & (c != b))
+                + ((d != a) & (d != b) & (d != c)))
+    count = sum(active.values())
+    two = (distinct == 2) & (count == 2)
+    saddle = (distinct == 2) & (count == 4)
+    many = distinct > 2
+
+    joins = []
+    names = ('bottom', 'right', 'top', 'left')
+    for n, first in enumerate(names):
+        for second in names[n + 1:]:
+            joins.append((two & active[first] & active[second],
+                          first, second))
+    # Phases on opposite corners are separated around the lower right and
+    # upper left corners
+    joins.append((saddle, 'bottom', 'right'))
+    joins.append((saddle, 'top', 'left'))
+    for name in names:
+        joins.append((many & active[name], name, 'centre'))
+
+    origin = np.column_stack((2 * j, 2 * i))
+    start, end, pairs = [], [], []
+    for mask, first, second in joins:
+        start.append(origin[mask] + _POINTS[first])
+        end.append(origin[mask] + _POINTS[second])
+        p, q = edges[first]
+        pairs.append(np.column_stack((p[mask], q[mask])))
+    return (np.concatenate(start), np.concatenate(end),
+            np.concatenate(pairs))
+
+
+def _join(start, end):
+    """Joins segments that share an end into polylines, returned as arrays
+    of point keys. Closed loops repeat their first point at the end.
+
+    No point is shared by more than two segments of the same pair of
+    phases, so each end of a segment is matched to at most one other end
+    by sorting the ends."""
+    count = start.size
+    ends = np.concatenate((start, end))
+    order = np.argsort(ends, kind='stable')
+    same = np.flatnonzero(ends[order[1:]] == ends[order[:-1]])
+    partner = np.full(2 * count, -1)
+    partner[order[same]] = order[same + 1]
+    partner[order[same + 1]] = order[same]
+    partner = partner.tolist()
+    used = [False] * count
+    free = [h for h in range(0, 2 * count) if partner[h] < 0]
+    lines = []
+    for first in free + list(range(0, count)):
+        if used[first % count]:
+            continue
+        line = [first]
+        h = first
+        while True:
+            used[h % count] = True
+            h = (h + count) % (2 * count)
+            line.append(h)
+            h = partner[h]
+            if h < 0 or used[h % count]:
+                break
+        lines.append(ends[line])
+    return lines
+
+
+def _simplify(points):
+    """Drops points lying on a straight line between their neighbours,
+    which changes nothing as the points are exact."""
+    if len(points) < 3:
+        return points
+    before = points[1:-1] - points[:-2]
+    after = points[2:] - points[1:-1]
+    cross = before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0]
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:-1] = cross != 0
+    return points[keep]
+
+
+def phase_boundaries(x, y, z):
+    """Extracts the boundaries between neighbouring phases of a phase
+    diagram as polylines, one or more for each pair of phases that touch.
+    The polylines are far smaller than the grid, so they can be stored,
+    compared and drawn cheaply, see :py:func:`draw_boundaries`.
+
+    Parameters
+    ----------
+    x : :py:attr:`array_like`
+        x axis, increasing or decreasing
+    y : :py:attr:`array_like`
+        y axis, increasing or decreasing
+    z : :py:attr:`array_like`
+        two dimensional grid of ints, one for each phase, with a row for
+        each point of y and a column for each point of x
+
+    Returns
+    -------
+    boundaries : :py:attr:`list`
+        Tuples of the two phases either side of a boundary, lower phase
+        first, and the (n, 2) array of points along it in axis units.
+        For the plotting objects the phases are positions in their labels.
+    """
+    z = np.asarray(z)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    start, end, pairs = boundary_segments(z)
+    rows = 2 * z.shape[0] - 1
+    start = start[:, 0] * rows + start[:, 1]
+    end = end[:, 0] * rows + end[:, 1]
+    order = np.lexsort((pairs[:, 1], pairs[:, 0]))
+    start, end, pairs = start[order], end[order], pairs[order]
+    split = np.flatnonzero(np.any(np.diff(pairs, axis=0), axis=1)) + 1
+    boundaries = []
+    for group in np.split(np.arange(start.size), split):
+        if group.size == 0:
+            continue
+        pair = (pairs[group[0], 0].item(), pairs[group[0], 1].item())
+        for line in _join(start[group], end[group]):
+            points = _simplify(np.column_stack((line // rows, line % rows)))
+            xs = np.interp(points[:, 0] / 2, np.arange(x.size), x)
+            ys = np.interp(points[:, 1] / 2, np.arange(y.size), y)
+            boundaries.append((pair, np.column_stack((xs, ys))))
+    return boundaries
+
+
+def draw_boundaries(ax, boundaries, colors='k', linewidths=1, **kwargs):
+    """Draws phase boundaries as lines on a plot, e.g. one drawn by a
+    plotting object with raster=True, or on their own.
+
+    Parameters
+    ----------
+    ax : :py:class:`matplotlib.axes.Axes`
+        Axes to draw on
+    boundaries : :py:attr:`list`
+        Boundaries from :py:func:`phase_boundaries`
+    colors : :py:attr:`str`
+        Line color
+    linewidths : :py:attr:`float`
+        Line width
+    kwargs : :py:attr:`dict`
+        Passed to :py:class:`matplotlib.collections.LineCollection`
+
+    Returns
+    -------
+    lines : :py:class:`matplotlib.collections.LineCollection`
+        Lines drawn
+    """
+    from matplotlib.collections import LineCollection
+    lines = LineCollection([points for pair, points in boundaries],
+                           colors=colors, linewidths=linewidths, **kwargs)
+    ax.add_collection(lines)
+    ax.autoscale_view()
+    return lines
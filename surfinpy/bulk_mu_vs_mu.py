@@ -1,9 +1,9 @@
 import numpy as np
 from surfinpy import plotting
 from surfinpy import utils as ut
+from surfinpy import profiling
+from surfinpy import envelope
 from surfinpy import vibrational_data as vd
-from scipy.interpolate import CubicSpline
-import sys
 
 def normalise_phase_energy(phase, bulk):
     r"""
@@ -58,7 +58,39 @@ def calculate_bulk_energy(deltamux, deltamuy, x_energy, y_energy,
         normalised_bulk - deltamux* phase.x - deltamuy* phase.y - (
         x_energy * phase.x) - (y_energy * phase.y))
 
-def evaluate_phases(data, bulk, x, y, nphases, x_energy, y_energy):
+def phase_energy(phase, bulk, deltamux, deltamuy, x_energy, y_energy):
+    """Calculates the free energy of a single phase as a function of
+    the chemical potential of x and y.
+
+    Parameters
+    ----------
+    phase : :py:class:`surfinpy.data.DataSet`
+        DFT calculation
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Reference dataset
+    deltamux : :py:attr:`array_like`
+        Chemical potential of species x
+    deltamuy : :py:attr:`array_like`
+        Chemical potential of species y
+    x_energy : :py:attr:`float`
+        DFT 0 K energy for species x
+    y_energy : :py:attr:`float`
+        DFT 0 K energy for species y
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        Free energies as a function of chemical potential of x and y
+    """
+    normalised_bulk = normalise_phase_energy(phase, bulk)
+    return calculate_bulk_energy(deltamux, deltamuy,
+                                 x_energy,
+                                 y_energy,
+                                 phase,
+                                 normalised_bulk)
+
+def evaluate_phases(data, bulk, x, y, nphases, x_energy, y_energy,
+                    tile=None, energy_dtype=float, precision='double'):
     """Calculates the free energies of each phase as a function of chemical
     potential of x and y. Then uses this data to evaluate which phase is most
     stable at that x/y chemical potential cross section.
@@ -79,28 +111,84 @@ def evaluate_phases(data, bulk, x, y, nphases, x_energy, y_energy):
         DFT 0 K energy for species x
     y_energy : :py:attr:`float`
         DFT 0 K energy for species y
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest free energies, or None to only find the phases
+    precision : :py:attr:`str`
+        'double' or 'single', see :py:func:`surfinpy.utils.tiled_phase_data`
 
     Returns
     -------
     phase_data  : :py:attr:`array_like`
         array of ints, with each int corresponding to a phase.
     """
-    xnew = ut.build_xgrid(x, y)
-    ynew = ut.build_ygrid(x, y)
-    S = np.array([])
-    for k in range(0, nphases):
-        normalised_bulk = normalise_phase_energy(data[k], bulk)
-        SE = calculate_bulk_energy(xnew, ynew, 
-                                   x_energy,
-                                   y_energy,
-                                   data[k],
-                                   normalised_bulk)
-        S = np.append(S, SE)
-
-    phase_data, SE = ut.get_phase_data(S, nphases)
+    with profiling.stage('grid'):
+        xnew = ut.build_xgrid(x, y)
+        ynew = ut.build_ygrid(x, y)
+        deltamux = ut.compact_grid(xnew)
+        deltamuy = ut.compact_grid(ynew)
+        scale = 0
+        if precision == 'single':
+            for phase in data:
+                scale = max(scale, ut.term_scale(
+                    normalise_phase_energy(phase, bulk), deltamux * phase.x,
+                    deltamuy * phase.y, x_energy * phase.x,
+                    y_energy * phase.y))
+
+    def energy(k, rows, dtype=float):
+        return phase_energy(data[k], bulk,
+                            ut.tile_rows(deltamux, rows, dtype),
+                            ut.tile_rows(deltamuy, rows, dtype),
+                            dtype(x_energy), dtype(y_energy))
+
+    phase_data, SE = ut.tiled_phase_data(energy, nphases, xnew.shape, tile,
+                                         energy_dtype=energy_dtype,
+                                         precision=precision, scale=scale)
     return phase_data, SE
 
-def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy):
+def evaluate_phases_adaptive(data, bulk, x, y, nphases, x_energy, y_energy,
+                             coarse=32, energy_dtype=float):
+    """Evaluates which phase is most stable at each x/y chemical potential
+    cross section, as :py:func:`evaluate_phases`, but only refines the grid
+    around phase boundaries. See :py:func:`surfinpy.utils.adaptive_phase_data`.
+
+    Parameters
+    ----------
+    data : :py:attr:`list`
+        List containing the :py:class:`surfinpy.data.DataSet` for each phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Data for bulk
+    x : :py:attr:`array_like`
+        X axis chemical potential values
+    y : :py:attr:`array_like`
+        Y axis chemical potential values
+    nphases : :py:attr:`int`
+        Number of phases
+    x_energy : :py:attr:`float`
+        DFT 0K energy for species x
+    y_energy : :py:attr:`float`
+        DFT 0K energy for species y
+    coarse : :py:attr:`int`
+        Spacing, in grid points, of the initial coarse grid
+    energy_dtype : :py:attr:`type`
+        Type of the lowest free energies, or None to only find the phases
+
+    Returns
+    -------
+    phase_data  : :py:attr:`array_like`
+        array of ints, with each int corresponding to a phase.
+    """
+    def energy(k, deltamux, deltamuy):
+        return phase_energy(data[k], bulk, deltamux, deltamuy,
+                            x_energy, y_energy)
+
+    return ut.adaptive_phase_data(energy, nphases, x, y, coarse,
+                                  energy_dtype=energy_dtype)
+
+def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy, adaptive=False,
+              tile=None, precision='double'):
     """Initialise the free energy calculation.
 
     Parameters
@@ -117,33 +205,86 @@ def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy):
         DFT energy of adsorbing species
     y_energy : :py:attr:`float`
         DFT energy of adsorbing species
+    adaptive : :py:attr:`bool`
+        Only refine the grid around phase boundaries,
+        see :py:func:`evaluate_phases_adaptive`. Cannot be combined with
+        tile or single precision.
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once. Limits the
+        memory used by large diagrams with many phases.
+    precision : :py:attr:`str`
+        'double', or 'single' to compute the free energies in single
+        precision, which halves the memory used and gives the same phases,
+        see :py:func:`surfinpy.utils.tiled_phase_data`
 
     Returns
     -------
     system : :py:class:`surfinpy.plotting.ChemicalPotentialPlot`
         Plotting object
     """
+    if adaptive and (tile is not None or precision != 'double'):
+        raise ValueError("adaptive cannot be combined with tile or single "
+                         "precision")
     nphases = len(data)
     X = np.arange(deltaX['Range'][0], deltaX['Range'][1],
                   0.005, dtype="float")
     Y = np.arange(deltaY['Range'][0], deltaY['Range'][1],
                   0.005, dtype="float")  
 
-    phases, SE = evaluate_phases(data, bulk, X, Y,
-                                 nphases, x_energy, y_energy)
+    # Only the phases are plotted, so the lowest energies are not found
+    if adaptive:
+        phases, SE = evaluate_phases_adaptive(data, bulk, X, Y,
+                                              nphases, x_energy, y_energy,
+                                              energy_dtype=None)
+    else:
+        phases, SE = evaluate_phases(data, bulk, X, Y,
+                                     nphases, x_energy, y_energy, tile,
+                                     energy_dtype=None, precision=precision)
 
-    ticks = np.unique([phases])
+    ticks = ut.unique_phases(phases)
     colors = ut.list_colors(data, ticks)
     phases = ut.transform_numbers(phases, ticks)
     Z = np.reshape(phases, (Y.size, X.size))
-    SE = np.reshape(SE, (Y.size, X.size))
     labels = ut.get_labels(ticks, data)
-    system = plotting.ChemicalPotentialPlot(X,
-                                            Y,
-                                            Z,
-                                            labels,
-                                            ticks,
-                                            colors,
-                                            deltaX['Label'],
-                                            deltaY['Label'])
+    with profiling.stage('plot'):
+        system = plotting.ChemicalPotentialPlot(X,
+                                                Y,
+                                                Z,
+                                                labels,
+                                                ticks,
+                                                colors,
+                                                deltaX['Label'],
+                                                deltaY['Label'])
     return system
+
+def calculate_envelope(data, bulk, deltaX, deltaY, x_energy, y_energy):
+    """Finds the exact stability region of each phase, along with the
+    boundaries and triple points between them, without evaluating a grid.
+
+    Parameters
+    ----------
+    data : :py:attr:`list`
+        List of :py:class:`surfinpy.data.DataSet` object for each phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Reference dataset
+    deltaX : :py:attr:`dict`
+        Range of chemical potential/label for species X
+    DeltaY : :py:attr:`dict`
+        Range of chemical potential/label for species Y
+    x_energy : :py:attr:`float`
+        DFT energy of adsorbing species
+    y_energy : :py:attr:`float`
+        DFT energy of adsorbing species
+
+    Returns
+    -------
+    system : :py:class:`surfinpy.envelope.PhaseEnvelope`
+        Stability polygons, boundaries and triple points
+    """
+    planes = [envelope.plane_coefficients(
+        lambda x, y, phase=phase: phase_energy(phase, bulk, x, y,
+                                               x_energy, y_energy))
+              for phase in data]
+    labels = [phase.label for phase in data]
+    return envelope.lower_envelope(planes, deltaX['Range'], deltaY['Range'],
+                                   labels, deltaX['Label'], deltaY['Label'])
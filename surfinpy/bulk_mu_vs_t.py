@@ -1,7 +1,9 @@
 import numpy as np
 from surfinpy import plotting
 from surfinpy import utils as ut
+from surfinpy import profiling
 from surfinpy import vibrational_data as vd
+from surfinpy import results
 
 def normalise_phase_energy(phase, bulk):
     r"""
@@ -74,7 +76,8 @@ def calculate_bulk_energy(deltamux, ynew,
 
 def evaluate_phases(data, bulk, x, y,
                     nphases, x_energy, y_energy,
-                    mu_z, exp_x, exp_z):
+                    mu_z, exp_x, exp_z, tile=None, out=None,
+                    energy_dtype=float, precision='double'):
     """Calculates the surface energies of each phase as a function of chemical
     potential of x and y. Then uses this data to evaluate which phase is most
     stable at that x/y chemical potential cross section.
@@ -101,42 +104,77 @@ def evaluate_phases(data, bulk, x, y,
         Experimental correction for species x
     exp_z : :py:attr:`float`
         Experimental correction for species y
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    out : :py:attr:`tuple`
+        Arrays to write the phase data and lowest energies into, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest free energies, or None to only find the phases
+    precision : :py:attr:`str`
+        'double' or 'single', see :py:func:`surfinpy.utils.tiled_phase_data`
+
     Returns
     -------
     phase_data  : :py:attr:`array_like`
         array of ints, with each int corresponding to a phase.
     """
-    xnew = ut.build_xgrid(x, y)
-    ynew = ut.build_ygrid(x, y)
-    znew = (xnew * 0 ) + mu_z
-    exp_xnew = ut.build_zgrid(exp_x, x)
-    exp_znew = ut.build_zgrid(exp_z, x)
-    S = np.array([])
-    new_data_svib = 0
-    new_bulk_svib = 0
-    if bulk.entropy:
-        new_bulk_svib = ut.build_zgrid(bulk.avib, x)       
-
-    for k in range(0, nphases):
-        if data[k].entropy:
-            new_data_svib = ut.build_zgrid(data[k].avib, x)
-        normalised_bulk = normalise_phase_energy(data[k],
-                                                  bulk)
+    with profiling.stage('grid'):
+        xnew = ut.build_xgrid(x, y)
+        ynew = ut.build_ygrid(x, y)
+        znew = np.broadcast_to(mu_z, xnew.shape)
+        exp_xnew = ut.build_zgrid(exp_x, x)
+        exp_znew = ut.build_zgrid(exp_z, x)
+        new_bulk_svib = 0
+        if bulk.entropy:
+            new_bulk_svib = ut.compact_grid(ut.build_zgrid(bulk.avib, x))
+        deltamux = ut.compact_grid(xnew)
+        deltamuy = ut.compact_grid(ynew)
+        deltamuz = ut.compact_grid(znew)
+        exp_x = ut.compact_grid(exp_xnew)
+        exp_z = ut.compact_grid(exp_znew)
 
-        SE = calculate_bulk_energy(xnew, ynew, 
-                                   x_energy,
-                                   y_energy, znew,
-                                   data[k],
-                                   bulk,
-                                   normalised_bulk,
-                                   exp_xnew, exp_znew, new_bulk_svib, new_data_svib)
+        new_data_svib = [0] * nphases
+        for k in range(0, nphases):
+            if data[k].entropy:
+                new_data_svib[k] = ut.compact_grid(ut.build_zgrid(data[k].avib, x))
 
-        S = np.append(S, SE)
+        scale = 0
+        if precision == 'single':
+            for k in range(0, nphases):
+                phase = data[k]
+                scale = max(scale, ut.term_scale(
+                    normalise_phase_energy(phase, bulk), deltamux * phase.x,
+                    deltamuz * phase.y, x_energy * phase.x, exp_x * phase.x,
+                    y_energy * phase.y, exp_z * phase.y,
+                    new_data_svib[k] * phase.funits,
+                    new_bulk_svib * phase.cation / bulk.cation))
+
+    def energy(k, rows, dtype=float):
+        normalised_bulk = normalise_phase_energy(data[k],
+                                                 bulk)
+        return calculate_bulk_energy(ut.tile_rows(deltamux, rows, dtype),
+                                     ut.tile_rows(deltamuy, rows, dtype),
+                                     dtype(x_energy),
+                                     dtype(y_energy),
+                                     ut.tile_rows(deltamuz, rows, dtype),
+                                     data[k],
+                                     bulk,
+                                     dtype(normalised_bulk),
+                                     ut.tile_rows(exp_x, rows, dtype),
+                                     ut.tile_rows(exp_z, rows, dtype),
+                                     ut.tile_rows(new_bulk_svib, rows, dtype),
+                                     ut.tile_rows(new_data_svib[k], rows,
+                                                  dtype))
 
-    phase_data, SE = ut.get_phase_data(S, nphases)
+    phase_data, SE = ut.tiled_phase_data(energy, nphases, xnew.shape, tile, out,
+                                         energy_dtype=energy_dtype,
+                                         precision=precision, scale=scale)
     return phase_data, SE
 
-def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy, mu_z, exp_x, exp_y):
+def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy, mu_z, exp_x, exp_y,
+              tile=None, store=None, energy_dtype=float, precision='double'):
     """Initialise the free energy calculation.
 
     Parameters
@@ -161,6 +199,21 @@ def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy, mu_z, exp_x, exp_y
         Experimental correction for species x
     exp_y : :py:attr:`float`
         Experimental correction for species y
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once. Limits the
+        memory used by large diagrams with many phases.
+    store : :py:attr:`str`
+        Directory to write the results to as memory mapped .npy files,
+        see :py:mod:`surfinpy.results`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest free energies written to store, or None to only
+        store the phases. They are not found unless they are stored.
+    precision : :py:attr:`str`
+        'double', or 'single' to compute the free energies in single
+        precision and only use double precision next to a phase boundary,
+        see :py:func:`surfinpy.utils.tiled_phase_data`. Gives the same
+        phases, but the energies written to store are only accurate to
+        single precision, even when energy_dtype is float.
 
     Returns
     -------
@@ -173,24 +226,38 @@ def calculate(data, bulk, deltaX, deltaY, x_energy, y_energy, mu_z, exp_x, exp_y
                   0.01, dtype="float")
     Y = np.arange(deltaY['Range'][0], deltaY['Range'][1],
                   0.01, dtype="float")
-    vd.recalculate_vib(data, bulk)
+    data, bulk = vd.recalculate_vib(data, bulk)
+    out = None
+    if store is None:
+        energy_dtype = None
+    else:
+        out = results.allocate(store, (Y.size, X.size),
+                               energy_dtype is not None,
+                               ut.phase_dtype(nphases), energy_dtype)
     phases, SE = evaluate_phases(data, bulk, X, Y,
                                  nphases, x_energy,
                                  y_energy, mu_z,
-                                 exp_x, exp_y,
-                                 )
-    ticks = np.unique([phases])
+                                 exp_x, exp_y, tile, out, energy_dtype,
+                                 precision)
+    ticks = ut.unique_phases(phases)
     colors = ut.list_colors(data, ticks)
-    phases = ut.transform_numbers(phases, ticks)
+    if out is None:
+        phases = ut.transform_numbers(phases, ticks)
+    else:
+        phases = results.relabel(phases, ticks)
     Z = np.reshape(phases, (Y.size, X.size))
-    SE = np.reshape(SE, (Y.size, X.size))
+    if SE is not None:
+        SE = np.reshape(SE, (Y.size, X.size))
     labels = ut.get_labels(ticks, data)
-    system = plotting.MuTPlot(X,
-                             Y,
-                             Z,
-                             labels,
-                             ticks,
-                             colors,
-                             deltaX['Label'],
-                             deltaY['Label'])
+    with profiling.stage('plot'):
+        system = plotting.MuTPlot(X,
+                                 Y,
+                                 Z,
+                                 labels,
+                                 ticks,
+                                 colors,
+                                 deltaX['Label'],
+                                 deltaY['Label'])
+    if store is not None:
+        results.save(store, system, SE)
     return system
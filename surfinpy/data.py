@@ -1,7 +1,163 @@
 import numpy as np
 from surfinpy import vibrational_data as vd
 
-class ReferenceDataSet():
+class VibrationalProperties():
+    """Vibrational properties of a DFT calculation, shared by
+    :py:class:`ReferenceDataSet` and :py:class:`DataSet`. Nothing is read
+    or calculated until one of the properties is first used, and then only
+    on the temperature grid set by temp_step, so that a phase diagram
+    calculation can choose the resolution it needs before any work is done.
+    Any property can also be set directly.
+    """
+    def _set_vibrations(self, file, entropy, temp_range, zpe, temp_step):
+        self.file = file
+        self.entropy = entropy
+        self.temp_range = temp_range
+        self.zpe = zpe
+        self._temp_step = temp_step
+        self._vib = {}
+
+    def vib_properties(self, temp_r):
+        """Calculates the zero point energy, vibrational entropy and
+        vibrational free energy on a given temperature grid, without changing
+        this object. Properties that are not considered are returned as 0.
+
+        Parameters
+        ----------
+        temp_r : :py:attr:`array_like`
+            Temperature range at which the vibrational entropy is calculated
+
+        Returns
+        -------
+        zpe : :py:attr:`float`
+            Zero Point energy
+        svib : :py:attr:`array_like`
+            Vibrational entropy
+        avib : :py:attr:`array_like`
+            Vibrational free energy
+        """
+        svib, avib = 0, 0
+        if self.entropy:
+            svib, avib = vd.vib_calc(self.file, temp_r)[1:]
+        zpe = 0
+        if self.zpe:
+            zpe = vd.zpe_calc(vd.read_vibdata(self.file))
+        return zpe, svib, avib
+
+    def with_temp_step(self, temp_step):
+        """Returns a view of this object whose vibrational properties are
+        calculated on a different temperature grid. The view shares every
+        other attribute with this object, which is not changed, so one
+        object can be used by several calculations at once.
+
+        Parameters
+        ----------
+        temp_step : :py:attr:`float`
+            Spacing of the temperature grid, in K
+
+        Returns
+        -------
+        view : :py:class:`surfinpy.data.VibrationalView`
+            View of this object
+        """
+        return VibrationalView(self, temp_step)
+
+    def _lazy(self, name, calculate):
+        if name not in self._vib:
+            self._vib[name] = calculate()
+        return self._vib[name]
+
+    @property
+    def temp_step(self):
+        """Spacing of the temperature grid, in K."""
+        return self._temp_step
+
+    @temp_step.setter
+    def temp_step(self, step):
+        self._temp_step = step
+        self._vib = {}
+
+    @property
+    def temp_r(self):
+        """Temperature grid on which the vibrational entropy is calculated."""
+        def calculate():
+            if not (self.entropy or self.zpe):
+                return None
+            return np.arange(self.temp_range[0], self.temp_range[1],
+                             self.temp_step, dtype="float")
+        return self._lazy('temp_r', calculate)
+
+    @temp_r.setter
+    def temp_r(self, temp_r):
+        self._vib['temp_r'] = temp_r
+        # Only these are calculated on the grid, the zero point energy is not
+        for name in ('temperature', 'svib', 'avib'):
+            self._vib.pop(name, None)
+
+    @property
+    def temperature(self):
+        """First temperature of the temperature grid."""
+        return self._lazy('temperature', lambda: 0 if self.temp_r is None
+                          else self.temp_r[0])
+
+    @temperature.setter
+    def temperature(self, temperature):
+        self._vib['temperature'] = temperature
+
+    @property
+    def svib(self):
+        """Vibrational entropy on the temperature grid."""
+        return self._lazy('svib', lambda: self.vib_properties(self.temp_r)[1]
+                          if self.entropy else 0)
+
+    @svib.setter
+    def svib(self, svib):
+        self._vib['svib'] = svib
+
+    @property
+    def avib(self):
+        """Vibrational free energy on the temperature grid."""
+        return self._lazy('avib', lambda: self.vib_properties(self.temp_r)[2]
+                          if self.entropy else 0)
+
+    @avib.setter
+    def avib(self, avib):
+        self._vib['avib'] = avib
+
+    @property
+    def zpev(self):
+        """Zero point energy."""
+        return self._lazy('zpev', lambda: self.vib_properties(self.temp_r)[0]
+                          if self.zpe else 0)
+
+    @zpev.setter
+    def zpev(self, zpev):
+        self._vib['zpev'] = zpev
+
+class VibrationalView(VibrationalProperties):
+    """View of a :py:class:`ReferenceDataSet` or :py:class:`DataSet` with
+    its own temperature grid and vibrational properties, see
+    :py:meth:`VibrationalProperties.with_temp_step`. All other attributes
+    are read from the original object.
+
+    Parameters
+    ----------
+    dataset : :py:class:`surfinpy.data.VibrationalProperties`
+        Original object
+    temp_step : :py:attr:`float`
+        Spacing of the temperature grid, in K
+    """
+    def __init__(self, dataset, temp_step):
+        self._dataset = dataset
+        self._set_vibrations(dataset.file, dataset.entropy,
+                             dataset.temp_range, dataset.zpe, temp_step)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._dataset, name)
+
+class ReferenceDataSet(VibrationalProperties):
     """Object that contains information about the reference DFT calculation
     to be used in the phase diagram calculation. This object is
     used in both the surface and bulk phase diagram methods.
@@ -26,39 +182,20 @@ class ReferenceDataSet():
         Temperature range to calculate vibrational entropy across
     zpe : :py:attr:`bool`
         Is the zero point energy to be considered?
+    temp_step : :py:attr:`float`
+        Spacing of the temperature grid for the vibrational entropy
     """
     def __init__(self, cation, anion, energy, funits, color=None,
                  file=None, entropy=False, temp_range=None,
-                 zpe=False):
+                 zpe=False, temp_step=1):
         self.cation = cation
         self.anion = anion
         self.energy = energy
         self.funits = funits
-        self.file = file
         self.color = color
-        self.entropy = entropy
-        self.temp_range = temp_range
-        self.zpev = 0
-        self.svib = 0
-        self.avib = 0
-        self.temperature = 0
-        self.zpe = zpe
-        if self.entropy:
-            self.temp_r = np.arange(self.temp_range[0],
-                                    self.temp_range[1], 
-                                    1, dtype="float")
-            self.svib = vd.vib_calc(self.file, self.temp_r)[1]
-            self.avib = vd.vib_calc(self.file, self.temp_r)[2]
-            self.temperature = self.temp_r[0]
+        self._set_vibrations(file, entropy, temp_range, zpe, temp_step)
 
-        if self.zpe:
-            self.temp_r = np.arange(self.temp_range[0],
-                                    self.temp_range[1], 
-                                    1, dtype="float")
-            self.zpev = vd.vib_calc(self.file, self.temp_r)[0]
-            self.temperature = self.temp_r[0]
-
-class DataSet():
+class DataSet(VibrationalProperties):
     """Object that contains information about a DFT calculation
     to be added to the phase diagram calculation. This object is
     used in both the surface and bulk phase diagram methods.
@@ -91,10 +228,12 @@ class DataSet():
         Temperature range to calculate vibrational entropy across
     zpe : :py:attr:`bool`
         Is the zero point energy to be considered?
+    temp_step : :py:attr:`float`
+        Spacing of the temperature grid for the vibrational entropy
     """
     def __init__(self, cation, x, y, energy, label, color=None, funits=0, 
                  file=None, area=None, nspecies=None, entropy=False,
-                 temp_range=False, zpe=False):
+                 temp_range=False, zpe=False, temp_step=1):
         self.cation = cation
         self.x = x
         self.y = y
@@ -102,27 +241,6 @@ class DataSet():
         self.label= label
         self.color = color
         self.funits = funits
-        self.file = file 
         self.area = area
         self.nspecies = nspecies
-        self.entropy = entropy
-        self.temp_range = temp_range
-        self.zpev = 0
-        self.svib = 0
-        self.avib = 0
-        self.temperature = 0
-        self.zpe = zpe
-        if self.entropy:
-            self.temp_r = np.arange(self.temp_range[0],
-                                    self.temp_range[1], 
-                                    1, dtype="float")
-            self.svib = vd.vib_calc(self.file, self.temp_r)[1]
-            self.avib = vd.vib_calc(self.file, self.temp_r)[2]
-            self.temperature = self.temp_r[0]
-
-        if self.zpe:
-            self.temp_r = np.arange(self.temp_range[0],
-                                    self.temp_range[1], 
-                                    1, dtype="float")
-            self.zpev = vd.vib_calc(self.file, self.temp_r)[0]
-            self.temperature = self.temp_r[0]
\ No newline at end of file
+        self._set_vibrations(file, entropy, temp_range, zpe, temp_step)
@@ -0,0 +1,235 @@
+import numpy as np
+
+
+def plane_coefficients(energy):
+    r"""Determines the coefficients of an energy that is affine in the
+    chemical potential of x and y,
+
+    .. math::
+        E(\Delta \mu_x, \Delta \mu_y) = c + a \Delta \mu_x + b \Delta \mu_y
+
+    by evaluating it at three points.
+
+    Parameters
+    ----------
+    energy : :py:attr:`callable`
+        Function of the chemical potential of x and y
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        Coefficients c, a and b
+    """
+    c = energy(0.0, 0.0)
+    return np.array([c, energy(1.0, 0.0) - c, energy(0.0, 1.0) - c],
+                    dtype=float)
+
+
+def clip_polygon(vertices, edges, line, edge):
+    """Clips a convex polygon to the half plane
+    :math:`A x + B y + C \\leq 0`, keeping track of the line that each
+    edge of the polygon lies on.
+
+    Parameters
+    ----------
+    vertices : :py:attr:`list`
+        Polygon vertices, anticlockwise
+    edges : :py:attr:`list`
+        Label of the edge running from each vertex to the next
+    line : :py:attr:`tuple`
+        A, B and C
+    edge : :py:attr:`int`
+        Label given to any edge created along the clipping line
+
+    Returns
+    -------
+    new_vertices : :py:attr:`list`
+        Vertices of the clipped polygon
+    new_edges : :py:attr:`list`
+        Edge labels of the clipped polygon
+    """
+    A, B, C = line
+    d = [A * v[0] + B * v[1] + C for v in vertices]
+    scale = max([abs(A) * abs(v[0]) + abs(B) * abs(v[1]) for v in vertices])
+    tolerance = 1e-12 * (scale + abs(C))
+    d = [0.0 if abs(i) <= tolerance else i for i in d]
+    new_vertices = []
+    new_edges = []
+    for i in range(0, len(vertices)):
+        j = (i + 1) % len(vertices)
+        P, Q = vertices[i], vertices[j]
+        if d[i] <= 0:
+            new_vertices.append(P)
+            new_edges.append(edges[i])
+            if d[j] > 0:
+                if d[i] < 0:
+                    t = d[i] / (d[i] - d[j])
+                    new_vertices.append((P[0] + t * (Q[0] - P[0]),
+                                         P[1] + t * (Q[1] - P[1])))
+                    new_edges.append(edge)
+                else:
+                    new_edges[-1] = edge
+        elif d[j] < 0:
+            t = d[i] / (d[i] - d[j])
+            new_vertices.append((P[0] + t * (Q[0] - P[0]),
+                                 P[1] + t * (Q[1] - P[1])))
+            new_edges.append(edges[i])
+    return new_vertices, new_edges
+
+
+def polygon_area(vertices):
+    """Calculates the area of a polygon with the shoelace formula.
+
+    Parameters
+    ----------
+    vertices : :py:attr:`array_like`
+        Polygon vertices
+
+    Returns
+    -------
+    :py:attr:`float`
+        Area, positive for anticlockwise vertices
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if vertices.shape[0] < 3:
+        return 0.0
+    x, y = vertices[:, 0], vertices[:, 1]
+    return 0.5 * (np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+class PhaseEnvelope:
+    """Stable phase regions of a phase diagram, found exactly as the lower
+    envelope of the plane describing the energy of each phase.
+
+    Phases are numbered from 1, in the order they were supplied, matching
+    the numbering used by :py:func:`surfinpy.utils.get_phase_data`.
+
+    Parameters
+    ----------
+    polygons : :py:attr:`dict`
+        Stability polygon, as an (n, 2) array of anticlockwise vertices,
+        of each stable phase
+    boundaries : :py:attr:`list`
+        Tuples of the two phases either side of a boundary and the (2, 2)
+        array of the end points of that boundary
+    triple_points : :py:attr:`list`
+        Tuples of the three phases meeting at a point and that point
+    labels : :py:attr:`list`
+        Label of every phase
+    xlabel : :py:attr:`str`
+        species name for x axis label
+    ylabel : :py:attr:`str`
+        species name for y axis label
+    """
+    def __init__(self,
+                 polygons,
+                 boundaries,
+                 triple_points,
+                 labels,
+                 xlabel=None,
+                 ylabel=None):
+        self.polygons = polygons
+        self.boundaries = boundaries
+        self.triple_points = triple_points
+        self.labels = labels
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.phases = np.array(sorted(polygons), dtype=int)
+
+    def area(self, phase):
+        """Area of the stability region of a phase.
+
+        Parameters
+        ----------
+        phase : :py:attr:`int`
+            Phase number
+
+        Returns
+        -------
+        :py:attr:`float`
+            Area, zero for a phase that is never stable
+        """
+        if phase not in self.polygons:
+            return 0.0
+        return polygon_area(self.polygons[phase])
+
+
+def lower_envelope(planes, xrange, yrange, labels=None,
+                   xlabel=None, ylabel=None):
+    r"""Finds the region of the domain in which each phase is the most stable
+    by intersecting, for each phase k, the half planes
+
+    .. math::
+        E_k(\Delta \mu_x, \Delta \mu_y) \leq E_j(\Delta \mu_x, \Delta \mu_y)
+
+    for all other phases j. The cost depends only on the number of phases,
+    not on any grid resolution. Where two phases have identical energies
+    everywhere the first is taken, as with
+    :py:func:`surfinpy.utils.get_phase_data`.
+
+    Parameters
+    ----------
+    planes : :py:attr:`array_like`
+        (nphases, 3) array of the c, a and b coefficients of each phase,
+        see :py:func:`plane_coefficients`
+    xrange : :py:attr:`list`
+        Lower and upper limits of the x axis
+    yrange : :py:attr:`list`
+        Lower and upper limits of the y axis
+    labels : :py:attr:`list`
+        Label of every phase
+    xlabel : :py:attr:`str`
+        species name for x axis label
+    ylabel : :py:attr:`str`
+        species name for y axis label
+
+    Returns
+    -------
+    envelope : :py:class:`surfinpy.envelope.PhaseEnvelope`
+        Polygons, boundaries and triple points of the stable phases
+    """
+    planes = np.asarray(planes, dtype=float)
+    nphases = planes.shape[0]
+    domain = [(xrange[0], yrange[0]), (xrange[1], yrange[0]),
+              (xrange[1], yrange[1]), (xrange[0], yrange[1])]
+    scale = np.amax(np.abs(planes), axis=1)
+    min_area = 1e-14 * abs(polygon_area(domain))
+
+    polygons = {}
+    boundaries = []
+    triple_points = []
+    for k in range(0, nphases):
+        vertices = list(domain)
+        edges = [0, 0, 0, 0]
+        for j in range(0, nphases):
+            if j == k:
+                continue
+            C, A, B = planes[k] - planes[j]
+            if max(abs(A), abs(B), abs(C)) <= 1e-12 * max(scale[k], scale[j]):
+                if j < k:
+                    vertices = []
+                    break
+                continue
+            vertices, edges = clip_polygon(vertices, edges, (A, B, C), j + 1)
+            if len(vertices) < 3:
+                break
+        if len(vertices) < 3 or polygon_area(vertices) <= min_area:
+            continue
+        phase = k + 1
+        polygons[phase] = np.array(vertices)
+        for i in range(0, len(vertices)):
+            following = (i + 1) % len(vertices)
+            if phase < edges[i]:
+                segment = np.array([vertices[i], vertices[following]])
+                if np.any(segment[0] != segment[1]):
+                    boundaries.append(((phase, edges[i]), segment))
+            before = edges[i - 1]
+            if edges[i] and before and edges[i] != before:
+                meeting = tuple(sorted((phase, before, edges[i])))
+                if phase == meeting[0]:
+                    triple_points.append((meeting, np.array(vertices[i])))
+
+    if labels is None:
+        labels = [str(k + 1) for k in range(0, nphases)]
+    return PhaseEnvelope(polygons, boundaries, triple_points, labels,
+                         xlabel, ylabel)
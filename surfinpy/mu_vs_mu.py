@@ -1,6 +1,10 @@
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from surfinpy import plotting
 from surfinpy import utils as ut
+from surfinpy import profiling
+from surfinpy import envelope
+from surfinpy import results
 
 
 def calculate_excess(adsorbant, slab_cations, area, bulk,
@@ -135,7 +139,49 @@ def calculate_surface_energy(deltamux, deltamuy, x_energy, y_energy,
         x_energy * xexcess)- (y_energy * yexcess)) * 16.021)
 
 
-def evaluate_phases(data, bulk, x, y, nsurfaces, x_energy, y_energy):
+def phase_energy(phase, bulk, deltamux, deltamuy, x_energy, y_energy):
+    """Calculates the surface energy of a single phase as a function of
+    the chemical potential of x and y.
+
+    Parameters
+    ----------
+    phase : :py:class:`surfinpy.data.DataSet`
+        Data for the phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Data for bulk
+    deltamux : :py:attr:`array_like`
+        Chemical potential of species x
+    deltamuy : :py:attr:`array_like`
+        Chemical potential of species y
+    x_energy : :py:attr:`float`
+        DFT 0K energy for species x
+    y_energy : :py:attr:`float`
+        DFT 0K energy for species y
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        Surface energies as a function of chemical potential of x and y
+    """
+    xexcess = calculate_excess(phase.x, phase.cation,
+                               phase.area, bulk,
+                               phase.nspecies, check=True)
+    yexcess = calculate_excess(phase.y, phase.cation,
+                               phase.area, bulk)
+    normalised_bulk = calculate_normalisation(phase.energy,
+                                              phase.cation, bulk,
+                                              phase.area)
+    return calculate_surface_energy(deltamux, deltamuy,
+                                    x_energy,
+                                    y_energy,
+                                    xexcess,
+                                    yexcess,
+                                    normalised_bulk)
+
+
+def evaluate_phases(data, bulk, x, y, nsurfaces, x_energy, y_energy,
+                    tile=None, out=None, energy_dtype=float,
+                    precision='double'):
     """Calculates the surface energies of each phase as a function of chemical
     potential of x and y. Then uses this data to evaluate which phase is most
     stable at that x/y chemical potential cross section.
@@ -156,35 +202,96 @@ def evaluate_phases(data, bulk, x, y, nsurfaces, x_energy, y_energy):
         DFT 0K energy for species x
     y_energy : :py:attr:`float`
         DFT 0K energy for species y
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    out : :py:attr:`tuple`
+        Arrays to write the phase data and lowest energies into, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies, or None to only find the
+        phases
+    precision : :py:attr:`str`
+        'double' or 'single', see :py:func:`surfinpy.utils.tiled_phase_data`
 
     Returns
     -------
     phase_data  : :py:attr:`array_like`
         array of ints, with each int corresponding to a phase.
     """
-    xnew = ut.build_xgrid(x, y)
-    ynew = ut.build_ygrid(x, y)
-    S = np.array([])
-    for k in range(0, nsurfaces):
-        xexcess = calculate_excess(data[k].x, data[k].cation,
-                                   data[k].area, bulk,
-                                   data[k].nspecies, check=True)
-        yexcess = calculate_excess(data[k].y, data[k].cation,
-                                   data[k].area, bulk)
-        normalised_bulk = calculate_normalisation(data[k].energy,
-                                                  data[k].cation, bulk,
-                                                  data[k].area)
-        SE = calculate_surface_energy(xnew, ynew,
-                                      x_energy,
-                                      y_energy,
-                                      xexcess,
-                                      yexcess,
-                                      normalised_bulk)
-        S = np.append(S, SE)
-    phase_data, surface_energy = ut.get_phase_data(S, nsurfaces)
+    with profiling.stage('grid'):
+        xnew = ut.build_xgrid(x, y)
+        ynew = ut.build_ygrid(x, y)
+        deltamux = ut.compact_grid(xnew)
+        deltamuy = ut.compact_grid(ynew)
+        scale = 0
+        if precision == 'single':
+            for phase in data:
+                xexcess = calculate_excess(phase.x, phase.cation, phase.area,
+                                           bulk, phase.nspecies, check=True)
+                yexcess = calculate_excess(phase.y, phase.cation, phase.area,
+                                           bulk)
+                normalised_bulk = calculate_normalisation(
+                    phase.energy, phase.cation, bulk, phase.area)
+                scale = max(scale, 16.021 * ut.term_scale(
+                    normalised_bulk, deltamux * xexcess, deltamuy * yexcess,
+                    x_energy * xexcess, y_energy * yexcess))
+
+    def energy(k, rows, dtype=float):
+        return phase_energy(data[k], bulk,
+                            ut.tile_rows(deltamux, rows, dtype),
+                            ut.tile_rows(deltamuy, rows, dtype),
+                            dtype(x_energy), dtype(y_energy))
+
+    phase_data, surface_energy = ut.tiled_phase_data(
+        energy, nsurfaces, xnew.shape, tile, out, energy_dtype=energy_dtype,
+        precision=precision, scale=scale)
     return phase_data, surface_energy
     
-def calculate(data, bulk, deltaX, deltaY, x_energy=0, y_energy=0, increments=0.025):
+def evaluate_phases_adaptive(data, bulk, x, y, nsurfaces, x_energy, y_energy,
+                             coarse=32, energy_dtype=float):
+    """Evaluates which phase is most stable at each x/y chemical potential
+    cross section, as :py:func:`evaluate_phases`, but only refines the grid
+    around phase boundaries. See :py:func:`surfinpy.utils.adaptive_phase_data`.
+
+    Parameters
+    ----------
+    data : :py:attr:`list`
+        List containing the :py:class:`surfinpy.data.DataSet` for each phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Data for bulk
+    x : :py:attr:`array_like`
+        X axis chemical potential values
+    y : :py:attr:`array_like`
+        Y axis chemical potential values
+    nsurfaces : :py:attr:`int`
+        Number of phases
+    x_energy : :py:attr:`float`
+        DFT 0K energy for species x
+    y_energy : :py:attr:`float`
+        DFT 0K energy for species y
+    coarse : :py:attr:`int`
+        Spacing, in grid points, of the initial coarse grid
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies, or None to only find the
+        phases
+
+    Returns
+    -------
+    phase_data  : :py:attr:`array_like`
+        array of ints, with each int corresponding to a phase.
+    """
+    def energy(k, deltamux, deltamuy):
+        return phase_energy(data[k], bulk, deltamux, deltamuy,
+                            x_energy, y_energy)
+
+    return ut.adaptive_phase_data(energy, nsurfaces, x, y, coarse,
+                                  energy_dtype=energy_dtype)
+
+
+def calculate(data, bulk, deltaX, deltaY, x_energy=0, y_energy=0, increments=0.025,
+              adaptive=False, tile=None, store=None, energy_dtype=float,
+              precision='double'):
     """Initialise the surface energy calculation.
 
     Parameters
@@ -201,12 +308,40 @@ def calculate(data, bulk, deltaX, deltaY, x_energy=0, y_energy=0, increments=0.0
         DFT energy of adsorbing species
     y_energy : :py:attr:`float`
         DFT energy of adsorbing species
+    increments : :py:attr:`float`
+        Spacing of the chemical potential grid
+    adaptive : :py:attr:`bool`
+        Only refine the grid around phase boundaries,
+        see :py:func:`evaluate_phases_adaptive`. Cannot be combined with
+        tile, store or single precision.
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once. Limits the
+        memory used by large diagrams with many phases.
+    store : :py:attr:`str`
+        Directory to write the results to as memory mapped .npy files,
+        see :py:mod:`surfinpy.results`
+    energy_dtype : :py:attr:`type`
+        Type of the surface energies returned, e.g. numpy.float32 to halve
+        their memory, or None to only find the phases
+    precision : :py:attr:`str`
+        'double', or 'single' to compute the surface energies in single
+        precision, halving the memory used, and check the points next to a
+        phase boundary again in double precision, see
+        :py:func:`surfinpy.utils.tiled_phase_data`. The phases are the same
+        either way, but the surface energies returned are only accurate to
+        single precision, even when energy_dtype is float.
 
     Returns
     -------
     system : :py:class:`surfinpy.plotting.ChemicalPotentialPlot`
         Plotting object
+    SE : :py:attr:`array_like`
+        Lowest surface energy at each point, None if energy_dtype is None
     """
+    if adaptive and (tile is not None or store is not None
+                     or precision != 'double'):
+        raise ValueError("adaptive cannot be combined with tile, store or "
+                         "single precision")
     nsurfaces = len(data)
     
     X = np.arange(deltaX['Range'][0], deltaX['Range'][1],
@@ -215,22 +350,162 @@ def calculate(data, bulk, deltaX, deltaY, x_energy=0, y_energy=0, increments=0.0
                   increments, dtype="float")
     X = X - x_energy
     Y = Y - y_energy
-    phases, SE = evaluate_phases(data, bulk, X, Y,
-                             nsurfaces, x_energy, y_energy)
-    ticks = np.unique([phases])
+    out = None
+    if store is not None:
+        out = results.allocate(store, (Y.size, X.size),
+                               energy_dtype is not None,
+                               ut.phase_dtype(nsurfaces), energy_dtype)
+    if adaptive:
+        phases, SE = evaluate_phases_adaptive(data, bulk, X, Y,
+                                              nsurfaces, x_energy, y_energy,
+                                              energy_dtype=energy_dtype)
+    else:
+        phases, SE = evaluate_phases(data, bulk, X, Y,
+                                     nsurfaces, x_energy, y_energy, tile, out,
+                                     energy_dtype, precision)
+    ticks = ut.unique_phases(phases)
     colors = ut.list_colors(data, ticks)
-    phases = ut.transform_numbers(phases, ticks)
+    if out is None:
+        phases = ut.transform_numbers(phases, ticks)
+    else:
+        phases = results.relabel(phases, ticks)
     Z = np.reshape(phases, (Y.size, X.size))
-    SE = np.reshape(SE, (Y.size, X.size))
+    if SE is not None:
+        SE = np.reshape(SE, (Y.size, X.size))
     labels = ut.get_labels(ticks, data)
-    system = plotting.ChemicalPotentialPlot(X,
-                                            Y,
-                                            Z,
-                                            labels,
-                                            ticks,
-                                            colors,
-                                            deltaX['Label'],
-                                            deltaY['Label'])
+    with profiling.stage('plot'):
+        system = plotting.ChemicalPotentialPlot(X,
+                                                Y,
+                                                Z,
+                                                labels,
+                                                ticks,
+                                                colors,
+                                                deltaX['Label'],
+                                                deltaY['Label'])
+    if store is not None:
+        results.save(store, system, SE)
     return system, SE
 
 
+def _sweep_temperature(arguments):
+    """Evaluates the phase diagram at one temperature of
+    :py:func:`temperature_sweep`, in a worker process."""
+    data, bulk, X, Y, x_energy, y_energy, tile, energy_dtype = arguments
+    return evaluate_phases(data, bulk, X, Y, len(data), x_energy, y_energy,
+                           tile, energy_dtype=energy_dtype)
+
+
+def temperature_sweep(data, bulk, deltaX, deltaY, temperatures, x_energy,
+                      y_energy, increments=0.025, processes=None, tile=None,
+                      energy_dtype=float):
+    """Calculates the surface phase diagram at a series of temperatures,
+    in parallel across a pool of processes, and stacks them into a single
+    volume with shared axes, labels and colors.
+
+    Unlike :py:func:`calculate`, the axes are not shifted by the reference
+    energies, so that every temperature shares the same chemical potential
+    grid and the reference energies, e.g. DFT energies with a NIST_JANAF
+    temperature correction, change the stable phases.
+
+    Parameters
+    ----------
+    data : :py:attr:`list`
+        List of :py:class:`surfinpy.data.DataSet` for each phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Data for bulk
+    deltaX : :py:attr:`dict`
+        Range of chemical potential/label for species X
+    DeltaY : :py:attr:`dict`
+        Range of chemical potential/label for species Y
+    temperatures : :py:attr:`array_like`
+        Temperatures of the phase diagrams
+    x_energy : :py:attr:`array_like`
+        Energy of species x at each temperature, or a single value
+    y_energy : :py:attr:`array_like`
+        Energy of species y at each temperature, or a single value
+    increments : :py:attr:`float`
+        Spacing of the chemical potential grid
+    processes : :py:attr:`int`
+        Number of worker processes, all available cores if None. With 1 the
+        temperatures are calculated in this process.
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once by each worker
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies, or None to only find the
+        phases
+
+    Returns
+    -------
+    volume : :py:class:`surfinpy.results.PhaseVolume`
+        (nT, ny, nx) phases and lowest energies
+    """
+    temperatures = np.atleast_1d(temperatures)
+    x_energy = np.broadcast_to(x_energy, temperatures.shape)
+    y_energy = np.broadcast_to(y_energy, temperatures.shape)
+    X = np.arange(deltaX['Range'][0], deltaX['Range'][1],
+                  increments, dtype="float")
+    Y = np.arange(deltaY['Range'][0], deltaY['Range'][1],
+                  increments, dtype="float")
+    arguments = [(data, bulk, X, Y, x_energy[i], y_energy[i], tile,
+                  energy_dtype) for i in range(0, temperatures.size)]
+    shape = (temperatures.size, Y.size, X.size)
+    phases = np.empty(shape, dtype=ut.phase_dtype(len(data)))
+    SE = None
+    if energy_dtype is not None:
+        SE = np.empty(shape, dtype=energy_dtype)
+    if processes == 1:
+        found = map(_sweep_temperature, arguments)
+    else:
+        executor = ProcessPoolExecutor(processes)
+        found = executor.map(_sweep_temperature, arguments)
+    try:
+        for i, (phase_data, surface_energy) in enumerate(found):
+            phases[i] = np.reshape(phase_data, (Y.size, X.size))
+            if SE is not None:
+                SE[i] = np.reshape(surface_energy, (Y.size, X.size))
+    finally:
+        if processes != 1:
+            executor.shutdown()
+    ticks = ut.unique_phases(phases)
+    colors = ut.list_colors(data, ticks)
+    phases = ut.transform_numbers(phases, ticks)
+    labels = ut.get_labels(ticks, data)
+    return results.PhaseVolume(temperatures, X, Y, phases, SE, labels, ticks,
+                               colors, deltaX['Label'], deltaY['Label'])
+
+
+def calculate_envelope(data, bulk, deltaX, deltaY, x_energy=0, y_energy=0):
+    """Finds the exact stability region of each phase, along with the
+    boundaries and triple points between them, without evaluating a grid.
+    The axes are shifted by the energies of x and y exactly as in
+    :py:func:`calculate`.
+
+    Parameters
+    ----------
+    data : :py:attr:`list`
+        List of :py:class:`surfinpy.data.DataSet` for each phase
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Data for bulk
+    deltaX : :py:attr:`dict`
+        Range of chemical potential/label for species X
+    DeltaY : :py:attr:`dict`
+        Range of chemical potential/label for species Y
+    x_energy : :py:attr:`float`
+        DFT energy of adsorbing species
+    y_energy : :py:attr:`float`
+        DFT energy of adsorbing species
+
+    Returns
+    -------
+    system : :py:class:`surfinpy.envelope.PhaseEnvelope`
+        Stability polygons, boundaries and triple points
+    """
+    planes = [envelope.plane_coefficients(
+        lambda x, y, phase=phase: phase_energy(phase, bulk, x, y,
+                                               x_energy, y_energy))
+              for phase in data]
+    xrange = [deltaX['Range'][0] - x_energy, deltaX['Range'][1] - x_energy]
+    yrange = [deltaY['Range'][0] - y_energy, deltaY['Range'][1] - y_energy]
+    labels = [phase.label for phase in data]
+    return envelope.lower_envelope(planes, xrange, yrange, labels,
+                                   deltaX['Label'], deltaY['Label'])
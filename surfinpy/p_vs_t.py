@@ -1,10 +1,14 @@
 import numpy as np
 from scipy.constants import value
 from surfinpy import utils as ut
+from surfinpy import profiling
 from surfinpy import plotting
+from surfinpy import results
+from surfinpy import thermo
 
 
-def calculate_surface_energy(AE, lnP, T, coverage, SE, nsurfaces):
+def calculate_surface_energy(AE, lnP, T, coverage, SE, nsurfaces, tile=None,
+                             out=None, energy_dtype=float, precision='double'):
     r"""Calculates the surface energy as a function of pressure and
     temperature for each surface system according to
 
@@ -35,24 +39,52 @@ def calculate_surface_energy(AE, lnP, T, coverage, SE, nsurfaces):
         list of dictionaries containing info on each surface
     nsurfaces : :py:attr:`int`
         total number of surface
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    out : :py:attr:`tuple`
+        Arrays to write the phase data and lowest energies into, see
+        :py:func:`surfinpy.utils.tiled_phase_data`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies, or None to only find the
+        phases
+    precision : :py:attr:`str`
+        'double' or 'single', see :py:func:`surfinpy.utils.tiled_phase_data`
 
     Returns
     -------
     SE_array : :py:attr:`array_like`
         array of integers corresponding to lowest surface energies
+    SEABS : :py:attr:`array_like`
+        lowest surface energy at each point, None if not found
     """
     R = value('molar gas constant')
     N_A = value('Avogadro constant')
-    SEABS = np.array([])
-    xnew = ut.build_xgrid(T, lnP)
-    ynew = ut.build_ygrid(T, lnP)
-    for i in range(0, (nsurfaces - 1)):
-        SE_Abs_1 = (SE + (coverage[i] / N_A) * (AE[i] - (ynew * (xnew * R))))
-        SEABS = np.append(SEABS, SE_Abs_1)
-    surface_energy_array = np.zeros(lnP.size * T.size)
-    surface_energy_array = surface_energy_array + SE
-    SEABS = np.insert(SEABS, 0, surface_energy_array)
-    phase_data, SE = ut.get_phase_data(SEABS, nsurfaces)
+    with profiling.stage('grid'):
+        xnew = ut.build_xgrid(T, lnP)
+        ynew = ut.build_ygrid(T, lnP)
+        RT = ut.compact_grid(xnew) * R
+        lnP_grid = ut.compact_grid(ynew)
+        scale = 0
+        if precision == 'single':
+            for k in range(1, nsurfaces):
+                factor = abs(coverage[k - 1] / N_A)
+                scale = max(scale, ut.term_scale(
+                    SE, factor * np.asarray(AE[k - 1]),
+                    factor * lnP_grid * RT))
+
+    def energy(k, rows, dtype=float):
+        if k == 0:
+            return dtype(SE)
+        AE_k = np.reshape(AE[k - 1], (1, -1))
+        return (dtype(SE) + dtype(coverage[k - 1] / N_A) * (
+            ut.tile_rows(AE_k, rows, dtype) - (
+                ut.tile_rows(lnP_grid, rows, dtype) *
+                ut.tile_rows(RT, rows, dtype))))
+
+    phase_data, SE = ut.tiled_phase_data(energy, nsurfaces, xnew.shape, tile, out,
+                                         energy_dtype=energy_dtype,
+                                         precision=precision, scale=scale)
     return phase_data, SE
 
 
@@ -132,7 +164,8 @@ def inititalise(thermochem, adsorbant, max_t, min_p, max_p):
     Parameters
     ----------
     thermochem : :py:attr:`array_like`
-        array containing NIST_JANAF thermochemical data
+        array containing NIST_JANAF thermochemical data, or a
+        :py:class:`surfinpy.thermo.ThermoTable`
     adsorbant : :py:attr:`float`
         dft energy of adsorbing species
     max_t : :py:attr:`int`
@@ -154,8 +187,7 @@ def inititalise(thermochem, adsorbant, max_t, min_p, max_p):
         dft values of adsorbant scaled to temperature
     '''
     T = np.arange(2, max_t)
-    shift = ut.cs_fit(thermochem[:, 0], thermochem[:, 2], T)
-    shift = (T * (shift / 1000)) / 96.485
+    shift = thermo.get_table(thermochem).entropy_correction(T)
     adsorbant_t = adsorbant - shift
     logP = np.arange(min_p, max_p, 0.1)
     lnP = np.log(10 ** logP)
@@ -163,7 +195,8 @@ def inititalise(thermochem, adsorbant, max_t, min_p, max_p):
 
 
 def calculate(stoich, data, SE, adsorbant, thermochem, max_t=1000, 
-              min_p=-13, max_p=5.5, coverage=None, transform=True):
+              min_p=-13, max_p=5.5, coverage=None, transform=True, tile=None,
+              store=None, energy_dtype=float, precision='double'):
     '''Collects input variables and intitialises the calculation.
 
     Parameters
@@ -187,6 +220,21 @@ def calculate(stoich, data, SE, adsorbant, thermochem, max_t=1000,
         Minimum pressure of phase diagram
     max_p : :py:attr:`int`
         Maximum pressure of phase diagram
+    tile : :py:attr:`int`
+        Approximate number of grid points evaluated at once. Limits the
+        memory used by large diagrams with many phases.
+    store : :py:attr:`str`
+        Directory to write the results to as memory mapped .npy files,
+        see :py:mod:`surfinpy.results`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies written to store, or None to
+        only store the phases. They are not found unless they are stored.
+    precision : :py:attr:`str`
+        'double', or 'single' to compute the surface energies in single
+        precision and only use double precision next to a phase boundary,
+        see :py:func:`surfinpy.utils.tiled_phase_data`. Gives the same
+        phases, but the energies written to store are only accurate to
+        single precision, even when energy_dtype is float.
 
     Returns
     -------
@@ -198,18 +246,32 @@ def calculate(stoich, data, SE, adsorbant, thermochem, max_t=1000,
     lnP, logP, T, adsorbant_t = inititalise(thermochem, adsorbant, max_t, min_p, max_p)
     nsurfaces = len(data) + 1
     AE = adsorption_energy(data, stoich, adsorbant_t)
+    out = None
+    if store is None:
+        energy_dtype = None
+    else:
+        out = results.allocate(store, (lnP.size, T.size),
+                               energy_dtype is not None,
+                               ut.phase_dtype(nsurfaces), energy_dtype)
     SE_array, SEABS = calculate_surface_energy(AE, lnP, T,
                                         coverage, SE,
-                                        nsurfaces)
-    ticks = np.unique([SE_array])
+                                        nsurfaces, tile, out, energy_dtype,
+                                        precision)
+    ticks = ut.unique_phases(SE_array)
     if transform is True:
-        SE_array = ut.transform_numbers(SE_array, ticks)
+        if out is None:
+            SE_array = ut.transform_numbers(SE_array, ticks)
+        else:
+            SE_array = results.relabel(SE_array, ticks)
     
     phase_grid = np.reshape(SE_array, (lnP.size, T.size))
-    SEABS = np.reshape(SEABS, (lnP.size, T.size))
-    data.insert(0, stoich)
+    if SEABS is not None:
+        SEABS = np.reshape(SEABS, (lnP.size, T.size))
     y = logP
     x = T
     z = phase_grid
-    system = plotting.PTPlot(x, y, z)
+    with profiling.stage('plot'):
+        system = plotting.PTPlot(x, y, z)
+    if store is not None:
+        results.save(store, system, SEABS)
     return system
@@ -1,9 +1,132 @@
-import matplotlib.pyplot as plt
-import matplotlib.gridspec as gridspec
 from surfinpy import utils as ut
-from surfinpy import _fig_params
-from matplotlib.colors import ListedColormap, BoundaryNorm
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _load():
+    """Imports matplotlib and the surfinpy plot formatting the first time a
+    plot is drawn, so that the calculations never load the plotting
+    stack."""
+    global plt, gridspec, _fig_params
+    import matplotlib.pyplot as plt
+    import matplotlib.gridspec as gridspec
+    from surfinpy import _fig_params
+
+
+def _colormap(colors):
+    """Colormap with one color per phase, or viridis if there are none."""
+    if colors:
+        from matplotlib.colors import ListedColormap
+        return ListedColormap(colors)
+    return "viridis"
+
+
+def _style(set_style):
+    """Context applying the surfinpy plot formatting, and then a matplotlib
+    style if one is given, to one plot only, rather than changing the style
+    for the whole process."""
+    _load()
+    if set_style:
+        return plt.style.context([_fig_params.MASTER_FORMATTING, set_style])
+    return plt.style.context(_fig_params.MASTER_FORMATTING)
+
+
+def _downsample(ax, x, y, z):
+    """Takes every n-th point of the phase grid, so that it has no more
+    points along each axis than the axes have pixels."""
+    bbox = ax.get_window_extent()
+    sy = max(1, z.shape[0] // max(int(bbox.height), 1))
+    sx = max(1, z.shape[1] // max(int(bbox.width), 1))
+    return x[::sx], y[::sy], z[::sy, ::sx]
+
+
+def _uniform(a):
+    """True if the points of an axis are evenly spaced."""
+    step = np.diff(a)
+    return step.size == 0 or np.allclose(step, step[0], rtol=1e-6)
+
+
+def _extent(a):
+    """Limits of an evenly spaced axis extended by half a step each side."""
+    half = (a[-1] - a[0]) / (2 * (a.size - 1)) if a.size > 1 else 0.5
+    return (a[0] - half, a[-1] + half)
+
+
+def _auto_levels(z):
+    """Levels contourf chooses for a grid when it is given none, as in
+    :py:meth:`matplotlib.contour.ContourSet._autolev`."""
+    from matplotlib.ticker import MaxNLocator
+    zmin, zmax = float(np.amin(z)), float(np.amax(z))
+    levels = MaxNLocator(8, min_n_ticks=1).tick_values(zmin, zmax)
+    under = np.flatnonzero(levels < zmin)
+    over = np.flatnonzero(levels > zmax)
+    i0 = under[-1] if under.size else 0
+    i1 = over[0] + 1 if over.size else levels.size
+    if i1 - i0 < 3:
+        i0, i1 = 0, levels.size
+    return levels[i0:i1]
+
+
+def _phases(ax, x, y, z, levels, cmap, raster=False):
+    """Draws the phase grid on the axes, either as filled contours or, when
+    raster is set, as an image downsampled to the size of the axes. The
+    image uses the bands and colors contourf would, so each phase has the
+    same color and the colorbar, its ticks and its labels are unchanged.
+
+    Parameters
+    ----------
+    ax : :py:class:`matplotlib.axes.Axes`
+        Axes to draw on
+    x : :py:attr:`array_like`
+        x axis
+    y : :py:attr:`array_like`
+        y axis
+    z : :py:attr:`array_like`
+        two dimensional grid of ints, one for each phase
+    levels : :py:attr:`array_like`
+        Boundaries between the phases, see :py:func:`surfinpy.utils.get_levels`,
+        or None to let contourf choose them
+    cmap : :py:attr:`str`
+        Colourmap
+    raster : :py:attr:`bool`
+        Draw an image rather than contours
+
+    Returns
+    -------
+    mappable : :py:class:`matplotlib.cm.ScalarMappable`
+        Contours or image, for the colorbar
+    """
+    if not raster:
+        if levels is None:
+            return ax.contourf(x, y, z, cmap=cmap)
+        return ax.contourf(x, y, z, levels=levels, cmap=cmap)
+    from matplotlib.colors import BoundaryNorm, ListedColormap, Normalize
+    if levels is None:
+        levels = _auto_levels(z)
+    levels = np.asarray(levels, dtype=float)
+    # contourf colors each band by its middle value, scaled between the
+    # first and last levels
+    middle = (levels[:-1] + levels[1:]) / 2
+    colors = plt.get_cmap(cmap)(Normalize(levels[0], levels[-1])(middle))
+    cmap = ListedColormap(colors)
+    norm = BoundaryNorm(levels, cmap.N)
+    xs, ys, zs = _downsample(ax, np.asarray(x), np.asarray(y), np.asarray(z))
+    # A value on a level is in the band below it, as with contourf, so
+    # each point is moved to the middle of its band
+    band = np.clip(np.searchsorted(levels, zs) - 1, 0, middle.size - 1)
+    zs = middle[band]
+    if _uniform(xs) and _uniform(ys):
+        # Each pixel is centred on its point, as with pcolormesh
+        mappable = ax.imshow(zs, cmap=cmap, norm=norm, origin='lower',
+                             extent=_extent(xs) + _extent(ys), aspect='auto',
+                             interpolation='nearest')
+    else:
+        mappable = ax.pcolormesh(xs, ys, zs, cmap=cmap, norm=norm,
+                                 shading='nearest', rasterized=True)
+    ax.set_xlim(x[0], x[-1])
+    ax.set_ylim(y[0], y[-1])
+    return mappable
+
 
 class ChemicalPotentialPlot:
     """Class that plots a phase diagram as a function of chemical potential.
@@ -46,17 +169,41 @@ class ChemicalPotentialPlot:
         self.ylabel = ylabel
         self.levels = ut.get_levels(self.z)
         self.ticky = ut.get_ticks(self.ticks)
-        if colors:
-            self.cmap = ListedColormap(self.colors)
-        else:
-            self.cmap = "viridis"
+        self._cmap = None
+
+    @property
+    def cmap(self):
+        """Colormap of the phases, built when it is first used."""
+        if self._cmap is None:
+            self._cmap = _colormap(self.colors)
+        return self._cmap
+
+    @cmap.setter
+    def cmap(self, cmap):
+        self._cmap = cmap
+
+    def phase_boundaries(self):
+        """Boundaries between the phases of the diagram as polylines, see
+        :py:func:`surfinpy.boundaries.phase_boundaries`. They can be drawn
+        on any plot with the same axes with
+        :py:func:`surfinpy.boundaries.draw_boundaries`.
+
+        Returns
+        -------
+        boundaries : :py:attr:`list`
+            Tuples of the two phases either side of a boundary, as
+            positions in labels, and the points along it
+        """
+        from surfinpy import boundaries
+        return boundaries.phase_boundaries(self.x, self.y, self.z)
 
     def plot_phase(self,
                    temperature=None,
                    colourmap=None,
                    set_style=None, 
                    figsize=None,
-                   cbar_title=None):
+                   cbar_title=None,
+                   raster=False):
         """Plots a simple phase diagram as a function of chemical potential.
 
         Parameters
@@ -69,29 +216,31 @@ class ChemicalPotentialPlot:
             Plot style
         figsize: :py:attr:`tuple`
             Set a custom figure size.
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        CM = ax.contourf(self.x, self.y, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_ylabel("$\Delta \mu_{\mathrm{" + self.ylabel + "}}$" + " (eV)")
-        ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
-        cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        plt.tight_layout()
-        return ax
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
+            fig = plt.figure(figsize=figsize)
+            ax = fig.add_subplot(111)
+            CM = _phases(ax, self.x, self.y, self.z, self.levels, cmap, raster)
+            ax.set_ylabel("$\Delta \mu_{\mathrm{" + self.ylabel + "}}$" + " (eV)")
+            ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
+            cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            plt.tight_layout()
+            return ax
 
     def plot_mu_p(self,
                   temperature,
                   colourmap=None,
                   set_style=None, 
                   cbar_title=None, 
-                  figsize=(6, 6)):
+                  figsize=(6, 6),
+                  raster=False):
         """ Plots a phase diagram  with two sets of axis, one as a function of
         chemical potential and the second is as a function of pressure.
 
@@ -105,42 +254,44 @@ class ChemicalPotentialPlot:
             Plot style
         cbar_label : :py:attr:`str`
             Label for colorbar
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
 
-        p1 = ut.pressure(self.x, temperature)
-        p2 = ut.pressure(self.y, temperature)
-        fig = plt.figure(dpi=96, tight_layout=1, figsize=figsize)
-        ax = fig.add_subplot(121)
-        gs = gridspec.GridSpec(1, 2, width_ratios=[.95, .05])
-        ax, axR = plt.subplot(gs[0]), plt.subplot(gs[1])
-        CM = ax.contourf(self.x, self.y, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
-        ax.set_ylabel("$\Delta \mu_{\mathrm{" + self.ylabel + "}}$" + " (eV)")
-        ax2 = ax.twinx()
-        ax2.set_ylim(p2[0], p2[-1])
-        ax2.set_ylabel("$P_" + "{\mathrm{" + self.ylabel + "}}$" + str(temperature) + " K (bar)")
-        ax3 = ax.twiny()
-        ax3.set_xlim(p1[0], p1[-1])
-        ax3.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
-        ax.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
-        ax2.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
-        ax3.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
-        cbar = fig.colorbar(CM, extend='both', cax=axR, ticks=self.ticky)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        return ax
+            p1 = ut.pressure(self.x, temperature)
+            p2 = ut.pressure(self.y, temperature)
+            fig = plt.figure(dpi=96, tight_layout=1, figsize=figsize)
+            ax = fig.add_subplot(121)
+            gs = gridspec.GridSpec(1, 2, width_ratios=[.95, .05])
+            ax, axR = plt.subplot(gs[0]), plt.subplot(gs[1])
+            CM = _phases(ax, self.x, self.y, self.z, self.levels, cmap, raster)
+            ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
+            ax.set_ylabel("$\Delta \mu_{\mathrm{" + self.ylabel + "}}$" + " (eV)")
+            ax2 = ax.twinx()
+            ax2.set_ylim(p2[0], p2[-1])
+            ax2.set_ylabel("$P_" + "{\mathrm{" + self.ylabel + "}}$" + str(temperature) + " K (bar)")
+            ax3 = ax.twiny()
+            ax3.set_xlim(p1[0], p1[-1])
+            ax3.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
+            ax.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
+            ax2.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
+            ax3.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
+            cbar = fig.colorbar(CM, extend='both', cax=axR, ticks=self.ticky)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            return ax
 
     def plot_pressure(self, 
                       temperature, 
                       colourmap=None,
                       set_style=None, 
                       figsize=(6, 6),
-                      cbar_title=None):
+                      cbar_title=None,
+                      raster=False):
         """ Plots a phase diagram as a function of pressure.
 
         Parameters
@@ -151,24 +302,25 @@ class ChemicalPotentialPlot:
             colourmap for the plot
         set_style: :py:attr:`str` 
             Plot style
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
-        p1 = ut.pressure(self.x, temperature)
-        p2 = ut.pressure(self.y, temperature)
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        CM = ax.contourf(p1, p2, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_ylabel("$P_" + "{\mathrm{" + self.ylabel + "}}$" + " 298 K (bar)")
-        ax.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + " 298 K (bar)")
-        cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        plt.tight_layout()
-        return ax
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
+            p1 = ut.pressure(self.x, temperature)
+            p2 = ut.pressure(self.y, temperature)
+            fig = plt.figure(figsize=figsize)
+            ax = fig.add_subplot(111)
+            CM = _phases(ax, p1, p2, self.z, self.levels, cmap, raster)
+            ax.set_ylabel("$P_" + "{\mathrm{" + self.ylabel + "}}$" + " 298 K (bar)")
+            ax.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + " 298 K (bar)")
+            cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            plt.tight_layout()
+            return ax
 
 
 class MuTPlot():
@@ -212,16 +364,40 @@ class MuTPlot():
         self.ylabel = ylabel
         self.levels = ut.get_levels(self.z)
         self.ticky = ut.get_ticks(self.ticks)
-        if colors:
-            self.cmap = ListedColormap(self.colors)
-        else:
-            self.cmap = "viridis"
+        self._cmap = None
+
+    @property
+    def cmap(self):
+        """Colormap of the phases, built when it is first used."""
+        if self._cmap is None:
+            self._cmap = _colormap(self.colors)
+        return self._cmap
+
+    @cmap.setter
+    def cmap(self, cmap):
+        self._cmap = cmap
+
+    def phase_boundaries(self):
+        """Boundaries between the phases of the diagram as polylines, see
+        :py:func:`surfinpy.boundaries.phase_boundaries`. They can be drawn
+        on any plot with the same axes with
+        :py:func:`surfinpy.boundaries.draw_boundaries`.
+
+        Returns
+        -------
+        boundaries : :py:attr:`list`
+            Tuples of the two phases either side of a boundary, as
+            positions in labels, and the points along it
+        """
+        from surfinpy import boundaries
+        return boundaries.phase_boundaries(self.x, self.y, self.z)
 
     def plot_mu_vs_t(self,
                     colourmap=None, 
                     set_style=None, 
                     figsize=(6, 6),
-                    cbar_title=None):
+                    cbar_title=None,
+                    raster=False):
         """Plots a simple phase diagram as a function of chemical potential.
 
         Parameters
@@ -232,29 +408,31 @@ class MuTPlot():
             Plot style
         figsize: :py:attr:`tuple`
             Set a custom figure size.
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        CM = ax.contourf(self.x, self.y, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_ylabel("Temperature (K)")
-        ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
-        cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        plt.tight_layout()
-        return ax
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
+            fig = plt.figure(figsize=figsize)
+            ax = fig.add_subplot(111)
+            CM = _phases(ax, self.x, self.y, self.z, self.levels, cmap, raster)
+            ax.set_ylabel("Temperature (K)")
+            ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
+            cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            plt.tight_layout()
+            return ax
 
     def plot_p_vs_t(self,
                     temperature,
                     colourmap=None,
                     set_style=None,
                     figsize=(6, 6),
-                    cbar_title=None):
+                    cbar_title=None,
+                    raster=False):
         """Plots a simple phase diagram as a function of chemical potential.
 
         Parameters
@@ -267,30 +445,32 @@ class MuTPlot():
             Plot style
         figsize: :py:attr:`tuple` 
             Set a custom figure size.
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
         p1 = ut.pressure(self.x, temperature)
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        CM = ax.contourf(p1, self.y, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_ylabel("Temperature (K)")
-        ax.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
-        cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        plt.tight_layout()
-        return ax
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
+            fig = plt.figure(figsize=figsize)
+            ax = fig.add_subplot(111)
+            CM = _phases(ax, p1, self.y, self.z, self.levels, cmap, raster)
+            ax.set_ylabel("Temperature (K)")
+            ax.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
+            cbar = fig.colorbar(CM, ticks=self.ticky, pad=0.1)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            plt.tight_layout()
+            return ax
 
     def plot_mu_vs_t_vs_p(self,
                           temperature,
                           colourmap=None,
                           set_style=None,
                           figsize=(6, 6), 
-                          cbar_title=None):
+                          cbar_title=None,
+                          raster=False):
         """Plots a simple phase diagram as a function of chemical potential.
 
         Parameters
@@ -303,30 +483,31 @@ class MuTPlot():
             Plot style
         figsize: :py:attr:`tuple` 
             Set a custom figure size.
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        if colourmap:
-            self.cmap = colourmap
-        p1 = ut.pressure(self.x, temperature)
+        with _style(set_style):
+            cmap = colourmap if colourmap else self.cmap
+            p1 = ut.pressure(self.x, temperature)
 
-        fig = plt.figure(dpi=96, tight_layout=1, figsize=figsize)
-        ax = fig.add_subplot(121)
-        gs = gridspec.GridSpec(1, 2, width_ratios=[.95, .05])
-        ax, axR = plt.subplot(gs[0]), plt.subplot(gs[1])
-        CM = ax.contourf(self.x, self.y, self.z, levels=self.levels, cmap=self.cmap)
-        ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
-        ax.set_ylabel("Temperature (K)")
-        ax3 = ax.twiny()
-        ax3.set_xlim(p1[0], p1[-1])
-        ax3.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
-        ax.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
-        ax3.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
-        cbar = fig.colorbar(CM, extend='both', cax=axR, ticks=self.ticky)
-        cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
-        if cbar_title:
-            cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
-        return ax
+            fig = plt.figure(dpi=96, tight_layout=1, figsize=figsize)
+            ax = fig.add_subplot(121)
+            gs = gridspec.GridSpec(1, 2, width_ratios=[.95, .05])
+            ax, axR = plt.subplot(gs[0]), plt.subplot(gs[1])
+            CM = _phases(ax, self.x, self.y, self.z, self.levels, cmap, raster)
+            ax.set_xlabel("$\Delta \mu_{\mathrm{" + self.xlabel + "}}$" + " (eV)")
+            ax.set_ylabel("Temperature (K)")
+            ax3 = ax.twiny()
+            ax3.set_xlim(p1[0], p1[-1])
+            ax3.set_xlabel("$P_" + "{\mathrm{" + self.xlabel + "}}$" + str(temperature) + " K (bar)")
+            ax.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
+            ax3.tick_params(labelsize=_fig_params.FONTSIZE*0.8)
+            cbar = fig.colorbar(CM, extend='both', cax=axR, ticks=self.ticky)
+            cbar.ax.set_yticklabels(self.labels, fontsize=_fig_params.FONTSIZE*0.8)
+            if cbar_title:
+                cbar.ax.set_title(cbar_title, y=1.01, x=4, fontsize=_fig_params.FONTSIZE*0.8)
+            return ax
 
   
 class PTPlot:
@@ -349,10 +530,26 @@ class PTPlot:
         self.y = y
         self.z = z
 
+    def phase_boundaries(self):
+        """Boundaries between the phases of the diagram as polylines, see
+        :py:func:`surfinpy.boundaries.phase_boundaries`. They can be drawn
+        on any plot with the same axes with
+        :py:func:`surfinpy.boundaries.draw_boundaries`.
+
+        Returns
+        -------
+        boundaries : :py:attr:`list`
+            Tuples of the two phases either side of a boundary and the
+            points along it
+        """
+        from surfinpy import boundaries
+        return boundaries.phase_boundaries(self.x, self.y, self.z)
+
     def plot(self, colourmap="viridis", 
              set_style=None, figsize=(6, 6), 
              ylabel="log P (bar)",
-             xlabel="Temperature (K)"):
+             xlabel="Temperature (K)",
+             raster=False):
         """plots phase diagram
 
         Parameters
@@ -361,13 +558,101 @@ class PTPlot:
             colourmap for phase diagram
         set_style: :py:attr:`str`
             Plot style
+        raster : :py:attr:`bool`
+            Draw the phases as an image, downsampled to the size of the
+            figure, rather than as contours. Much faster for large grids.
         """
-        if set_style:
-            plt.style.use(set_style)
-        fig = plt.figure(figsize=figsize)
-        ax = fig.add_subplot(111)
-        ax.contourf(self.x, self.y, self.z, cmap=colourmap)        
-        ax.set_xlabel(xlabel)
-        ax.set_ylabel(ylabel)
-        plt.tight_layout()
-        return ax
+        with _style(set_style):
+            fig = plt.figure(figsize=figsize)
+            ax = fig.add_subplot(111)
+            _phases(ax, self.x, self.y, self.z, None, colourmap, raster)
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+            plt.tight_layout()
+            return ax
+
+
+_DEFAULT_METHODS = {'ChemicalPotentialPlot': 'plot_phase',
+                    'MuTPlot': 'plot_mu_vs_t',
+                    'PTPlot': 'plot'}
+
+
+def _render_agg(job):
+    """Draws one figure of :py:func:`export` in a worker process, with the
+    non interactive Agg backend."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    return _render(job)
+
+
+def _render(job):
+    """Draws one figure of :py:func:`export` and saves it."""
+    system, filename, method, kwargs, dpi = job
+    if isinstance(system, str):
+        from surfinpy import results
+        system = results.load(system)
+    if hasattr(system, 'to_plot'):
+        system = system.to_plot()
+    if method is None:
+        method = _DEFAULT_METHODS[type(system).__name__]
+    ax = getattr(system, method)(**kwargs)
+    fig = ax.figure
+    try:
+        with _style(kwargs.get('set_style')):
+            fig.savefig(filename, dpi=dpi)
+    finally:
+        plt.close(fig)
+    return filename
+
+
+def export(systems, filenames, method=None, processes=None, dpi=None,
+           **kwargs):
+    """Draws many phase diagrams and saves them, in parallel across a pool
+    of processes. The figures are drawn with the non interactive Agg
+    backend and every figure applies its own style, see set_style, so the
+    figures do not depend on the order they are drawn in.
+
+    Parameters
+    ----------
+    systems : :py:attr:`list`
+        Plotting objects, :py:class:`surfinpy.results.ResultBundle`
+        objects or result directories written by
+        :py:func:`surfinpy.results.save`
+    filenames : :py:attr:`list`
+        File to save each figure to, the format is taken from the
+        extension, e.g. .png, .svg or .pdf
+    method : :py:attr:`str`
+        Name of the plotting method, e.g. plot_mu_p. If None, plot_phase
+        is used for a ChemicalPotentialPlot, plot_mu_vs_t for a MuTPlot and
+        plot for a PTPlot
+    processes : :py:attr:`int`
+        Number of worker processes, all available cores if None. With 1 the
+        figures are drawn in this process, which switches back to its own
+        backend afterwards.
+    dpi : :py:attr:`float`
+        Resolution of raster formats, the figure dpi if None
+    kwargs : :py:attr:`dict`
+        Passed to the plotting method of every figure, e.g. set_style,
+        raster or temperature
+
+    Returns
+    -------
+    filenames : :py:attr:`list`
+        Files written
+    """
+    if len(systems) != len(filenames):
+        raise ValueError("export needs one filename for each figure, "
+                         "got {} figures and {} filenames".format(
+                             len(systems), len(filenames)))
+    jobs = [(system, filename, method, kwargs, dpi)
+            for system, filename in zip(systems, filenames)]
+    if processes == 1:
+        _load()
+        backend = plt.get_backend()
+        plt.switch_backend('Agg')
+        try:
+            return [_render(job) for job in jobs]
+        finally:
+            plt.switch_backend(backend)
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(_render_agg, jobs))
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+# Profiles active in each thread, innermost last
+_active = threading.local()
+# tracemalloc.reset_peak is new in Python 3.9
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+@contextmanager
+def _disabled():
+    yield
+
+
+class Profile:
+    """Records the time, and optionally the memory, spent in each stage of
+    a phase diagram calculation. Nothing is recorded unless a profile is
+    active, see :py:func:`profile`.
+
+    The stages recorded by surfinpy are
+
+    - grid: building the chemical potential, temperature or pressure grids
+    - vibrational: setting up the vibrational properties of each phase
+    - energy: evaluating the energy of one phase, with its phase number
+    - reduction: finding the most stable phase, see
+      :py:func:`surfinpy.utils.get_phase_data`
+    - recheck: finding the most stable phase again in double precision
+      at the points where single precision could have changed it, with
+      the number of points, see :py:func:`surfinpy.utils.single_phase_data`
+    - relabel: numbering the stable phases 0, 1, 2, etc, see
+      :py:func:`surfinpy.utils.transform_numbers`
+    - plot: building the plotting object
+
+    Parameters
+    ----------
+    memory : :py:attr:`bool`
+        Also record the memory allocated in each stage with tracemalloc,
+        which slows the calculation down. The peak memory of each stage is
+        only recorded from Python 3.9.
+    callback : :py:attr:`callable`
+        Called with each record as it is completed
+    """
+    def __init__(self, memory=False, callback=None):
+        self.memory = memory
+        self.callback = callback
+        self.records = []
+        self._origin = time.perf_counter()
+        self._stack = threading.local()
+        self._lock = threading.Lock()
+
+    def _frames(self):
+        if not hasattr(self._stack, 'frames'):
+            self._stack.frames = []
+        return self._stack.frames
+
+    @contextmanager
+    def stage(self, name, **args):
+        """Records a single stage, see :py:func:`stage`."""
+        frames = self._frames()
+        frame = {'peak': 0}
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if frames:
+                frames[-1]['peak'] = max(frames[-1]['peak'], peak)
+            if _reset_peak is not None:
+                _reset_peak()
+            frame['current'] = current
+        frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            frames.pop()
+            record = {'name': name,
+                      'start': start - self._origin,
+                      'duration': end - start,
+                      'depth': len(frames),
+                      'thread': threading.get_ident(),
+                      'args': args}
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(frame['peak'], peak)
+                record['allocated'] = current - frame['current']
+                if _reset_peak is not None:
+                    record['peak'] = peak - frame['current']
+                if frames:
+                    frames[-1]['peak'] = max(frames[-1]['peak'], peak)
+            with self._lock:
+                self.records.append(record)
+            if self.callback is not None:
+                self.callback(record)
+
+    def summary(self):
+        """Totals the time spent in each stage.
+
+        Returns
+        -------
+        summary : :py:attr:`dict`
+            Number of calls, total time and, if recorded, largest peak memory
+            of each stage
+        """
+        summary = {}
+        for record in self.records:
+            total = summary.setdefault(record['name'],
+                                       {'calls': 0, 'time': 0.0})
+            total['calls'] += 1
+            total['time'] += record['duration']
+            if 'peak' in record:
+                total['peak'] = max(total.get('peak', 0), record['peak'])
+        return summary
+
+    def to_chrome_trace(self, filename=None):
+        """Converts the records to the Chrome trace event format, which can
+        be opened in chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        filename : :py:attr:`str`
+            File to write the trace to
+
+        Returns
+        -------
+        trace : :py:attr:`dict`
+            Trace events
+        """
+        events = []
+        for record in self.records:
+            args = dict(record['args'])
+            for key in ('allocated', 'peak'):
+                if key in record:
+                    args[key] = record[key]
+            events.append({'name': record['name'],
+                           'cat': 'surfinpy',
+                           'ph': 'X',
+                           'ts': record['start'] * 1e6,
+                           'dur': record['duration'] * 1e6,
+                           'pid': os.getpid(),
+                           'tid': record['thread'],
+                           'args': args})
+        trace = {'traceEvents': events, 'displayTimeUnit': 'ms'}
+        if filename is not None:
+            with open(filename, 'w') as file:
+                json.dump(trace, file)
+        return trace
+
+
+@contextmanager
+def profile(memory=False, callback=None):
+    """Records every stage of the calculations run inside the context.
+
+    Parameters
+    ----------
+    memory : :py:attr:`bool`
+        Also record the memory allocated in each stage
+    callback : :py:attr:`callable`
+        Called with each record as it is completed
+
+    Returns
+    -------
+    profile : :py:class:`surfinpy.profiling.Profile`
+        The records, filled in as the calculations run
+
+    Examples
+    --------
+    >>> with profiling.profile() as prof:
+    ...     mu_vs_mu.calculate(data, bulk, deltaX, deltaY)
+    >>> prof.summary()
+    """
+    recorder = Profile(memory, callback)
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if not hasattr(_active, 'profiles'):
+        _active.profiles = []
+    _active.profiles.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _active.profiles.pop()
+        if started:
+            tracemalloc.stop()
+
+
+def stage(name, **args):
+    """Marks a stage of a calculation. Does nothing unless a profile is
+    active.
+
+    Parameters
+    ----------
+    name : :py:attr:`str`
+        Name of the stage
+    args : :py:attr:`dict`
+        Details stored with the record, e.g. the phase number
+
+    Returns
+    -------
+    context : context manager
+        Context covering the stage
+    """
+    profiles = getattr(_active, 'profiles', None)
+    if not profiles:
+        return _disabled()
+    return profiles[-1].stage(name, **args)
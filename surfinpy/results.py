@@ -0,0 +1,270 @@
+import os
+import json
+import numpy as np
+from surfinpy import utils as ut
+
+PHASES = 'phases.npy'
+ENERGY = 'energy.npy'
+XAXIS = 'x.npy'
+YAXIS = 'y.npy'
+METADATA = 'metadata.json'
+
+
+def allocate(directory, shape, energy=True, dtype=int, energy_dtype=float):
+    """Creates memory mapped .npy files in a result directory for the phase
+    data and lowest energies of a phase diagram, so that they can be
+    written to as the diagram is calculated.
+
+    Parameters
+    ----------
+    directory : :py:attr:`str`
+        Result directory, created if it does not exist
+    shape : :py:attr:`tuple`
+        Shape of the phase diagram grid
+    energy : :py:attr:`bool`
+        Also create a file for the lowest energies
+    dtype : :py:attr:`type`
+        Type of the phase data
+    energy_dtype : :py:attr:`type`
+        Type of the lowest energies
+
+    Returns
+    -------
+    phases : :py:attr:`numpy.memmap`
+        Memory mapped phase data
+    energies : :py:attr:`numpy.memmap`
+        Memory mapped lowest energies, None if energy is False
+    """
+    os.makedirs(directory, exist_ok=True)
+    phases = np.lib.format.open_memmap(os.path.join(directory, PHASES),
+                                       mode='w+', dtype=dtype, shape=shape)
+    energies = None
+    if energy:
+        energies = np.lib.format.open_memmap(os.path.join(directory, ENERGY),
+                                             mode='w+', dtype=energy_dtype,
+                                             shape=shape)
+    return phases, energies
+
+
+def relabel(Z, ticks, block=1048576):
+    """Converts the phase data in place to numbers scaled 0, 1, 2, etc, as
+    :py:func:`surfinpy.utils.transform_numbers`, a block at a time so that
+    memory mapped data is never loaded in full.
+
+    Parameters
+    ----------
+    Z : :py:attr:`array_like`
+        Contiguous array of integers
+    ticks : :py:attr:`array_like`
+        unique phases
+    block : :py:attr:`int`
+        Number of values converted at once
+
+    Returns
+    -------
+    Z : :py:attr:`array_like`
+        The same array, normalised to a continuous set of numbers.
+    """
+    flat = np.reshape(Z, -1)
+    for start in range(0, flat.size, block):
+        values = flat[start:start + block]
+        values[...] = ut.transform_numbers(values, ticks)
+    return Z
+
+
+def _write(directory, name, values):
+    """Saves an array as a .npy file in a result directory, unless it is
+    already memory mapped from that file."""
+    path = os.path.join(directory, name)
+    filename = getattr(values, 'filename', None)
+    if filename is not None and os.path.exists(path) and \
+            os.path.samefile(filename, path):
+        values.flush()
+    else:
+        np.save(path, np.asarray(values))
+
+
+def save(directory, system, energy=None):
+    """Writes a calculated phase diagram to a result directory. The axes,
+    phase data and lowest energies are stored as .npy files that can be
+    memory mapped, with the labels, colors and axis labels alongside them
+    in metadata.json.
+
+    Parameters
+    ----------
+    directory : :py:attr:`str`
+        Result directory, created if it does not exist
+    system : :py:class:`surfinpy.plotting.ChemicalPotentialPlot`
+        Plotting object, a :py:class:`surfinpy.plotting.MuTPlot` or a
+        :py:class:`surfinpy.plotting.PTPlot`
+    energy : :py:attr:`array_like`
+        Lowest energy at each point of the phase diagram. If None, any
+        energies already in the directory are removed.
+
+    Returns
+    -------
+    directory : :py:attr:`str`
+        Result directory
+    """
+    os.makedirs(directory, exist_ok=True)
+    _write(directory, XAXIS, system.x)
+    _write(directory, YAXIS, system.y)
+    _write(directory, PHASES, system.z)
+    if energy is not None:
+        _write(directory, ENERGY, energy)
+    elif os.path.exists(os.path.join(directory, ENERGY)):
+        # Energies of an earlier result would not match these phases
+        os.remove(os.path.join(directory, ENERGY))
+    metadata = {'kind': type(system).__name__}
+    for name in ('labels', 'colors', 'xlabel', 'ylabel'):
+        metadata[name] = getattr(system, name, None)
+    ticks = getattr(system, 'ticks', None)
+    if ticks is not None:
+        metadata['ticks'] = np.asarray(ticks).tolist()
+    with open(os.path.join(directory, METADATA), 'w') as file:
+        json.dump(metadata, file)
+    return directory
+
+
+class ResultBundle:
+    """Phase diagram read back from a result directory. The phase data and
+    lowest energies are memory mapped, so they are only read from disk as
+    they are used.
+
+    Parameters
+    ----------
+    x : :py:attr:`array_like`
+        x axis
+    y : :py:attr:`array_like`
+        y axis
+    z : :py:attr:`array_like`
+        two dimensional array of phases
+    energy : :py:attr:`array_like`
+        two dimensional array of lowest energies, None if not stored
+    metadata : :py:attr:`dict`
+        labels, ticks, colors, axis labels and the kind of plotting object
+    """
+    def __init__(self, x, y, z, energy, metadata):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.energy = energy
+        self.metadata = metadata
+        self.kind = metadata.get('kind')
+        self.labels = metadata.get('labels')
+        self.colors = metadata.get('colors')
+        self.xlabel = metadata.get('xlabel')
+        self.ylabel = metadata.get('ylabel')
+        self.ticks = None
+        if metadata.get('ticks') is not None:
+            self.ticks = np.array(metadata['ticks'])
+
+    def to_plot(self):
+        """Builds the plotting object for the stored phase diagram.
+
+        Returns
+        -------
+        system : :py:class:`surfinpy.plotting.ChemicalPotentialPlot`
+            Plotting object of the kind that was stored
+        """
+        from surfinpy import plotting
+        if self.kind == 'PTPlot':
+            return plotting.PTPlot(self.x, self.y, self.z)
+        plot = getattr(plotting, self.kind)
+        return plot(self.x, self.y, self.z, self.labels, self.ticks,
+                    self.colors, self.xlabel, self.ylabel)
+
+
+class PhaseVolume:
+    """Phase diagrams sharing the same axes, labels and colors at a series
+    of temperatures, stacked into a single (nT, ny, nx) volume.
+
+    Parameters
+    ----------
+    temperatures : :py:attr:`array_like`
+        Temperature of each phase diagram
+    x : :py:attr:`array_like`
+        x axis
+    y : :py:attr:`array_like`
+        y axis
+    z : :py:attr:`array_like`
+        (nT, ny, nx) array of phases, numbered 0, 1, 2, etc as ticks
+    energy : :py:attr:`array_like`
+        (nT, ny, nx) array of lowest energies, None if not found
+    labels : :py:attr:`list`
+        Label of each phase in the volume
+    ticks : :py:attr:`array_like`
+        Phases in the volume, numbered from 1
+    colors : :py:attr:`list`
+        Color of each phase in the volume, or None
+    xlabel : :py:attr:`str`
+        species name for x axis label
+    ylabel : :py:attr:`str`
+        species name for y axis label
+    """
+    def __init__(self, temperatures, x, y, z, energy, labels, ticks, colors,
+                 xlabel, ylabel):
+        self.temperatures = temperatures
+        self.x = x
+        self.y = y
+        self.z = z
+        self.energy = energy
+        self.labels = labels
+        self.ticks = ticks
+        self.colors = colors
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+
+    def to_plot(self, index):
+        """Builds the plotting object for the phase diagram at one
+        temperature, keeping only the phases present at that temperature.
+
+        Parameters
+        ----------
+        index : :py:attr:`int`
+            Position of the temperature in :py:attr:`temperatures`
+
+        Returns
+        -------
+        system : :py:class:`surfinpy.plotting.ChemicalPotentialPlot`
+            Plotting object
+        """
+        from surfinpy import plotting
+        present = ut.unique_phases(self.z[index])
+        z = ut.transform_numbers(self.z[index], present)
+        labels = [self.labels[i] for i in present]
+        colors = None
+        if self.colors is not None:
+            colors = [self.colors[i] for i in present]
+        return plotting.ChemicalPotentialPlot(self.x, self.y, z, labels,
+                                              np.asarray(self.ticks)[present],
+                                              colors, self.xlabel,
+                                              self.ylabel)
+
+
+def load(directory, mmap_mode='r'):
+    """Opens a result directory written by :py:func:`save` without reading
+    the phase data or energies into memory.
+
+    Parameters
+    ----------
+    directory : :py:attr:`str`
+        Result directory
+    mmap_mode : :py:attr:`str`
+        Mode used to memory map the phase data and energies, see
+        :py:func:`numpy.load`
+
+    Returns
+    -------
+    bundle : :py:class:`surfinpy.results.ResultBundle`
+        Stored phase diagram
+    """
+    with open(os.path.join(directory, METADATA), 'r') as file:
+        metadata = json.load(file)
+    x = np.load(os.path.join(directory, XAXIS))
+    y = np.load(os.path.join(directory, YAXIS))
+    z = np.load(os.path.join(directory, PHASES), mmap_mode=mmap_mode)
+    energy = None
+    if os.path.exists(os.path.join(directory, ENERGY)):
+        energy = np.load(os.path.join(directory, ENERGY), mmap_mode=mmap_mode)
+    return ResultBundle(x, y, z, energy, metadata)
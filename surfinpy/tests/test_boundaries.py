@@ -0,0 +1,65 @@
+import numpy as np
+from surfinpy import boundaries
+from surfinpy import mu_vs_mu
+from surfinpy import data
+import unittest
+from numpy.testing import assert_almost_equal
+
+
+class TestBoundaries(unittest.TestCase):
+
+    def test_phase_boundaries(self):
+        x = np.linspace(-3, 2, 101)
+        y = np.linspace(-2, 2, 81)
+        X, Y = np.meshgrid(x, y)
+        z = np.where(X < 0.01, 0, np.where(Y < 0.01, 1, 2))
+        found = boundaries.phase_boundaries(x, y, z)
+        pairs = [pair for pair, points in found]
+        assert pairs == [(0, 1), (0, 2), (1, 2)]
+        points = dict(found)
+        assert_almost_equal(points[(0, 1)], [[0.025, -2.0], [0.025, 0.025]])
+        assert_almost_equal(points[(0, 2)], [[0.025, 2.0], [0.025, 0.025]])
+        assert_almost_equal(points[(1, 2)], [[2.0, 0.025], [0.025, 0.025]])
+
+    def test_closed_boundary(self):
+        z = np.zeros((10, 12), dtype=int)
+        z[3:6, 4:8] = 3
+        found = boundaries.phase_boundaries(np.arange(12), np.arange(10), z)
+        assert len(found) == 1
+        pair, points = found[0]
+        assert pair == (0, 3)
+        assert_almost_equal(points[0], points[-1])
+        assert_almost_equal(np.amin(points, axis=0), [3.5, 2.5])
+        assert_almost_equal(np.amax(points, axis=0), [7.5, 5.5])
+
+    def test_boundary_segments(self):
+        z = np.array([[0, 1],
+                      [1, 0]])
+        start, end, pairs = boundaries.boundary_segments(z)
+        assert start.shape == (2, 2)
+        assert_almost_equal(pairs, [[0, 1], [0, 1]])
+        z = np.array([[0, 1],
+                      [2, 3]])
+        start, end, pairs = boundaries.boundary_segments(z)
+        assert_almost_equal(end, [[1, 1]] * 4)
+        assert boundaries.phase_boundaries([0, 1], [0, 1], np.ones((2, 2))) == []
+
+    def test_plot_boundaries(self):
+        import matplotlib.pyplot as plt
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                            energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                           energy = -580.00, label = "One", nspecies = 1)
+        deltaX = {'Range': [-3, 0], 'Label': 'O'}
+        deltaY = {'Range': [-3, 0], 'Label': 'H_2O'}
+        calculated, SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY)
+        found = calculated.phase_boundaries()
+        assert [pair for pair, points in found] == [(0, 1)]
+        points = found[0][1]
+        assert points.shape == (2, 2)
+        assert_almost_equal(points[:, 1], -2.5, decimal=1)
+        ax = calculated.plot_phase(raster=True)
+        lines = boundaries.draw_boundaries(ax, found)
+        assert len(lines.get_segments()) == 1
+        plt.close('all')
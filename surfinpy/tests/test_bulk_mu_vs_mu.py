@@ -35,4 +35,16 @@ class Testbulk_mu_vs_mu(unittest.TestCase):
         phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -100.0, label = "Periclase")
         ref = {'Range': [ -3, 2],  'Label': 'test'}
         calculated = bulk_mu_vs_mu.calculate([phase_1, phase_2], bulk, ref, ref, -10, -10)
-        assert calculated.z[0, 0] == 0
\ No newline at end of file
+        assert calculated.z[0, 0] == 0
+        for options in ({'tile': 1000}, {'precision': 'single'}):
+            with self.assertRaises(ValueError):
+                bulk_mu_vs_mu.calculate([phase_1, phase_2], bulk, ref, ref, -10, -10, adaptive=True, **options)
+
+    def test_calculate_envelope(self):
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 10, energy = -90.0, label = "Periclase")
+        phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -100.0, label = "Periclase")
+        ref = {'Range': [ -3, 2],  'Label': 'test'}
+        calculated = bulk_mu_vs_mu.calculate_envelope([phase_1, phase_2], bulk, ref, ref, -10, -10)
+        assert np.array_equal(calculated.phases, np.array([2]))
+        assert_almost_equal(calculated.area(2), 25.0)
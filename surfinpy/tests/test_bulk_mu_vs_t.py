@@ -35,4 +35,27 @@ class Testbulk_mu_vs_mu(unittest.TestCase):
         phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -100.0, label = "Periclase")
         ref = {'Range': [ 0, 10],  'Label': 'test'}
         calculated = bulk_mu_vs_t.calculate([phase_1, phase_2], bulk, ref, ref, 10, 10, 0, np.arange(0, 10, 0.01), np.arange(0, 10, 0.01))
-        assert calculated.z[0, 0] == 0
\ No newline at end of file
+        assert calculated.z[0, 0] == 0
+
+    def test_calculate_tiled(self):
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 1, y = 10, energy = -90.0, label = "Periclase")
+        phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -100.0, label = "Periclase")
+        ref = {'Range': [ 0, 10],  'Label': 'test'}
+        exp = np.arange(0, 10, 0.01)
+        calculated = bulk_mu_vs_t.calculate([phase_1, phase_2], bulk, ref, ref, 10, 10, 0, exp, exp)
+        tiled = bulk_mu_vs_t.calculate([phase_1, phase_2], bulk, ref, ref, 10, 10, 0, exp, exp, tile=5000)
+        assert np.array_equal(calculated.z, tiled.z)
+
+    def test_evaluate_phases_mixed_entropy(self):
+        test_yaml = os.path.join(os.path.dirname(__file__), 'test.yaml')
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, file = test_yaml, funits = 10, temp_range=[100, 120])
+        phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -500.0, label = "Periclase", funits = 10)
+        x = np.arange(100, 120, 1)
+        y = np.arange(0, 10, 1)
+        exp = np.arange(0, 20, 1)
+        both = bulk_mu_vs_t.evaluate_phases([phase_1, phase_2], bulk, x, y, 2, 10, 10, 10, exp, exp)
+        alone = bulk_mu_vs_t.evaluate_phases([phase_2], bulk, x, y, 1, 10, 10, 10, exp, exp)
+        assert np.all(both[0] == 2)
+        assert_almost_equal(both[1], alone[1])
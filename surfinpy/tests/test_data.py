@@ -29,4 +29,45 @@ class TestReferenceData(unittest.TestCase):
 
     def test_dataset_2(self):
         phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, file = test_data, funits = 10, temp_range=[100, 120])
-        assert_almost_equal(phase_1.svib[0], 1.6076787893E-03)
\ No newline at end of file
+        assert_almost_equal(phase_1.svib[0], 1.6076787893E-03)
+
+    def test_dataset_lazy(self):
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, file = 'missing.yaml', funits = 10, temp_range=[100, 120])
+        assert phase_1.temperature == 100
+        with self.assertRaises(FileNotFoundError):
+            phase_1.svib
+
+    def test_dataset_temp_step(self):
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, zpe = True, file = test_data, funits = 10, temp_range=[100, 120])
+        assert phase_1.svib.size == 20
+        phase_1.temp_step = 0.01
+        assert phase_1.svib.size == 2000
+        assert_almost_equal(phase_1.svib[0], 1.6076787893E-03)
+        assert_almost_equal(phase_1.zpev, 0.0017047827283306525)
+
+    def test_dataset_temp_r(self):
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, zpe = True, file = test_data, funits = 10, temp_range=[100, 120])
+        assert phase_1.svib.size == 20
+        phase_1.zpev = 0.5
+        phase_1.temp_r = np.arange(110, 115, 0.5)
+        assert phase_1.svib.size == 10
+        assert phase_1.temperature == 110
+        assert phase_1.zpev == 0.5
+
+    def test_vib_properties(self):
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -90.00, entropy = True, file = test_data, funits = 10, temp_range=[100, 120])
+        zpe, svib, avib = bulk.vib_properties(np.arange(100, 110, 0.5))
+        assert zpe == 0
+        assert svib.size == 20
+        assert bulk.svib.size == 20
+        assert_almost_equal(svib[0], bulk.svib[0])
+
+
+    def test_with_temp_step(self):
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, zpe = True, file = test_data, funits = 10, temp_range=[100, 120])
+        view = phase_1.with_temp_step(0.01)
+        assert view.svib.size == 2000
+        assert view.label == "Periclase"
+        assert view.energy == -90.0
+        assert phase_1.temp_step == 1
+        assert phase_1.svib.size == 20
@@ -0,0 +1,41 @@
+import numpy as np
+from surfinpy import envelope
+import unittest
+from numpy.testing import assert_almost_equal
+
+
+class TestEnvelope(unittest.TestCase):
+
+    def test_plane_coefficients(self):
+        x = envelope.plane_coefficients(lambda x, y: 1.0 - 2.0 * x + 3.0 * y)
+        assert_almost_equal(x, np.array([1.0, -2.0, 3.0]))
+
+    def test_polygon_area(self):
+        x = envelope.polygon_area([(0, 0), (2, 0), (2, 1), (0, 1)])
+        assert_almost_equal(x, 2.0)
+
+    def test_clip_polygon(self):
+        vertices, edges = envelope.clip_polygon([(0, 0), (2, 0), (2, 2), (0, 2)],
+                                                [0, 0, 0, 0], (1, 0, -1), 5)
+        assert_almost_equal(envelope.polygon_area(vertices), 2.0)
+        assert edges.count(5) == 1
+
+    def test_lower_envelope(self):
+        planes = np.array([[0.0, 1.0, 0.0],
+                           [0.0, -1.0, 0.0],
+                           [0.5, 0.0, -1.0]])
+        x = envelope.lower_envelope(planes, [-1, 1], [-1, 1])
+        assert np.array_equal(x.phases, np.array([1, 2, 3]))
+        assert_almost_equal(sum([x.area(i) for i in x.phases]), 4.0)
+        assert_almost_equal(x.area(3), 0.25)
+        assert len(x.boundaries) == 3
+        assert len(x.triple_points) == 1
+        assert x.triple_points[0][0] == (1, 2, 3)
+        assert_almost_equal(x.triple_points[0][1], np.array([0.0, 0.5]))
+
+    def test_lower_envelope_identical(self):
+        planes = np.array([[1.0, 1.0, 1.0],
+                           [1.0, 1.0, 1.0]])
+        x = envelope.lower_envelope(planes, [0, 1], [0, 1])
+        assert np.array_equal(x.phases, np.array([1]))
+        assert len(x.boundaries) == 0
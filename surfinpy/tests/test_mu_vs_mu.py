@@ -71,3 +71,84 @@ class Testmu_vs_mu(unittest.TestCase):
         expected_phase = np.zeros(np.arange(0, 10, 0.025).size * np.arange(0, 10, 0.025).size)
         expected_phase = np.reshape(expected_phase, (np.arange(0, 10, 0.025).size, np.arange(0, 10, 0.025).size))
         assert_almost_equal(system.z, expected_phase)
+
+    def test_calculate_single(self):
+        deltaX = {'Range': [-3, 0], 'Label': 'O'}
+        deltaY = {'Range': [-3, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -580.00, label = "One", nspecies = 1)
+        O = data.DataSet(cation = 24, x = 46, y = 0, area = 60.22,
+                                     energy = -560.00, label = "Two", nspecies = 1)
+        dataset = [pure, H2O, O]
+        expected, expected_SE = mu_vs_mu.calculate(dataset, bulk, deltaX, deltaY)
+        system, SE = mu_vs_mu.calculate(dataset, bulk, deltaX, deltaY,
+                                        tile=2000, precision='single')
+        assert np.array_equal(system.z, expected.z)
+        assert system.labels == expected.labels
+        assert_almost_equal(SE, expected_SE, decimal=4)
+
+    def test_calculate_envelope(self):
+        deltaX = {'Range': [0, 10], 'Label': 'O'}
+        deltaY = {'Range': [-20, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -600.00, label = "One", nspecies = 1)
+        dataset = [pure, H2O]
+        system = mu_vs_mu.calculate_envelope(dataset, bulk, deltaX, deltaY)
+        X = np.arange(0, 10, 0.025)
+        Y = np.arange(-20, 0, 0.025)
+        phase, SE = mu_vs_mu.evaluate_phases(dataset, bulk, X, Y, 2, 0, 0)
+        for i in system.phases:
+            assert_almost_equal(system.area(i), np.mean(phase == i) * 200, decimal=0)
+        assert len(system.boundaries) == 1
+        assert system.boundaries[0][0] == (1, 2)
+
+    def test_calculate_adaptive(self):
+        deltaX = {'Range': [0, 10], 'Label': 'O'}
+        deltaY = {'Range': [-20, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -600.00, label = "One", nspecies = 1)
+        dataset = [pure, H2O]
+        system, SE = mu_vs_mu.calculate(dataset, bulk, deltaX, deltaY)
+        adaptive, adaptive_SE = mu_vs_mu.calculate(dataset, bulk, deltaX, deltaY, adaptive=True)
+        assert np.array_equal(system.z, adaptive.z)
+        assert_almost_equal(SE, adaptive_SE)
+        for options in ({'tile': 1000}, {'precision': 'single'}, {'store': 'unused'}):
+            with self.assertRaises(ValueError):
+                mu_vs_mu.calculate(dataset, bulk, deltaX, deltaY, adaptive=True, **options)
+
+    def test_temperature_sweep(self):
+        deltaX = {'Range': [-3, 0], 'Label': 'O'}
+        deltaY = {'Range': [-3, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                            energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                           energy = -580.00, label = "One", nspecies = 1)
+        dataset = [pure, H2O]
+        y_energy = np.array([0.0, -3.0, 3.0])
+        for processes in (1, 2):
+            volume = mu_vs_mu.temperature_sweep(dataset, bulk, deltaX, deltaY,
+                                                [300, 400, 500], 0, y_energy,
+                                                increments=0.1,
+                                                processes=processes)
+            assert volume.z.shape == (3, 30, 30)
+            assert volume.labels == ["Stoich", "One"]
+            for i in range(0, 3):
+                phase, SE = mu_vs_mu.evaluate_phases(dataset, bulk, volume.x,
+                                                     volume.y, 2, 0,
+                                                     y_energy[i])
+                assert_almost_equal(np.ravel(volume.z[i]), phase - 1)
+                assert_almost_equal(np.ravel(volume.energy[i]), SE)
+        assert np.all(volume.z[1] == 0)
+        assert np.all(volume.z[2] == 1)
+        system = volume.to_plot(1)
+        assert system.labels == ["Stoich"]
@@ -26,6 +26,16 @@ class Testp_vs_t(unittest.TestCase):
                                             SE, nsurfaces)
         assert_almost_equal(x[0], 1.)
 
+    def test_calculate_surface_energy_tiled(self):
+        AE = [np.linspace(-1.0, 1.0, 9), np.linspace(-2.0, 2.0, 9)]
+        lnP = np.arange(1, 10)
+        T = np.arange(1, 10)
+        coverage = np.array([-10.0*10**18, -20.0*10**18])
+        x = p_vs_t.calculate_surface_energy(AE, lnP, T, coverage, 1.0, 3)
+        y = p_vs_t.calculate_surface_energy(AE, lnP, T, coverage, 1.0, 3, tile=20)
+        assert np.array_equal(x[0], y[0])
+        assert_almost_equal(x[1], y[1])
+
     def test_convert_adsorption_energy(self):
         x = p_vs_t.convert_adsorption_energy_units(1)
         expected = 96485
@@ -70,9 +80,24 @@ class Testp_vs_t(unittest.TestCase):
         adsorbant = -10.0
         thermochem = ut.read_nist(test_data)
         system = p_vs_t.calculate(stoich, data, SE, adsorbant, thermochem)
+        assert data == [H2O, H2O_2]
         expectedx = np.arange(2, 1000)
         expectedy = np.arange(-13, 5.5, 0.1)
         expectedz = np.zeros(((expectedy.size), (expectedx.size)))
         assert_almost_equal(system.x, expectedx)
         assert_almost_equal(system.y, expectedy)
         assert_almost_equal(system.z, expectedz)
+
+    def test_calculate_single(self):
+        stoich = DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -530.0, label = "Stoich")
+        H2O = DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -550.0, label = "One")
+        H2O_2 = DataSet(cation = 24, x = 48, y = 4, area = 60.22,
+                                     energy = -571.0, label = "Two")
+        thermochem = ut.read_nist(test_data)
+        expected = p_vs_t.calculate(stoich, [H2O, H2O_2], 1.0, -10.0, thermochem)
+        system = p_vs_t.calculate(stoich, [H2O, H2O_2], 1.0, -10.0, thermochem,
+                                  precision='single')
+        assert np.unique(expected.z).size > 1
+        assert np.array_equal(system.z, expected.z)
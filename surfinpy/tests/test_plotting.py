@@ -31,3 +31,115 @@ class Testbulk_plotting(unittest.TestCase):
         p1 = ut.pressure(calculated.x, 298)
         ax = calculated.plot_pressure(298)
         assert_almost_equal(p1, ax.lines[0].get_xydata().T[0])
+
+    def test_plot_style_is_local(self):
+        import matplotlib
+        import matplotlib.pyplot as plt
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 10, energy = -90.0, label = "Periclase", color = "red")
+        phase_2 = data.DataSet(cation = 10, x = 0, y = 10, energy = -100.0, label = "Periclase", color = "blue")
+        ref = {'Range': [ -3, 2],  'Label': 'test'}
+        calculated = bulk_mu_vs_mu.calculate([phase_1, phase_2], bulk, ref, ref, -10, -10)
+        cmap = calculated.cmap
+        style = dict(matplotlib.rcParams)
+        calculated.plot_phase(colourmap="viridis", set_style="ggplot")
+        assert calculated.cmap is cmap
+        assert dict(matplotlib.rcParams) == style
+        plt.close('all')
+
+    def test_headless_import(self):
+        import subprocess
+        import sys
+        code = ("import sys\n"
+                "from surfinpy import mu_vs_mu, bulk_mu_vs_mu, bulk_mu_vs_t, "
+                "p_vs_t, wulff, results, data, vibrational_data, utils\n"
+                "print(sorted(m for m in sys.modules "
+                "if m.split('.')[0] in ('matplotlib', 'seaborn')))")
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        assert output.strip() == '[]'
+
+    def test_import_time(self):
+        # Each compute module, numpy aside, has to import within half a
+        # second, as reported by python -X importtime
+        import subprocess
+        import sys
+        budget = 0.5
+        for module in ('mu_vs_mu', 'bulk_mu_vs_mu', 'bulk_mu_vs_t',
+                       'p_vs_t', 'wulff'):
+            name = 'surfinpy.' + module
+            code = 'import numpy\nimport ' + name
+            output = subprocess.run([sys.executable, '-X', 'importtime',
+                                     '-c', code], stderr=subprocess.PIPE,
+                                    universal_newlines=True, check=True)
+            seconds = None
+            for line in output.stderr.splitlines():
+                fields = line.split('|')
+                if len(fields) == 3 and fields[2].strip() == name:
+                    seconds = int(fields[1]) / 1e6
+            assert seconds is not None and seconds < budget, (name, seconds)
+
+    def test_raster(self):
+        import matplotlib.pyplot as plt
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 10, energy = -90.0, label = "A", color = "red")
+        phase_2 = data.DataSet(cation = 10, x = 5, y = 10, energy = -100.0, label = "B", color = "blue")
+        ref = {'Range': [ -3, 2],  'Label': 'test'}
+        calculated = bulk_mu_vs_mu.calculate([phase_1, phase_2], bulk, ref, ref, -10, -10)
+        ax = calculated.plot_phase(raster=True, figsize=(2, 2))
+        image = ax.images[0]
+        z = image.get_array()
+        assert z.shape[1] < calculated.z.shape[1]
+        assert_almost_equal(image.norm(z), z + 0.5)
+        assert_almost_equal(np.unique(z + 0.5), np.unique(calculated.z))
+        left, right, bottom, top = image.get_extent()
+        assert_almost_equal(left + (right - left) / (2 * z.shape[1]), -3)
+        assert_almost_equal(ax.get_xlim(), [-3, calculated.x[-1]])
+        assert_almost_equal(image.norm.boundaries, calculated.levels)
+        plt.close('all')
+
+    def test_pt_plot_modes(self):
+        import matplotlib.pyplot as plt
+        from surfinpy.plotting import PTPlot
+        x = np.linspace(300, 1000, 50)
+        y = np.linspace(-10, 5, 40)
+        z = np.where(y[:, np.newaxis] > x / 100 - 8, 1, 0)
+        system = PTPlot(x, y, z)
+        contours = system.plot().collections[0]
+        image = system.plot(raster=True).images[0]
+        assert_almost_equal(contours.levels, image.norm.boundaries)
+        assert_almost_equal(contours.to_rgba(contours.layers),
+                            image.to_rgba(contours.layers))
+        assert_almost_equal(np.unique(image.get_array()),
+                            np.unique(contours.layers[[0, -1]]))
+        plt.close('all')
+
+    def test_export(self):
+        import tempfile
+        import matplotlib
+        from surfinpy import plotting
+        from surfinpy import results
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        phase_1 = data.DataSet(cation = 10, x = 0, y = 10, energy = -90.0, label = "A")
+        phase_2 = data.DataSet(cation = 10, x = 5, y = 10, energy = -100.0, label = "B")
+        ref = {'Range': [ -3, 2],  'Label': 'test'}
+        calculated = bulk_mu_vs_mu.calculate([phase_1, phase_2], bulk, ref, ref, -10, -10)
+        with tempfile.TemporaryDirectory() as directory:
+            stored = results.save(os.path.join(directory, 'stored'), calculated)
+            filenames = [os.path.join(directory, name)
+                         for name in ('a.png', 'b.svg', 'c.pdf')]
+            systems = [calculated, results.load(stored), stored]
+            backend = matplotlib.get_backend()
+            for processes in (1, 2):
+                written = plotting.export(systems, filenames, processes=processes,
+                                          set_style='ggplot', raster=True)
+                assert written == filenames
+                with open(filenames[0], 'rb') as file:
+                    assert file.read(4) == b'\x89PNG'
+                with open(filenames[2], 'rb') as file:
+                    assert file.read(4) == b'%PDF'
+                for filename in filenames:
+                    os.remove(filename)
+            assert matplotlib.get_backend() == backend
+            with self.assertRaises(ValueError):
+                plotting.export(systems, filenames[:1])
@@ -0,0 +1,58 @@
+import numpy as np
+import os
+import json
+import tempfile
+from surfinpy import profiling
+from surfinpy import mu_vs_mu
+from surfinpy import data
+import unittest
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_stage_inactive(self):
+        with profiling.stage('grid'):
+            pass
+        with profiling.profile() as prof:
+            pass
+        assert prof.records == []
+
+    def test_profile(self):
+        deltaX = {'Range': [-3, 0], 'Label': 'O'}
+        deltaY = {'Range': [-3, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                            energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                           energy = -580.00, label = "One", nspecies = 1)
+        seen = []
+        with profiling.profile(memory=True, callback=seen.append) as prof:
+            mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY)
+        names = [record['name'] for record in prof.records]
+        for name in ('grid', 'energy', 'reduction', 'relabel', 'plot'):
+            assert name in names
+        assert len(seen) == len(prof.records)
+        energies = [r for r in prof.records if r['name'] == 'energy']
+        assert [r['args']['phase'] for r in energies] == [1, 2]
+        assert all(r['peak'] >= 0 for r in prof.records)
+        summary = prof.summary()
+        assert summary['energy']['calls'] == 2
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'trace.json')
+            prof.to_chrome_trace(filename)
+            with open(filename) as file:
+                trace = json.load(file)
+        assert len(trace['traceEvents']) == len(prof.records)
+        assert trace['traceEvents'][0]['ph'] == 'X'
+
+    def test_nested_peak(self):
+        with profiling.profile(memory=True) as prof:
+            with profiling.stage('outer'):
+                with profiling.stage('inner'):
+                    x = np.ones(1000000)
+                del x
+        inner, outer = prof.records
+        assert inner['depth'] == 1
+        assert outer['depth'] == 0
+        assert inner['peak'] >= 8000000
+        assert outer['peak'] >= inner['peak']
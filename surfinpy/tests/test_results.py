@@ -0,0 +1,88 @@
+import numpy as np
+import os
+import tempfile
+from surfinpy import mu_vs_mu
+from surfinpy import p_vs_t
+from surfinpy import results
+from surfinpy import utils as ut
+from surfinpy import data
+from surfinpy.plotting import ChemicalPotentialPlot, PTPlot
+import unittest
+from numpy.testing import assert_almost_equal
+
+test_data = os.path.join(os.path.dirname(__file__), 'H2O.txt')
+
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_relabel(self):
+        Z = np.array([[2, 2], [5, 3]])
+        results.relabel(Z, np.array([2, 3, 5]), block=3)
+        assert np.array_equal(Z, np.array([[0, 0], [2, 1]]))
+
+    def test_mu_vs_mu_store(self):
+        deltaX = {'Range': [0, 10], 'Label': 'O'}
+        deltaY = {'Range': [-20, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -600.00, label = "One", nspecies = 1)
+        store = os.path.join(self.tmp.name, 'mu_vs_mu')
+        expected, expected_SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY)
+        system, SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY, tile=1000, store=store)
+        bundle = results.load(store)
+        assert isinstance(bundle.z, np.memmap)
+        assert np.array_equal(bundle.z, expected.z)
+        assert_almost_equal(bundle.energy, expected_SE)
+        assert_almost_equal(bundle.x, expected.x)
+        assert bundle.labels == ['Stoich', 'One']
+        assert np.array_equal(bundle.ticks, expected.ticks)
+        plot = bundle.to_plot()
+        assert isinstance(plot, ChemicalPotentialPlot)
+        assert plot.ylabel == 'H_2O'
+
+    def test_p_vs_t_store(self):
+        stoich = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -530.0, label = "Stoich")
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -620.0, label = "Stoich")
+        thermochem = ut.read_nist(test_data)
+        store = os.path.join(self.tmp.name, 'p_vs_t')
+        expected = p_vs_t.calculate(stoich, [H2O], 1.0, -10.0, thermochem)
+        p_vs_t.calculate(stoich, [H2O], 1.0, -10.0, thermochem, store=store)
+        bundle = results.load(store)
+        assert np.array_equal(bundle.z, expected.z)
+        assert bundle.energy.shape == expected.z.shape
+        assert isinstance(bundle.to_plot(), PTPlot)
+        p_vs_t.calculate(stoich, [H2O], 1.0, -10.0, thermochem, store=store,
+                         energy_dtype=None)
+        bundle = results.load(store)
+        assert bundle.z.dtype == np.uint8
+        assert np.array_equal(bundle.z, expected.z)
+        assert bundle.energy is None
+
+    def test_mu_vs_mu_energy_dtype(self):
+        deltaX = {'Range': [0, 10], 'Label': 'O'}
+        deltaY = {'Range': [-20, 0], 'Label': 'H_2O'}
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -100.00, funits = 1)
+        pure = data.DataSet(cation = 24, x = 48, y = 0, area = 60.22,
+                                     energy = -575.00, label = "Stoich", nspecies = 1)
+        H2O = data.DataSet(cation = 24, x = 48, y = 2, area = 60.22,
+                                     energy = -600.00, label = "One", nspecies = 1)
+        expected, expected_SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY)
+        system, SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY,
+                                        energy_dtype=None)
+        assert SE is None
+        assert system.z.dtype == np.uint8
+        assert np.array_equal(system.z, expected.z)
+        store = os.path.join(self.tmp.name, 'float32')
+        system, SE = mu_vs_mu.calculate([pure, H2O], bulk, deltaX, deltaY,
+                                        store=store, energy_dtype=np.float32)
+        assert SE.dtype == np.float32
+        assert_almost_equal(SE, expected_SE, decimal=4)
+        assert results.load(store).energy.dtype == np.float32
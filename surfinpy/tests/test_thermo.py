@@ -0,0 +1,82 @@
+import numpy as np
+import os
+from surfinpy import thermo
+from surfinpy import utils as ut
+import unittest
+import tempfile
+from numpy.testing import assert_almost_equal
+
+test_data = os.path.join(os.path.dirname(__file__), 'H2O.txt')
+
+
+class TestThermo(unittest.TestCase):
+
+    def test_get_table(self):
+        thermo.clear_cache()
+        x = thermo.get_table(test_data)
+        y = thermo.get_table(test_data)
+        nist = ut.read_nist(test_data)
+        z = thermo.get_table(nist)
+        assert x is y
+        assert thermo.get_table(z) is z
+        assert thermo.get_table(nist) is z
+        assert thermo.get_table(nist.copy()) is z
+        assert thermo.get_table(nist + 1) is not z
+        assert len(thermo._tables) == 3
+
+    def test_get_table_bound(self):
+        thermo.clear_cache()
+        nist = ut.read_nist(test_data)
+        copies = [nist + i for i in range(thermo._max_tables + 1)]
+        first = thermo.get_table(copies[0])
+        for copy in copies[1:]:
+            thermo.get_table(copy)
+        assert len(thermo._tables) == thermo._max_tables
+        assert thermo.get_table(copies[0]) is not first
+
+    def test_get_table_freed(self):
+        thermo.clear_cache()
+        nist = ut.read_nist(test_data)
+        T = np.arange(1, 1000, 0.5)
+        for i in range(50):
+            table = thermo.get_table((nist + i).astype(np.float32))
+            expected = thermo.ThermoTable((nist + i).astype(np.float32))
+            assert_almost_equal(table.gibbs(T), expected.gibbs(T))
+
+    def test_gibbs(self):
+        table = thermo.get_table(test_data)
+        assert_almost_equal(table.gibbs(101.0), 0.00943131080792852)
+        assert table.gibbs(np.arange(1, 10)).shape == (9, )
+        assert_almost_equal(table[100:102], table.gibbs(np.array([100, 101])))
+
+    def test_entropy_correction(self):
+        table = thermo.get_table(test_data)
+        nist = ut.read_nist(test_data)
+        T = np.arange(2, 1000)
+        shift = ut.cs_fit(nist[:, 0], nist[:, 2], T)
+        assert_almost_equal(table.entropy_correction(T),
+                            (T * (shift / 1000)) / 96.485)
+
+    def test_read_table_cache(self):
+        default = thermo._cache_dir
+        with tempfile.TemporaryDirectory() as directory:
+            thermo.set_cache_dir(None)
+            try:
+                off = thermo._content_key(test_data)
+                thermo.set_cache_dir(directory)
+                x = thermo.read_table(test_data)
+                y = thermo.read_table(test_data)
+                z = ut.read_nist(test_data, cache=True)
+                fitted = thermo.ThermoTable.from_file(test_data)
+                cached = thermo.ThermoTable.from_file(test_data)
+            finally:
+                thermo.set_cache_dir(default)
+            assert off is None
+            assert isinstance(y, np.memmap)
+            assert not x.flags.writeable
+            assert np.array_equal(x, ut.read_nist(test_data))
+            assert np.array_equal(y, x)
+            assert isinstance(z, np.memmap)
+            assert len(os.listdir(directory)) == 2
+            T = np.arange(1, 1000, 0.5)
+            assert np.array_equal(cached.gibbs(T), fitted.gibbs(T))
@@ -1,6 +1,7 @@
 import numpy as np
 import os
 from surfinpy import utils as ut
+from surfinpy import profiling
 from surfinpy import data
 import unittest
 from numpy.testing import assert_almost_equal, assert_approx_equal
@@ -55,12 +56,108 @@ class TestUtils(unittest.TestCase):
         expected = np.array([0, 0, 1, 1])
         assert np.array_equal(Z, expected)
 
+    def test_transform_numbers_unsorted(self):
+        Z = np.array([[5, 3], [9, 7]])
+        ticks = np.array([7, 3, 5])
+        Z = ut.transform_numbers(Z, ticks)
+        expected = np.array([[2, 1], [9, 0]])
+        assert np.array_equal(Z, expected)
+
     def test_get_phase_data(self):
         X = np.arange(30)
         a, b = ut.get_phase_data(X, 3)
         expected = np.ones(10)
         assert np.array_equal(a, expected)
 
+    def test_get_phase_data_stack(self):
+        S = np.stack([np.full((2, 3), 2.0), np.arange(6.0).reshape(2, 3)])
+        a, b = ut.get_phase_data(S, 2)
+        assert np.array_equal(a, np.array([2, 2, 1, 1, 1, 1]))
+        assert np.array_equal(b, np.array([0.0, 1.0, 2.0, 2.0, 2.0, 2.0]))
+
+    def test_get_phase_data_dtype(self):
+        S = np.stack([np.full((2, 3), 2.0), np.arange(6.0).reshape(2, 3)])
+        a, b = ut.get_phase_data(S, 2, energy_dtype=None)
+        assert a.dtype == np.uint8
+        assert b is None
+        a, b = ut.get_phase_data(S, 2, dtype=np.int64, energy_dtype=np.float32)
+        assert a.dtype == np.int64
+        assert b.dtype == np.float32
+        assert np.array_equal(a, np.array([2, 2, 1, 1, 1, 1]))
+
+    def test_phase_dtype(self):
+        assert ut.phase_dtype(2) == np.uint8
+        assert ut.phase_dtype(255) == np.uint8
+        assert ut.phase_dtype(256) == np.uint16
+        assert ut.phase_dtype(70000) == np.uint32
+
+    def test_phase_stack(self):
+        S = ut.phase_stack(lambda k: k * np.ones((2, 3)), 3, (2, 3))
+        assert S.shape == (3, 2, 3)
+        assert np.array_equal(S[2], np.full((2, 3), 2.0))
+
+    def test_tiled_phase_data(self):
+        y = np.arange(7.0)[:, np.newaxis]
+        energy = lambda k, rows: (k - 1) * (y[rows] - 3) + np.zeros((1, 5))
+        expected, expected_energy = ut.tiled_phase_data(energy, 3, (7, 5))
+        a, b = ut.tiled_phase_data(energy, 3, (7, 5), tile=10)
+        assert np.array_equal(a, expected)
+        assert np.array_equal(b, expected_energy)
+        assert np.array_equal(a[:5], np.full(5, 3))
+        assert np.array_equal(a[-5:], np.ones(5))
+        c, d = ut.tiled_phase_data(energy, 3, (7, 5), tile=10, energy_dtype=None)
+        assert np.array_equal(c, expected)
+        assert d is None
+
+    def test_tiled_phase_data_single(self):
+        x = np.linspace(-1, 1, 41)[np.newaxis, :]
+        y = np.linspace(-1, 1, 31)[:, np.newaxis]
+        # The first two phases cross at x = 0 but are equal once rounded to
+        # single precision, the third is an exact copy of the second
+        planes = np.array([[-500.0, 1e-6, 0.0],
+                           [-500.0, -1e-6, 0.0],
+                           [-500.0, -1e-6, 0.0],
+                           [-500.2, 0.0, 1.0],
+                           [-499.0, 0.0, 0.0]])
+        energy = lambda k, rows, dtype=float: (
+            dtype(planes[k, 0]) + dtype(planes[k, 1]) * ut.tile_rows(x, rows, dtype)
+            + dtype(planes[k, 2]) * ut.tile_rows(y, rows, dtype))
+        scale = max(ut.term_scale(p[0], p[1] * x, p[2] * y) for p in planes)
+        assert_almost_equal(scale, 501.2)
+        expected, expected_energy = ut.tiled_phase_data(energy, 5, (31, 41))
+        with profiling.profile() as prof:
+            a, b = ut.tiled_phase_data(energy, 5, (31, 41), tile=200,
+                                       precision='single', scale=scale)
+        assert np.array_equal(a, expected)
+        assert np.count_nonzero(a == 2) > 0
+        assert_almost_equal(b, expected_energy, decimal=4)
+        checked = sum(r['args']['points'] for r in prof.records
+                      if r['name'] == 'recheck')
+        assert 0 < checked < a.size
+        with self.assertRaises(ValueError):
+            ut.tiled_phase_data(energy, 5, (31, 41), precision='half')
+
+    def test_tile_rows(self):
+        assert ut.tile_rows(5, slice(2, 4)) == 5
+        assert ut.tile_rows(np.ones((1, 3)), slice(2, 4)).shape == (1, 3)
+        assert ut.tile_rows(np.ones((6, 1)), slice(2, 4)).shape == (2, 1)
+        points = (np.array([0, 5]), np.array([1, 2]))
+        assert_almost_equal(ut.tile_rows(np.arange(6.0)[:, np.newaxis], points), [0, 5])
+        assert_almost_equal(ut.tile_rows(np.arange(3.0)[np.newaxis, :], points), [1, 2])
+        assert ut.tile_rows(np.ones((6, 1)), slice(2, 4), np.float32).dtype == np.float32
+        assert ut.tile_rows(5, slice(2, 4), np.float32).dtype == np.float32
+
+    def test_adaptive_phase_data(self):
+        planes = np.array([[0.0, 1.0, 0.0], [0.0, -1.0, 0.0], [0.5, 0.0, -1.0]])
+        x = np.linspace(-1, 1, 101)
+        y = np.linspace(-1, 1, 75)
+        energy = lambda k, a, b: planes[k, 0] + planes[k, 1] * a + planes[k, 2] * b
+        S = ut.phase_stack(lambda k: energy(k, x[np.newaxis, :], y[:, np.newaxis]), 3, (75, 101))
+        expected, expected_energy = ut.get_phase_data(S, 3)
+        a, b = ut.adaptive_phase_data(energy, 3, x, y, coarse=8)
+        assert np.array_equal(a, expected)
+        assert_almost_equal(b, expected_energy)
+
     def test_read_nist(self):
         x = ut.read_nist(test_data)
         assert x[1, 0] == 100
@@ -93,6 +190,8 @@ class TestUtils(unittest.TestCase):
         levels = ut.get_levels(X)
         expected = np.array([-1, 0, 1, 2, 3, 4])
         assert np.array_equal(levels, expected)
+        levels = ut.get_levels(X.astype(np.uint8))
+        assert np.array_equal(levels, expected)
 
     def test_get_ticks(self):
         X = np.arange(5)
@@ -128,3 +227,23 @@ class TestUtils(unittest.TestCase):
     def test_build_tempgrid(self):
         x = ut.build_tempgrid(np.arange(10), np.arange(10))
         assert np.array_equal(x[0], np.zeros(10))
+
+    def test_build_grids_read_only(self):
+        x = ut.build_xgrid(np.arange(3), np.arange(4))
+        y = ut.build_ygrid(np.arange(3), np.arange(4))
+        assert x.shape == (4, 3)
+        assert np.array_equal(y[:, 0], np.arange(4))
+        assert not x.flags.writeable
+        assert not y.flags.writeable
+
+    def test_compact_grid(self):
+        x = ut.compact_grid(ut.build_xgrid(np.arange(3), np.arange(4)))
+        y = ut.compact_grid(ut.build_ygrid(np.arange(3), np.arange(4)))
+        assert x.shape == (1, 3)
+        assert y.shape == (4, 1)
+        assert np.array_equal(x + y, np.arange(3) + np.arange(4)[:, np.newaxis])
+
+    def test_unique_phases(self):
+        phases = np.array([[3, 3, 1], [3, 5, 1]], dtype=np.uint8)
+        assert np.array_equal(ut.unique_phases(phases), [1, 3, 5])
+        assert np.array_equal(ut.unique_phases(phases, block=2), [1, 3, 5])
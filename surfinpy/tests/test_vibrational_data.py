@@ -2,6 +2,7 @@ import numpy as np
 import os
 from surfinpy import vibrational_data as vd
 from surfinpy import utils as ut
+from surfinpy import data
 import unittest
 from numpy.testing import assert_almost_equal, assert_approx_equal
 
@@ -27,4 +28,67 @@ class TestVibrationalData(unittest.TestCase):
     def test_vib_calc(self):
         x = vd.vib_calc(test_data, np.arange(10))
         assert_approx_equal(x[0], 0.0017047827283306525)
-        
\ No newline at end of file
+
+    def test_vib_calc_cache(self):
+        vd.clear_cache()
+        x = vd.vib_calc(test_data, np.arange(10))
+        y = vd.vib_calc(test_data, np.arange(10.0))
+        z = vd.vib_calc(test_data, np.arange(20))
+        assert x[1] is y[1]
+        assert z[1] is not x[1]
+        assert not x[1].flags.writeable
+        assert_approx_equal(z[1][1], x[1][1])
+
+    def test_set_cache_size(self):
+        vd.clear_cache()
+        vd.set_cache_size(2)
+        try:
+            x = vd.vib_calc(test_data, np.arange(10))
+            vd.vib_calc(test_data, np.arange(20))
+            y = vd.vib_calc(test_data, np.arange(10))
+            assert x[1] is not y[1]
+        finally:
+            vd.set_cache_size(128)
+
+
+    def test_batch_vib_calc(self):
+        vd.clear_cache()
+        temp_r = np.arange(0, 300, 0.5)
+        zpe, svib, avib = vd.batch_vib_calc([test_data, test_data], temp_r)
+        x = vd._vib_calc(test_data, temp_r)
+        assert svib.shape == (2, temp_r.size)
+        assert_approx_equal(zpe[1], x[0])
+        assert_almost_equal(svib[0] * 1e4, x[1] * 1e4)
+        assert_almost_equal(avib[1] * 1e4, x[2] * 1e4)
+        assert_almost_equal(vd.vib_calc(test_data, temp_r)[2], avib[0])
+
+    def test_entropy_calc_block(self):
+        vib_prop = ut.read_vibdata(test_data)
+        temp_r = np.arange(0, 500, 0.5)
+        new_temp = ut.build_tempgrid(temp_r, vib_prop['Frequencies'])
+        freq = ut.build_freqgrid(vib_prop['Frequencies'], temp_r)
+        state = np.geterr()
+        x = vd.entropy_calc(freq, new_temp, vib_prop)
+        y = vd.entropy_calc(freq, new_temp, vib_prop, block=7)
+        z = vd.entropy_calc(freq, new_temp, vib_prop, dtype=np.float32)
+        assert np.geterr() == state
+        assert len(x) == 3
+        for i in range(0, 3):
+            assert_almost_equal(y[i] / np.abs(x[i]).max(),
+                                x[i] / np.abs(x[i]).max())
+            assert_almost_equal(z[i] / np.abs(x[i]).max(),
+                                x[i] / np.abs(x[i]).max(), decimal=5)
+        assert_almost_equal(x[0][1:] * temp_r[1:], x[2][1:] - x[1][1:])
+
+    def test_recalculate_vib(self):
+        bulk = data.ReferenceDataSet(cation = 1, anion = 2, energy = -90.00, entropy = True, file = test_data, funits = 10, temp_range=[100, 120])
+        phase = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Periclase", entropy = True, file = test_data, funits = 10, temp_range=[100, 120])
+        plain = data.DataSet(cation = 10, x = 0, y = 0, energy = -90.0, label = "Plain")
+        dataset = [phase, plain]
+        views, bulk_view = vd.recalculate_vib(dataset, bulk)
+        assert dataset == [phase, plain]
+        assert views[1] is plain
+        assert views[0].svib.size == 2000
+        assert bulk_view.avib.size == 2000
+        assert phase.svib.size == 20
+        assert bulk.temp_step == 1
@@ -30,3 +30,67 @@ class TestWulff(unittest.TestCase):
         assert_almost_equal(y[1], -9.6914, decimal=4)
 
 
+
+    def test_calculate_surface_energies(self):
+        stoich = data.DataSet(cation = 20, x = 50, y = 0, area = 60.00,
+                              energy = -500.00, label ="One")
+        H2O = data.DataSet(cation = 20, x = 50, y = 2, area = 60.00,
+                           energy = -600.00, label ="Two")
+        x = ut.read_nist(test_data)
+        T = np.array([100, 300, 500])
+        P = np.array([-2, 0, 2, 4])
+        y = wulff.calculate_surface_energies(stoich, [H2O, H2O], 1.0, -10.0,
+                                             x, T, P)
+        assert y.shape == (3, 4, 3)
+        for i in range(0, 3):
+            for j in range(0, 4):
+                z = wulff.calculate_surface_energy(stoich, [H2O, H2O], 1.0,
+                                                   -10.0, x, T[i], P[j])
+                assert_almost_equal(y[i, j], z)
+
+    def test_calculate_facet_energies(self):
+        stoich = data.DataSet(cation = 20, x = 50, y = 0, area = 60.00,
+                              energy = -500.00, label ="One")
+        H2O = data.DataSet(cation = 20, x = 50, y = 2, area = 60.00,
+                           energy = -600.00, label ="Two")
+        facets = [{'stoich': stoich, 'data': [H2O], 'SE': 1.0},
+                  {'stoich': stoich, 'data': [H2O, H2O], 'SE': 2.0}]
+        x = ut.read_nist(test_data)
+        y = wulff.calculate_facet_energies(facets, -10.0, x, [100, 200], [2])
+        assert y.shape == (2, 2, 1, 3)
+        assert y[0, 0, 0, 2] == np.inf
+        assert_almost_equal(y[0, :, 0, :2], y[1, :, 0, :2] - 1.0)
+
+    def test_facet_fractions(self):
+        f100 = np.concatenate((np.eye(3), -np.eye(3)))
+        f111 = np.array([[i, j, k] for i in (-1, 1) for j in (-1, 1)
+                         for k in (-1, 1)])
+        x = wulff.facet_fractions([f100, f111], [[1.0, 2.0], [2.0, 1.0],
+                                                 [1.0, -1.0]])
+        assert_almost_equal(x[0], [1.0, 0.0])
+        assert_almost_equal(x[1], [0.0, 1.0])
+        assert np.all(np.isnan(x[2]))
+        # Truncated octahedron with regular hexagons, square area 2 and
+        # hexagon area 3 * sqrt(3) for a (100) to (111) ratio of 2 / sqrt(3)
+        y = wulff.facet_fractions([f100, f111],
+                                  [[2.0, np.sqrt(3)], [4.0, 2 * np.sqrt(3)]])
+        expected = 6 * 2 / (6 * 2 + 8 * 3 * np.sqrt(3))
+        assert_almost_equal(y[:, 0], [expected, expected])
+
+    def test_calculate_facet_fractions(self):
+        stoich = data.DataSet(cation = 20, x = 50, y = 0, area = 60.00,
+                              energy = -500.00, label ="One")
+        H2O = data.DataSet(cation = 20, x = 50, y = 2, area = 60.00,
+                           energy = -520.00, label ="Two")
+        facets = [{'stoich': stoich, 'data': [H2O], 'SE': 1.0},
+                  {'stoich': stoich, 'data': [H2O], 'SE': 1.1}]
+        normals = [np.concatenate((np.eye(3), -np.eye(3))),
+                   np.array([[i, j, k] for i in (-1, 1) for j in (-1, 1)
+                             for k in (-1, 1)])]
+        x = ut.read_nist(test_data)
+        y = wulff.calculate_facet_fractions(facets, normals, -10.0, x,
+                                            np.array([300, 400]),
+                                            np.array([-2, 0, 2]))
+        assert y.shape == (2, 3, 2)
+        assert_almost_equal(np.sum(y, axis=-1), np.ones((2, 3)))
+        assert y[0, 2, 0] > y[0, 0, 0]
@@ -0,0 +1,295 @@
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from surfinpy import utils as ut
+
+# Fitted tables, least recently used first
+_tables = OrderedDict()
+_tables_lock = threading.Lock()
+_max_tables = 32
+_cache_dir = os.environ.get('SURFINPY_CACHE_DIR')
+
+
+def set_cache_dir(directory):
+    """Sets the directory in which parsed NIST_JANAF tables and their fitted
+    splines are stored. The cache is off unless a directory is set here or
+    in the SURFINPY_CACHE_DIR environment variable.
+
+    Parameters
+    ----------
+    directory : :py:attr:`str`
+        Cache directory, None or an empty string disables the cache
+    """
+    global _cache_dir
+    _cache_dir = directory
+
+
+def _content_key(nist_file):
+    """Digest of the contents of a NIST_JANAF table, None if the cache is
+    off."""
+    if not _cache_dir:
+        return None
+    with open(nist_file, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+def _cache_path(digest, suffix):
+    if not _cache_dir or digest is None:
+        return None
+    return os.path.join(_cache_dir, digest + suffix)
+
+
+def _cache_load(path):
+    """Memory maps a cached array, None if it is not cached."""
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(path, values):
+    """Writes an array to the cache, replacing the file in one step so that
+    other processes never read a partial file. Failures are ignored."""
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path),
+                                             suffix='.npy')
+        with os.fdopen(handle, 'wb') as file:
+            np.save(file, values)
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def read_table(nist_file, digest=None):
+    """Reads a NIST_JANAF table, see :py:func:`surfinpy.utils.read_nist`.
+    The parsed table is stored in the cache directory under a digest of
+    the file contents, so later reads, from any process, memory map it
+    rather than parsing the text again.
+
+    Parameters
+    ----------
+    nist_file : :py:attr:`str`
+        Filename of NIST_JANAF thermochemcial table
+    digest : :py:attr:`str`
+        Digest of the file contents, if it is already known
+
+    Returns
+    -------
+    data : :py:attr:`array_like`
+        NIST_JANAF thermochemcial data, read only
+    """
+    if digest is None:
+        digest = _content_key(nist_file)
+    path = _cache_path(digest, '.npy')
+    data = _cache_load(path)
+    if data is None:
+        data = ut.read_nist(nist_file, cache=False)
+        _cache_store(path, data)
+        data.setflags(write=False)
+    return data
+
+
+class ThermoTable:
+    """Thermochemical data for a single species from the NIST_JANAF
+    database, with the entropy and enthalpy fitted once so that they can be
+    evaluated at any temperature without refitting.
+
+    Parameters
+    ----------
+    thermochem : :py:attr:`array_like`
+        NIST_JANAF thermochemical table, see
+        :py:func:`surfinpy.utils.read_nist`
+    coefficients : :py:attr:`array_like`
+        Previously fitted spline coefficients, see :py:attr:`coefficients`
+    """
+    def __init__(self, thermochem, coefficients=None):
+        from scipy.interpolate import CubicSpline, PPoly
+        self.thermochem = np.asarray(thermochem, dtype=float)
+        self.h0 = self.thermochem[0, 4]
+        if coefficients is None:
+            self.entropy_spline = CubicSpline(self.thermochem[:, 0],
+                                              self.thermochem[:, 2],
+                                              bc_type='clamped')
+            self.enthalpy_spline = CubicSpline(self.thermochem[:, 0],
+                                               self.thermochem[:, 4],
+                                               bc_type='clamped')
+        else:
+            x = np.ascontiguousarray(self.thermochem[:, 0])
+            self.entropy_spline = PPoly.construct_fast(
+                np.asarray(coefficients[0]), x)
+            self.enthalpy_spline = PPoly.construct_fast(
+                np.asarray(coefficients[1]), x)
+
+    @property
+    def coefficients(self):
+        """(2, 4, n - 1) array of the polynomial coefficients of the entropy
+        and enthalpy splines."""
+        return np.array([self.entropy_spline.c, self.enthalpy_spline.c])
+
+    @classmethod
+    def from_file(cls, nist_file):
+        """Builds a table from a NIST_JANAF file, taking both the parsed
+        table and the fitted splines from the cache directory when they
+        are there, see :py:func:`read_table`.
+
+        Parameters
+        ----------
+        nist_file : :py:attr:`str`
+            Filename of NIST_JANAF thermochemcial table
+
+        Returns
+        -------
+        table : :py:class:`surfinpy.thermo.ThermoTable`
+            Fitted table
+        """
+        digest = _content_key(nist_file)
+        thermochem = read_table(nist_file, digest)
+        path = _cache_path(digest, '.splines.npy')
+        coefficients = _cache_load(path)
+        if coefficients is not None and \
+                coefficients.shape != (2, 4, thermochem.shape[0] - 1):
+            coefficients = None
+        table = cls(thermochem, coefficients)
+        if coefficients is None:
+            _cache_store(path, table.coefficients)
+        return table
+
+    def entropy(self, T):
+        """Fitted entropy, in J/mol/K.
+
+        Parameters
+        ----------
+        T : :py:attr:`array_like`
+            Temperature, a scalar or an array
+
+        Returns
+        -------
+        :py:attr:`array_like`
+            Entropy at each temperature
+        """
+        return self.entropy_spline(T)
+
+    def enthalpy(self, T):
+        """Fitted enthalpy, in kJ/mol, including the enthalpy at the first
+        temperature of the table.
+
+        Parameters
+        ----------
+        T : :py:attr:`array_like`
+            Temperature, a scalar or an array
+
+        Returns
+        -------
+        :py:attr:`array_like`
+            Enthalpy at each temperature
+        """
+        return self.enthalpy_spline(T) + self.h0
+
+    def gibbs(self, T):
+        """Gibbs free energy, in eV, see
+        :py:func:`surfinpy.utils.calculate_gibbs`.
+
+        Parameters
+        ----------
+        T : :py:attr:`array_like`
+            Temperature, a scalar or an array
+
+        Returns
+        -------
+        :py:attr:`array_like`
+            Gibbs free energy at each temperature
+        """
+        return ut.calculate_gibbs(T, self.entropy(T), self.enthalpy(T))
+
+    def entropy_correction(self, T):
+        r"""Entropic contribution to the free energy of the species, in eV,
+
+        .. math::
+            \frac{T S(T)}{1000 \times 96.485}
+
+        Parameters
+        ----------
+        T : :py:attr:`array_like`
+            Temperature, a scalar or an array
+
+        Returns
+        -------
+        :py:attr:`array_like`
+            Correction at each temperature
+        """
+        return (T * (self.entropy(T) / 1000)) / 96.485
+
+    def __getitem__(self, temperatures):
+        """Gibbs free energy at a temperature, an array of temperatures or a
+        slice of temperatures, e.g. table[300:400:0.5]."""
+        if isinstance(temperatures, slice):
+            step = 1 if temperatures.step is None else temperatures.step
+            temperatures = np.arange(temperatures.start, temperatures.stop,
+                                     step, dtype=float)
+        return self.gibbs(temperatures)
+
+
+def _table_key(thermochem):
+    """Identifies a NIST_JANAF table by its path, modification time and
+    size, or an array by its shape, type and values. None for anything
+    else."""
+    if isinstance(thermochem, (str, os.PathLike)):
+        path = os.path.abspath(thermochem)
+        stat = os.stat(path)
+        return ('file', path, stat.st_mtime_ns, stat.st_size)
+    if isinstance(thermochem, np.ndarray):
+        return ('array', thermochem.shape, thermochem.dtype.str,
+                np.ascontiguousarray(thermochem).tobytes())
+    return None
+
+
+def get_table(thermochem):
+    """Returns the :py:class:`ThermoTable` for a NIST_JANAF table. The last
+    32 tables used are kept, so that a table is only read and fitted once
+    while it is in use. Arrays with the same values share a table.
+
+    Parameters
+    ----------
+    thermochem : :py:attr:`str`
+        Filename of a NIST_JANAF table, the table as an array, or a
+        :py:class:`ThermoTable`
+
+    Returns
+    -------
+    table : :py:class:`surfinpy.thermo.ThermoTable`
+        Fitted table
+    """
+    if isinstance(thermochem, ThermoTable):
+        return thermochem
+    key = _table_key(thermochem)
+    if key is None:
+        return ThermoTable(thermochem)
+    with _tables_lock:
+        if key in _tables:
+            _tables.move_to_end(key)
+            return _tables[key]
+    if key[0] == 'file':
+        table = ThermoTable.from_file(thermochem)
+    else:
+        table = ThermoTable(thermochem)
+    with _tables_lock:
+        if key in _tables:
+            return _tables[key]
+        _tables[key] = table
+        while len(_tables) > _max_tables:
+            _tables.popitem(last=False)
+    return table
+
+
+def clear_cache():
+    """Discards all fitted tables."""
+    with _tables_lock:
+        _tables.clear()
@@ -1,8 +1,7 @@
 import yaml
 import numpy as np
 from scipy.constants import value
-from scipy.interpolate import CubicSpline
-import matplotlib.pyplot as plt 
+from surfinpy import profiling
 
 def pressure(chemical_potential, t):
     r"""Converts chemical potential at a specific
@@ -62,10 +61,9 @@ def build_xgrid(x, y):
     Returns
     -------
     xnew : :py:attr:`array_like`
-        Two dimensional numpy array required for energy calculations
+        Two dimensional read-only view of x required for energy calculations
     """
-    xnew = np.tile(x, y.size)
-    xnew = np.reshape(xnew, (y.size, x.size))
+    xnew = np.broadcast_to(x, (y.size, x.size))
     return xnew
 
 def build_ygrid(x, y):
@@ -81,11 +79,9 @@ def build_ygrid(x, y):
     Returns
     -------
     xnew : :py:attr:`array_like`
-        Two dimensional numpy array required for energy calculations
+        Two dimensional read-only view of y required for energy calculations
     """
-    ynew = np.tile(y, x.size)
-    ynew = np.split(ynew, x.size)
-    ynew = np.column_stack(ynew)
+    ynew = np.broadcast_to(np.reshape(y, (y.size, 1)), (y.size, x.size))
     return ynew
 
 def build_zgrid(z, y):
@@ -101,10 +97,9 @@ def build_zgrid(z, y):
     Returns
     -------
     xnew : :py:attr:`array_like`
-        Two dimensional numpy array required for energy calculations
+        Two dimensional read-only view of z required for energy calculations
     """
-    znews = np.tile(z, y.size)
-    znews = np.reshape(znews, (z.size, y.size), order='F')
+    znews = np.broadcast_to(np.reshape(z, (z.size, 1)), (z.size, y.size))
     return znews
 
 def build_entgrid(z, y, ynew):
@@ -122,8 +117,7 @@ def build_entgrid(z, y, ynew):
     xnew : :py:attr:`array_like`
         Two dimensional numpy array required for energy calculations
     """
-    znews = np.tile(z, len(y))
-    znews = np.reshape(znews, (len(z), len(y)), order='F')
+    znews = build_tempgrid(z, y)
     temp_ent = np.multiply(znews, ynew)
     return temp_ent
 
@@ -140,9 +134,9 @@ def build_freqgrid(z, y):
     Returns
     -------
     xnew : :py:attr:`array_like`
-        Two dimensional numpy array required for energy calculations
+        Two dimensional read-only view of z required for energy calculations
     """
-    znews = np.tile(z, (len(y),1))
+    znews = np.broadcast_to(np.asarray(z), (len(y), len(z)))
     return znews
     
 def build_tempgrid(z, y):
@@ -158,12 +152,33 @@ def build_tempgrid(z, y):
     Returns
     -------
     xnew : :py:attr:`array_like`
-        Two dimensional numpy array required for energy calculations
+        Two dimensional read-only view of z required for energy calculations
     """
-    znews = np.tile(z, len(y))
-    znews = np.reshape(znews, (len(z), len(y)), order='F')
+    znews = np.broadcast_to(np.reshape(z, (len(z), 1)), (len(z), len(y)))
     return znews
 
+def compact_grid(grid):
+    """Recovers the smallest array that broadcasts to a grid built by one of
+    the build_*grid functions, e.g. a (1, x.size) array from
+    :py:func:`build_xgrid`. The result shares memory with the grid, and
+    arithmetic on it only produces a full size array when it is combined
+    with values that vary along the other axis.
+
+    Parameters
+    ----------
+    grid : :py:attr:`array_like`
+        Broadcast view of a one dimensional array
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        Array with every repeated axis reduced to length one
+    """
+    grid = np.asarray(grid)
+    index = tuple(slice(0, 1) if stride == 0 else slice(None)
+                  for stride in grid.strides)
+    return grid[index]
+
 def read_vibdata(vib_file):
     """Reads a yaml file containing the
     vribational frequencies from a DFT calculation.
@@ -182,19 +197,25 @@ def read_vibdata(vib_file):
         vib_prop = yaml.load(file, Loader=yaml.FullLoader)
     return vib_prop
 
-def read_nist(File):
+def read_nist(File, cache=False):
     '''Read a downloaded NIST_JANAF thermochemcial table
 
     Parameters
     ----------
     File : :py:attr:`str`
         Filename of NIST_JANAF thermochemcial table
+    cache : :py:attr:`bool`
+        Load the parsed table from the binary cache, if a cache directory
+        is set, see :py:func:`surfinpy.thermo.read_table`
 
     Returns
     -------
     data : :py:attr:`array_like`
-        NIST_JANAF thermochemcial as an array
+        NIST_JANAF thermochemcial as an array, read only if cache is True
     '''
+    if cache:
+        from surfinpy import thermo
+        return thermo.read_table(File)
     data = np.genfromtxt(File, skip_header=2)
     return data
 
@@ -215,6 +236,7 @@ def cs_fit(x, y, t):
     shift : :py:attr:`array_like`
         data fitted from x and y to t
     '''
+    from scipy.interpolate import CubicSpline
     z = CubicSpline(x, y, bc_type='clamped')
     shift = z(t)
     return shift
@@ -278,12 +300,12 @@ def fit_nist(nist_file, increments=1, method='cs'):
     gibbs : :py:attr:`float`
         correct free energy
     """
+    if method == 'cs':
+        from surfinpy import thermo
+        return thermo.get_table(nist_file).gibbs(np.arange(1, 3000, increments))
     nist_data = read_nist(nist_file)
     h0 = nist_data[0, 4]
-    if method == 'cs':
-        fitted_s = cs_fit(nist_data[:, 0], nist_data[:, 2], np.arange(1, 3000, increments))
-        fitted_h = cs_fit(nist_data[:, 0], nist_data[:, 4], np.arange(1, 3000, increments))
-    elif method == 'poly':
+    if method == 'poly':
         fitted_s = poly_fit(nist_data[:, 0], nist_data[:, 2], np.arange(1, 3000, increments))
         fitted_h = poly_fit(nist_data[:, 0], nist_data[:, 4], np.arange(1, 3000, increments))
     fitted_h = fitted_h + h0
@@ -292,7 +314,8 @@ def fit_nist(nist_file, increments=1, method='cs'):
 
 def temperature_correction_range(nist_file, deltaY):
     """Use experimental data to correct the DFT free energy of an adsorbing
-    species to a specific temperature.
+    species to a specific temperature. The table is only fitted once, see
+    :py:func:`surfinpy.thermo.get_table`.
 
     Parameters
     ----------
@@ -306,35 +329,443 @@ def temperature_correction_range(nist_file, deltaY):
     gibbs : :py:attr:`float`
         correct free energy
     """
-    x = fit_nist(nist_file, increments=0.01)
+    from surfinpy import thermo
     lower = int(deltaY['Range'][0] / 0.01)
     upper = int(deltaY['Range'][1] / 0.01)
-    gibbs = x[lower : upper]
+    temperatures = 1 + np.arange(lower, upper) * 0.01
+    gibbs = thermo.get_table(nist_file).gibbs(temperatures)
     return gibbs
 
-def get_phase_data(S, nsurfaces):
+def phase_stack(energy, nphases, shape, dtype=float):
+    """Evaluates the energy of every phase into a single preallocated
+    array, rather than growing a flat array one phase at a time.
+
+    Parameters
+    ----------
+    energy : :py:attr:`callable`
+        Function taking the phase index k and returning the energy of that
+        phase across the grid (or a value that broadcasts to it)
+    nphases : :py:attr:`int`
+        Total number of phases
+    shape : :py:attr:`tuple`
+        Shape of the grid
+    dtype : :py:attr:`type`
+        Type the energies are stored as
+
+    Returns
+    -------
+    S : :py:attr:`array_like`
+        Array of shape (nphases, ) + shape of phase energies
+    """
+    S = np.empty((nphases, ) + tuple(shape), dtype=dtype)
+    for k in range(0, nphases):
+        with profiling.stage('energy', phase=k + 1):
+            S[k] = energy(k)
+    return S
+
+def phase_dtype(nphases):
+    """Smallest unsigned integer type that can hold the phases, numbered
+    from 1 to nphases, e.g. uint8 for up to 255 phases.
+
+    Parameters
+    ----------
+    nphases : :py:attr:`int`
+        Total number of phases
+
+    Returns
+    -------
+    dtype : :py:attr:`numpy.dtype`
+        Type of the phase data
+    """
+    return np.min_scalar_type(max(int(nphases), 1))
+
+def get_phase_data(S, nsurfaces, dtype=None, energy_dtype=float):
     ''' Determines which surface composition is most stable at a
     given x and y value.
 
     Parameters
     ----------
     S : :py:attr:`array_like`
-        2D array of surface energies
+        Array of surface energies, either stacked with the phase along
+        the first axis or flattened phase by phase
     nsurfaces : :py:attr:`int`
         Total number of surfaces
+    dtype : :py:attr:`type`
+        Type of the phase data, the smallest that fits if None, see
+        :py:func:`phase_dtype`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest surface energies, e.g. numpy.float32, or None
+        to only find the phases
 
     Returns
     -------
     x : :py:attr:`array_like`
         array of ints corresponding to the position of
         the lowest phase
+    surface_energy : :py:attr:`array_like`
+        lowest surface energy at each point, None if energy_dtype is None
     '''
-    S = np.split(S, nsurfaces)
-    S = np.column_stack(S)
-    surface_energy = np.amin(S, axis=1)
-    x = np.argmin(S, axis=1) + 1
+    if dtype is None:
+        dtype = phase_dtype(nsurfaces)
+    with profiling.stage('reduction'):
+        S = np.reshape(S, (nsurfaces, -1))
+        lowest = np.argmin(S, axis=0)
+        surface_energy = None
+        if energy_dtype is not None:
+            surface_energy = np.take_along_axis(S, lowest[np.newaxis], axis=0)[0]
+            surface_energy = surface_energy.astype(energy_dtype, copy=False)
+        x = lowest.astype(dtype)
+        x += 1
     return x, surface_energy
 
+def tile_rows(values, rows, dtype=None):
+    """Selects the rows of a tile from an array that broadcasts against the
+    grid. Scalars and arrays that only have a single row are the same for
+    every tile and are returned unchanged. Single points of the grid can
+    be selected instead by giving their row and column indices.
+
+    Parameters
+    ----------
+    values : :py:attr:`array_like`
+        Scalar or compact grid, see :py:func:`compact_grid`
+    rows : :py:attr:`slice`
+        Rows of the grid in the tile, or a tuple of the row and column
+        index arrays of single points
+    dtype : :py:attr:`type`
+        Type to convert the values to, e.g. numpy.float32 to compute the
+        energies of a tile in single precision. Unchanged if None.
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        Values for the rows in the tile, or for each point
+    """
+    if np.ndim(values) == 0:
+        return values if dtype is None else dtype(values)
+    if isinstance(rows, tuple):
+        iy, ix = rows
+        values = np.asarray(values)
+        values = values[iy if values.shape[0] > 1 else 0,
+                        ix if values.shape[1] > 1 else 0]
+    elif np.shape(values)[0] > 1:
+        values = values[rows]
+    if dtype is None:
+        return values
+    return np.asarray(values, dtype=dtype)
+
+def term_scale(*terms):
+    """Sum of the largest magnitude of each term of an energy, which bounds
+    the rounding error of computing the energy in single precision, see
+    :py:func:`single_phase_data`.
+
+    Parameters
+    ----------
+    terms : :py:attr:`array_like`
+        Scalars or compact grids, one for each term summed into the energy
+
+    Returns
+    -------
+    :py:attr:`float`
+        Sum of the largest magnitude of each term
+    """
+    return sum(float(np.amax(np.abs(term))) for term in terms)
+
+def single_phase_data(S, nsurfaces, energy, dtype=None, energy_dtype=float,
+                      scale=0):
+    r"""Determines which phase is most stable at each point from energies
+    computed in single precision, giving exactly the phases that double
+    precision would. Rounding an energy E to single precision changes it
+    by at most :math:`2^{-24}|E|`, and computing it in single precision
+    from n terms :math:`t_i` changes it by at most about
+    :math:`n 2^{-24} \sum_i |t_i|`. Wherever the two lowest energies are
+    further apart than :math:`\epsilon (2 |E| + 32 s)`, with
+    :math:`\epsilon` the single precision machine epsilon and s the scale
+    of the terms, no rounding can have changed which is lowest. Only the
+    remaining points are evaluated again in double precision.
+
+    Parameters
+    ----------
+    S : :py:attr:`array_like`
+        Single precision energies, stacked with the phase along the first
+        axis, see :py:func:`phase_stack`
+    nsurfaces : :py:attr:`int`
+        Total number of surfaces
+    energy : :py:attr:`callable`
+        Function taking the phase index k and a tuple of the row and
+        column indices of points and returning the double precision energy
+        of that phase at those points
+    dtype : :py:attr:`type`
+        Type of the phase data, the smallest that fits if None, see
+        :py:func:`phase_dtype`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest energies, or None to only find the phases. The
+        energies are only accurate to single precision.
+    scale : :py:attr:`float`
+        Largest sum of the magnitudes of the terms of any energy, see
+        :py:func:`term_scale`, or 0 if the energies were computed in double
+        precision and only rounded to single precision
+
+    Returns
+    -------
+    x : :py:attr:`array_like`
+        array of ints corresponding to the position of
+        the lowest phase
+    surface_energy : :py:attr:`array_like`
+        lowest energy at each point, None if energy_dtype is None
+    """
+    shape = S.shape[1:]
+    x, lowest = get_phase_data(S, nsurfaces, dtype, np.float32)
+    S = np.reshape(S, (nsurfaces, -1))
+    index = (x.astype(np.intp) - 1)[np.newaxis]
+    np.put_along_axis(S, index, np.inf, axis=0)
+    second = np.amin(S, axis=0)
+    np.put_along_axis(S, index, lowest[np.newaxis], axis=0)
+    gap = second.astype(float) - lowest
+    # Generous for the handful of operations in each energy
+    bound = (np.finfo(np.float32).eps * (2 * np.abs(lowest.astype(float))
+                                         + 32 * scale)
+             + np.finfo(np.float32).tiny)
+    ambiguous = np.flatnonzero(~(gap > bound))
+    surface_energy = None
+    if energy_dtype is not None:
+        surface_energy = lowest.astype(energy_dtype)
+    with profiling.stage('recheck', points=ambiguous.size):
+        if ambiguous.size:
+            points = np.unravel_index(ambiguous, shape)
+            checked = phase_stack(lambda k: energy(k, points), nsurfaces,
+                                  ambiguous.shape)
+            x[ambiguous], y = get_phase_data(checked, nsurfaces, x.dtype,
+                                             energy_dtype)
+            if energy_dtype is not None:
+                surface_energy[ambiguous] = y
+    return x, surface_energy
+
+def tiled_phase_data(energy, nphases, shape, tile=None, out=None,
+                     dtype=None, energy_dtype=float, precision='double',
+                     scale=0):
+    """Determines which phase is most stable at each point of a grid,
+    working through the grid a block of rows at a time. The energies of
+    every phase are only held for the rows of the current tile, so the
+    peak memory is proportional to tile * nphases rather than to the size
+    of the grid times nphases.
+
+    Parameters
+    ----------
+    energy : :py:attr:`callable`
+        Function taking the phase index k and a slice of grid rows and
+        returning the energy of that phase in those rows. With single
+        precision it is also given the type to compute the energies in,
+        numpy.float32, as a third argument, and is called with the row and
+        column indices of points to compute in double precision, see
+        :py:func:`tile_rows`.
+    nphases : :py:attr:`int`
+        Total number of phases
+    shape : :py:attr:`tuple`
+        Shape of the grid
+    tile : :py:attr:`int`
+        Approximate number of grid points in each tile. The whole grid is
+        evaluated at once by default.
+    out : :py:attr:`tuple`
+        Arrays with the shape of the grid, e.g. memory mapped files, to
+        write the phases and lowest energies into. The lowest energies
+        are not found if the second array is None.
+    dtype : :py:attr:`type`
+        Type of the phase data, the smallest that fits if None, see
+        :py:func:`phase_dtype`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest energies, e.g. numpy.float32, or None to only
+        find the phases
+    precision : :py:attr:`str`
+        'double', or 'single' to compute and store the energies of every
+        phase in single precision, halving the memory used, and check the
+        points where that could change the stable phase in double
+        precision, see :py:func:`single_phase_data`. The phases are the
+        same either way, the lowest energies are only accurate to single
+        precision.
+    scale : :py:attr:`float`
+        Largest sum of the magnitudes of the terms of any energy, used
+        with single precision, see :py:func:`term_scale`
+
+    Returns
+    -------
+    phases : :py:attr:`array_like`
+        array of ints corresponding to the position of
+        the lowest phase
+    surface_energy : :py:attr:`array_like`
+        lowest energy at each point, None if it was not wanted
+    """
+    if precision not in ('double', 'single'):
+        raise ValueError("precision must be 'double' or 'single', "
+                         "not {!r}".format(precision))
+    ny, nx = shape
+    step = ny if tile is None else max(1, int(tile) // max(nx, 1))
+    if out is None:
+        if dtype is None:
+            dtype = phase_dtype(nphases)
+        phases = np.empty(shape, dtype=dtype)
+        surface_energy = None
+        if energy_dtype is not None:
+            surface_energy = np.empty(shape, dtype=energy_dtype)
+    else:
+        phases, surface_energy = out
+    wanted = None if surface_energy is None else surface_energy.dtype
+    for start in range(0, ny, step):
+        rows = slice(start, min(start + step, ny))
+        nrows = rows.stop - rows.start
+        if precision == 'single':
+            S = phase_stack(lambda k: energy(k, rows, np.float32), nphases,
+                            (nrows, nx), np.float32)
+            points = lambda k, p: energy(k, (p[0] + rows.start, p[1]))
+            x, y = single_phase_data(S, nphases, points, phases.dtype,
+                                     wanted, scale)
+        else:
+            S = phase_stack(lambda k: energy(k, rows), nphases, (nrows, nx))
+            x, y = get_phase_data(S, nphases, phases.dtype, wanted)
+        phases[rows] = np.reshape(x, (nrows, nx))
+        if surface_energy is not None:
+            surface_energy[rows] = np.reshape(y, (nrows, nx))
+        del S
+    if surface_energy is None:
+        return phases.ravel(), None
+    return phases.ravel(), surface_energy.ravel()
+
+def adaptive_phase_data(energy, nphases, x, y, coarse=32, dtype=None,
+                        energy_dtype=float):
+    """Determines which phase is most stable at each x and y value by
+    refining a coarse grid only where it is needed. The grid is evaluated
+    every `coarse` points first and each block whose four corners agree on
+    the stable phase is filled with that phase. The remaining blocks are
+    split into four and the process repeated until every point is known.
+
+    Filling a block from its corners is exact when the region in which
+    each phase is stable is convex, which is the case whenever the phase
+    energies are linear in x and y.
+
+    Parameters
+    ----------
+    energy : :py:attr:`callable`
+        Function taking the phase index k and arrays of x and y values and
+        returning the energy of that phase at each point
+    nphases : :py:attr:`int`
+        Total number of phases
+    x : :py:attr:`array_like`
+        One dimensional numpy array representing one dimension of phase diagram
+    y : :py:attr:`array_like`
+        One dimensional numpy array representing one dimension of phase diagram
+    coarse : :py:attr:`int`
+        Spacing, in grid points, of the initial coarse grid
+    dtype : :py:attr:`type`
+        Type of the phase data, the smallest that fits if None, see
+        :py:func:`phase_dtype`
+    energy_dtype : :py:attr:`type`
+        Type of the lowest energies, e.g. numpy.float32, or None to only
+        find the phases
+
+    Returns
+    -------
+    phases : :py:attr:`array_like`
+        array of ints corresponding to the position of
+        the lowest phase
+    surface_energy : :py:attr:`array_like`
+        lowest energy at each point, None if energy_dtype is None
+    """
+    shape = (y.size, x.size)
+    if dtype is None:
+        dtype = phase_dtype(nphases)
+    phases = np.zeros(shape, dtype=dtype)
+
+    def evaluate(iy, ix):
+        S = phase_stack(lambda k: energy(k, x[ix], y[iy]), nphases, iy.shape)
+        phases[iy, ix] = get_phase_data(S, nphases, dtype, None)[0]
+
+    if min(shape) < 2:
+        iy, ix = np.indices(shape)
+        evaluate(iy.ravel(), ix.ravel())
+    else:
+        rows = np.unique(np.append(np.arange(0, shape[0], coarse), shape[0] - 1))
+        cols = np.unique(np.append(np.arange(0, shape[1], coarse), shape[1] - 1))
+        r0, c0 = np.meshgrid(rows[:-1], cols[:-1], indexing='ij')
+        r1, c1 = np.meshgrid(rows[1:], cols[1:], indexing='ij')
+        blocks = np.column_stack([r0.ravel(), r1.ravel(), c0.ravel(), c1.ravel()])
+        while blocks.size:
+            r0, r1, c0, c1 = blocks.T
+            iy = np.concatenate([r0, r0, r1, r1])
+            ix = np.concatenate([c0, c1, c0, c1])
+            unknown = phases[iy, ix] == 0
+            if np.any(unknown):
+                points = np.unique(iy[unknown] * shape[1] + ix[unknown])
+                evaluate(points // shape[1], points % shape[1])
+            corners = phases[iy, ix].reshape(4, -1)
+            uniform = np.all(corners == corners[0], axis=0)
+            for b in np.flatnonzero(uniform):
+                phases[r0[b]:r1[b] + 1, c0[b]:c1[b] + 1] = corners[0, b]
+            split = ~uniform & ((r1 - r0 > 1) | (c1 - c0 > 1))
+            r0, r1, c0, c1 = blocks[split].T
+            rm = np.where(r1 - r0 > 1, (r0 + r1) // 2, r1)
+            cm = np.where(c1 - c0 > 1, (c0 + c1) // 2, c1)
+            children = np.concatenate([
+                np.column_stack([r0, rm, c0, cm]),
+                np.column_stack([rm, r1, c0, cm]),
+                np.column_stack([r0, rm, cm, c1]),
+                np.column_stack([rm, r1, cm, c1])])
+            keep = (children[:, 1] > children[:, 0]) & (children[:, 3] > children[:, 2])
+            blocks = children[keep]
+
+    phases = phases.ravel()
+    if energy_dtype is None:
+        return phases, None
+    xs = np.tile(x, y.size)
+    ys = np.repeat(y, x.size)
+    surface_energy = np.empty(phases.size, dtype=energy_dtype)
+    for k in np.unique(phases):
+        stable = phases == k
+        surface_energy[stable] = energy(int(k) - 1, xs[stable], ys[stable])
+    return phases, surface_energy
+
+def unique_phases(phases, block=2 ** 20):
+    '''Finds the phases that appear in the phase diagram. The phases are
+    counted rather than sorted, a block of points at a time, so that only
+    one block of the phase data is copied at once.
+
+    Parameters
+    ----------
+    phases : :py:attr:`array_like`
+        array of ints corresponding to the most stable phase, numbered from 1
+    block : :py:attr:`int`
+        number of points counted at a time
+
+    Returns
+    -------
+    ticks : :py:attr:`array_like`
+        sorted array of the phases present
+    '''
+    phases = np.ravel(phases)
+    seen = np.zeros(0, dtype=bool)
+    for start in range(0, phases.size, block):
+        found = np.bincount(phases[start:start + block]) > 0
+        if found.size > seen.size:
+            found[:seen.size] |= seen
+            seen = found
+        else:
+            seen[:found.size] |= found
+    return np.flatnonzero(seen)
+
+def phase_index(ticks):
+    '''Converts the phases displayed on the phase diagram, numbered from 1,
+    to the position of each phase in the list of datasets.
+
+    Parameters
+    ----------
+    ticks : :py:attr:`list`
+        Phases that are displayed.
+
+    Returns
+    -------
+    :py:attr:`array_like`
+        array of ints indexing the list of datasets.
+    '''
+    return np.asarray(ticks).astype(int) - 1
+
 def list_colors(phases, ticks):
     '''Reads the phase diagram data and returns the colors that correspond
     to the phases displayed on the phase diagram.
@@ -351,13 +782,8 @@ def list_colors(phases, ticks):
     colors : :py:attr:`list`
         list of colors.
     '''
-    colors = []
     if phases[0].color:
-        for i in range(0, ticks.size):
-            val = ticks[i] - 1
-            val = int(val)
-            colors.append(phases[val].color)
-        return colors
+        return [phases[i].color for i in phase_index(ticks)]
     else:
         return None
 
@@ -377,13 +803,7 @@ def get_labels(ticks, data):
     labels : :py:attr:`list`
         list of labels.
     '''
-    labels = []
-    for i in range(0, ticks.size):
-        val = ticks[i] - 1
-        val = int(val)
-        label = data[val].label
-        labels.append(label)
-    return labels
+    return [data[i].label for i in phase_index(ticks)]
 
 def get_levels(X):
     """Builds the levels used in the contourf plot. This is neccesary to
@@ -399,8 +819,8 @@ def get_levels(X):
     levels : :py:attr:`array_like`
         numpy array of ints
     """
-    a = np.amax(X) + 1
-    b = np.amin(X) - 1
+    a = int(np.amax(X)) + 1
+    b = int(np.amin(X)) - 1
     levels = np.arange(b, a, 1)
     return levels
 
@@ -415,7 +835,9 @@ def get_ticks(X):
 def transform_numbers(Z, ticks):
     ''' transform numbers - Takes the phase diagram array and converts
     the numbers to numbers scaled 0, 1, 2, etc in order to make plotting
-    easier
+    easier. Each value equal to ticks[i] becomes i, in a single pass
+    using a sorted search of ticks, so that the result lines up with the
+    output of :py:func:`list_colors` and :py:func:`get_labels`.
 
     Parameters
     ----------
@@ -429,9 +851,13 @@ def transform_numbers(Z, ticks):
     Z : :py:attr:`array_like`
         Normalised to a continuous set of numbers.
     '''
-    y = np.arange(ticks.size)
-    for i in range(0, ticks.size):
-        for j in range(0, Z.size):
-            if Z[j] == ticks[i]:
-                Z[j] = y[i]
-    return Z
+    Z = np.asarray(Z)
+    ticks = np.asarray(ticks)
+    if ticks.size == 0:
+        return Z
+    with profiling.stage('relabel'):
+        order = np.argsort(ticks, kind='stable')
+        position = np.searchsorted(ticks[order], Z)
+        position = np.minimum(position, ticks.size - 1)
+        found = ticks[order][position] == Z
+        return np.where(found, order[position], Z).astype(Z.dtype, copy=False)
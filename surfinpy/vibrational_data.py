@@ -1,9 +1,88 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
 import yaml
 import numpy as np
 from surfinpy import utils as ut
+from surfinpy import profiling
 from scipy.constants import value
 from scipy.constants import physical_constants
 
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_size = 128
+
+
+def set_cache_size(size):
+    """Sets the maximum number of parsed files and vibrational calculations
+    that are kept in memory. The least recently used are discarded first.
+
+    Parameters
+    ----------
+    size : :py:attr:`int`
+        Maximum number of cached entries, 0 disables the cache
+    """
+    global _cache_size
+    with _cache_lock:
+        _cache_size = int(size)
+        while len(_cache) > max(_cache_size, 0):
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    """Discards all cached vibrational data."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cached(key, calculate):
+    """Returns the cached value for key, calculating and storing it if it
+    is not already cached."""
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    value = calculate()
+    with _cache_lock:
+        if _cache_size > 0:
+            _cache[key] = value
+            while len(_cache) > _cache_size:
+                _cache.popitem(last=False)
+    return value
+
+
+def _file_key(vib_file):
+    """Identifies a file by its path, modification time and size."""
+    path = os.path.abspath(vib_file)
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _temperature_key(temp_r):
+    """Identifies a temperature range by a digest of its values."""
+    temp_r = np.ascontiguousarray(temp_r, dtype=float)
+    return (temp_r.shape, hashlib.sha1(temp_r.tobytes()).hexdigest())
+
+
+def read_vibdata(vib_file):
+    """Reads a yaml file containing vibrational frequencies, see
+    :py:func:`surfinpy.utils.read_vibdata`. Each file is only parsed once
+    unless it is modified.
+
+    Parameters
+    ----------
+    vib_file : :py:attr:`str`
+        File name
+
+    Returns
+    -------
+    vib_prop : :py:attr:`dict`
+        Dictionary of vibrational freqencies.
+    """
+    return _cached(('read',) + _file_key(vib_file),
+                   lambda: ut.read_vibdata(vib_file))
+
 def zpe_calc(vib_prop):
     """Calculates and returns the zero point energy for the system.
 
@@ -26,9 +105,14 @@ def zpe_calc(vib_prop):
     return zpe
 
 
-def entropy_calc(freq, temp, vib_prop):
+def entropy_calc(freq, temp, vib_prop, block=1048576, dtype=float):
     """Calculates and returns the vibrational entropy for the system.
 
+    The entropy, free energy and internal energy are accumulated over
+    blocks of frequencies, see :py:func:`thermo_sums`, so the memory used
+    does not grow with the product of the number of temperatures and
+    frequencies.
+
     Parameters
     ----------
     freq : :py:attr:`array_like`
@@ -37,41 +121,46 @@ def entropy_calc(freq, temp, vib_prop):
         Temperature range at which the vibrational entropy is calculated
     vib_prop : :py:attr:`array_like`
         Vibrational Properties read from input yaml file
+    block : :py:attr:`int`
+        Approximate number of values evaluated at once
+    dtype : :py:attr:`type`
+        Type the terms are evaluated in, e.g. np.float32
 
     Returns
     -------
     svib : :py:attr:`array_like`
         Vibrational entropy for the system calculated using the temperature range provided.
+    avib : :py:attr:`array_like`
+        Vibrational free energy for the system
+    uvib : :py:attr:`array_like`
+        Vibrational internal energy for the system
     """
     hc = np.multiply(physical_constants["speed of light in vacuum"][0],physical_constants["Planck constant"][0])*100 #constant
     k =  physical_constants["Boltzmann constant"][0]
-    R=physical_constants["molar gas constant"][0]
     jtoev = np.multiply(physical_constants["electron volt-joule relationship"][0],physical_constants["Avogadro constant"][0])
-    np.seterr(over='ignore')
-    np.seterr(divide='ignore', invalid='ignore')
 
-    Theta = np.multiply(freq,hc)
-    Theta = np.divide(Theta, k)
-    
-    u = np.divide(np.multiply(Theta, R),(np.exp(np.divide(Theta, temp), dtype=np.float64)-1))
-    uvib = np.sum(u, axis=1)
+    freq = np.asarray(freq)
+    temp = np.asarray(temp)
+    if freq.ndim == 2:
+        freq = freq[0]
+    if temp.ndim == 2:
+        temp = temp[:, 0]
+    Theta = freq * hc / k
+    uvib, avib, svib = thermo_sums(Theta, temp, block=block, dtype=dtype)
     uvib = uvib/vib_prop['F-Units']
-
-    a = np.multiply(np.multiply(temp,R),np.log(np.subtract(1,np.exp(np.divide(np.negative(Theta),temp)))))
-    avib = np.sum(a, axis=1)
+    uvib = np.divide(uvib,jtoev) #constant
     avib = avib/vib_prop['F-Units']
     avib = np.divide(avib,jtoev) #constant
-    
-    s = np.divide(np.subtract(u,a), temp)
-    svib = np.sum(s, axis=1, dtype=np.float64)
     svib = svib/vib_prop['F-Units']
     svib = np.divide(svib,jtoev) #constant
     svib = np.nan_to_num(svib)
-    return svib, avib
+    return svib, avib, uvib
 
 def vib_calc(vib_file, temp_r):
     """Calculates and returns the Zero Point Energy (ZPE) and vibrational entropy for the temperature range provided. 
-    
+    Results are cached on the file path, modification time and temperature
+    range, see :py:func:`set_cache_size`.
+
     Parameters
     ----------
     vib_file : :py:attr:`str`):
@@ -85,42 +174,184 @@ def vib_calc(vib_file, temp_r):
         Zero Point energy for the system
     svib : :py:attr:`array_like`
         Vibrational entropy for the system calculated using the temperature range provided.
+    avib : :py:attr:`array_like`
+        Vibrational free energy for the system calculated using the temperature range provided.
     """
-    vib_prop = ut.read_vibdata(vib_file)
-    new_temp = ut.build_tempgrid(temp_r, vib_prop['Frequencies']) 
-    freq = ut.build_freqgrid(vib_prop['Frequencies'], temp_r) 
-    zpe = 0
+    key = ('vib', _file_key(vib_file), _temperature_key(temp_r))
+    return _cached(key, lambda: _vib_calc(vib_file, temp_r))
+
+def _vib_calc(vib_file, temp_r):
+    """Uncached :py:func:`vib_calc`."""
+    vib_prop = read_vibdata(vib_file)
+    new_temp = ut.compact_grid(ut.build_tempgrid(temp_r, vib_prop['Frequencies']))
+    freq = ut.compact_grid(ut.build_freqgrid(vib_prop['Frequencies'], temp_r))
     zpe = zpe_calc(vib_prop)
-    svib, avib = entropy_calc(freq, new_temp, vib_prop)
+    svib, avib = entropy_calc(freq, new_temp, vib_prop)[:2]
+    svib.setflags(write=False)
+    avib.setflags(write=False)
     return zpe, svib, avib
 
-def recalculate_vib(dataset, bulk):
-    if bulk.entropy:
-        bulk.temp_r = np.arange(bulk.temp_range[0],
-                                bulk.temp_range[1], 
-                                0.01, dtype="float")
-        bulk.svib = vib_calc(bulk.file, bulk.temp_r)[1]
-        bulk.avib = vib_calc(bulk.file, bulk.temp_r)[2]
-        bulk.temperature = bulk.temp_r[0]
-    if bulk.zpe:
-        bulk.temp_r = np.arange(bulk.temp_range[0],
-                                bulk.temp_range[1], 
-                                0.01, dtype="float")
-        bulk.zpe = vib_calc(bulk.file, bulk.temp_r)[0]
-        bulk.temperature = bulk.temp_r[0]
-
-    for phase in dataset:
-        if phase.entropy:
-            phase.temp_r = np.arange(phase.temp_range[0],
-                                    phase.temp_range[1], 
-                                    0.01, dtype="float")
-            phase.svib = vib_calc(phase.file, phase.temp_r)[1]
-            phase.avib = vib_calc(phase.file, phase.temp_r)[2]
-            phase.temperature = phase.temp_r[0]
-
-        if phase.zpe:
-            phase.temp_r = np.arange(phase.temp_range[0],
-                                    phase.temp_range[1], 
-                                    0.01, dtype="float")
-            phase.zpe = vib_calc(phase.file, phase.temp_r)[0]
-            phase.temperature = phase.temp_r[0]
\ No newline at end of file
+def thermo_sums(theta, temp, mask=None, block=1048576, dtype=float):
+    """Sums the vibrational internal energy, free energy and entropy of
+    each mode, in J/mol, sharing a single exponential between all three,
+
+    .. math::
+        U = \\sum \\frac{R \\Theta e^{-\\Theta / T}}{1 - e^{-\\Theta / T}}, \\quad
+        A = \\sum R T \\ln(1 - e^{-\\Theta / T}), \\quad
+        S = \\frac{U - A}{T}
+
+    The sums are accumulated over blocks of temperatures and modes, so no
+    intermediate array holds more than roughly block values.
+
+    Parameters
+    ----------
+    theta : :py:attr:`array_like`
+        Vibrational temperature of each mode, the last axis runs over modes
+    temp : :py:attr:`array_like`
+        Temperature range
+    mask : :py:attr:`array_like`
+        Which entries of theta are modes, for padded arrays of modes
+    block : :py:attr:`int`
+        Approximate number of values evaluated at once
+    dtype : :py:attr:`type`
+        Type the terms are evaluated in, float32 halves the memory used.
+        The sums are always accumulated in float64.
+
+    Returns
+    -------
+    U : :py:attr:`array_like`
+        Internal energy, with shape theta.shape[:-1] + temp.shape
+    A : :py:attr:`array_like`
+        Free energy
+    S : :py:attr:`array_like`
+        Entropy
+    """
+    R = physical_constants["molar gas constant"][0]
+    theta = np.asarray(theta, dtype=dtype)
+    T = np.ravel(np.asarray(temp, dtype=dtype))
+    if mask is not None:
+        mask = np.broadcast_to(np.asarray(mask, dtype=bool), theta.shape)
+    shape = theta.shape[:-1] + T.shape
+    U = np.zeros(shape)
+    A = np.zeros(shape)
+    S = np.zeros(shape)
+    nsystems = max(int(np.prod(theta.shape[:-1])), 1)
+    nmodes = theta.shape[-1]
+    temps = int(min(max(block // nsystems, 1), max(T.size, 1)))
+    modes = int(min(max(block // (nsystems * temps), 1), max(nmodes, 1)))
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        for t in range(0, T.size, temps):
+            Tb = T[t:t + temps, np.newaxis]
+            for m in range(0, nmodes, modes):
+                th = theta[..., np.newaxis, m:m + modes]
+                e = np.exp(-th / Tb)
+                u = (th * R) * e / (1 - e)
+                a = (Tb * R) * np.log(1 - e)
+                sb = (u - a) / Tb
+                if mask is not None:
+                    keep = mask[..., np.newaxis, m:m + modes]
+                    u = np.where(keep, u, 0)
+                    a = np.where(keep, a, 0)
+                    sb = np.where(keep, sb, 0)
+                U[..., t:t + temps] += np.sum(u, axis=-1, dtype=np.float64)
+                A[..., t:t + temps] += np.sum(a, axis=-1, dtype=np.float64)
+                S[..., t:t + temps] += np.sum(sb, axis=-1, dtype=np.float64)
+    return U, A, S
+
+def batch_vib_calc(vib_files, temp_r):
+    """Calculates the Zero Point Energy (ZPE), vibrational entropy and
+    vibrational free energy of many systems over a shared temperature range
+    in a single vectorised evaluation. The frequencies of every system are
+    padded to a common length and masked. Each result is also stored in the
+    :py:func:`vib_calc` cache, and systems already in the cache are not
+    recalculated.
+
+    Parameters
+    ----------
+    vib_files : :py:attr:`list`
+        yaml files containing vibrational frequencies
+    temp_r : :py:attr:`array_like`
+        Temperature range at which the vibrational entropy is calculated
+
+    Returns
+    -------
+    zpe : :py:attr:`array_like`
+        Zero Point energy of each system
+    svib : :py:attr:`array_like`
+        (nsystems, ntemperatures) array of vibrational entropies
+    avib : :py:attr:`array_like`
+        (nsystems, ntemperatures) array of vibrational free energies
+    """
+    hc = np.multiply(physical_constants["speed of light in vacuum"][0],physical_constants["Planck constant"][0])*100
+    k = physical_constants["Boltzmann constant"][0]
+    jtoev = np.multiply(physical_constants["electron volt-joule relationship"][0],physical_constants["Avogadro constant"][0])
+    temperature_key = _temperature_key(temp_r)
+    keys = [('vib', _file_key(f), temperature_key) for f in vib_files]
+    results = {}
+    with _cache_lock:
+        for key in keys:
+            if key in _cache:
+                results[key] = _cache[key]
+    missing = {}
+    for vib_file, key in zip(vib_files, keys):
+        if key not in results:
+            missing[key] = vib_file
+    if missing:
+        vib_props = [read_vibdata(f) for f in missing.values()]
+        nmodes = max([len(v['Frequencies']) for v in vib_props] + [1])
+        freq = np.zeros((len(vib_props), nmodes))
+        mask = np.zeros((len(vib_props), nmodes), dtype=bool)
+        for i, vib_prop in enumerate(vib_props):
+            freq[i, :len(vib_prop['Frequencies'])] = vib_prop['Frequencies']
+            mask[i, :len(vib_prop['Frequencies'])] = True
+        funits = np.array([v['F-Units'] for v in vib_props],
+                          dtype=float)[:, np.newaxis]
+        U, A, S = thermo_sums(freq * hc / k, temp_r, mask)
+        avib = A / funits / jtoev
+        svib = np.nan_to_num(S / funits / jtoev)
+        for i, key in enumerate(missing):
+            svib[i].setflags(write=False)
+            avib[i].setflags(write=False)
+            results[key] = (zpe_calc(vib_props[i]), svib[i], avib[i])
+            _cached(key, lambda: results[key])
+    zpe = np.array([results[key][0] for key in keys])
+    svib = np.array([results[key][1] for key in keys])
+    avib = np.array([results[key][2] for key in keys])
+    return zpe, svib, avib
+
+def recalculate_vib(dataset, bulk, temp_step=0.01):
+    """Builds views of the bulk and each phase with their vibrational
+    properties on a temperature grid of the given spacing, see
+    :py:meth:`surfinpy.data.VibrationalProperties.with_temp_step`. The
+    original objects are not changed, so they can be shared between
+    calculations. The properties of every phase sharing a temperature grid
+    are calculated at once by :py:func:`batch_vib_calc`.
+
+    Parameters
+    ----------
+    dataset : :py:attr:`list`
+        List of :py:class:`surfinpy.data.DataSet` objects
+    bulk : :py:class:`surfinpy.data.ReferenceDataSet`
+        Reference dataset
+    temp_step : :py:attr:`float`
+        Spacing of the temperature grid
+
+    Returns
+    -------
+    dataset : :py:attr:`list`
+        Views of each phase
+    bulk : :py:class:`surfinpy.data.VibrationalView`
+        View of the reference dataset
+    """
+    with profiling.stage('vibrational'):
+        views = [phase.with_temp_step(temp_step) if phase.entropy or phase.zpe
+                 else phase for phase in [bulk] + list(dataset)]
+        groups = {}
+        for phase in views:
+            if phase.entropy:
+                temp_r = phase.temp_r
+                group = groups.setdefault(_temperature_key(temp_r), (temp_r, []))
+                group[1].append(phase.file)
+        for temp_r, vib_files in groups.values():
+            batch_vib_calc(vib_files, temp_r)
+    return views[1:], views[0]
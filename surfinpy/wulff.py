@@ -1,6 +1,8 @@
 from surfinpy import p_vs_t as pt
 from surfinpy import utils as ut
+from surfinpy import thermo
 import numpy as np
+from itertools import combinations
 from scipy.constants import value
 
 
@@ -13,7 +15,7 @@ def temperature_correction(T, thermochem, adsorbant):
     T : :py:attr:`int`
         Temperature to scale the energy to
     thermochem : :py:attr:`array_like`
-        nist_janaf table
+        nist_janaf table, or a :py:class:`surfinpy.thermo.ThermoTable`
     adsorbant : :py:attr:`float`
         DFT energy of adsorbant
 
@@ -22,9 +24,7 @@ def temperature_correction(T, thermochem, adsorbant):
     adsorbant : :py:attr:`float`
         Scaled energy of adsorbant
     """
-    temperature_range = np.arange(2, np.amax(thermochem[:, 0]))
-    shift = ut.cs_fit(thermochem[:, 0], thermochem[:, 2], temperature_range)
-    shift = (T * (shift[(T - 1)] / 1000)) / 96.485
+    shift = thermo.get_table(thermochem).entropy_correction(T)
     adsorbant = adsorbant - shift
     return adsorbant
 
@@ -67,15 +67,285 @@ def calculate_surface_energy(stoich,
     SEs : :py:attr:`array_like`
         surface energies for each surface at T/P
     """
+    return calculate_surface_energies(stoich, data, SE, adsorbant,
+                                      thermochem, T, P, coverage)[0, 0]
+
+
+def calculate_surface_energies(stoich,
+                               data,
+                               SE,
+                               adsorbant,
+                               thermochem,
+                               T,
+                               P,
+                               coverage=None):
+    """Calculate the surface energy of each surface over a grid of
+    temperatures and pressures in a single vectorised evaluation, see
+    :py:func:`calculate_surface_energy`.
+
+    Parameters
+    ----------
+    stoich : :py:class:`surfinpy.data.ReferenceDataSet`
+        information about the stoichiometric surface
+    data : :py:attr:`list`
+        list of dictionaries containing information on the "adsorbed" surfaces
+    SE : :py:attr:`float`
+        surface energy of the stoichiomteric surface
+    adsorbant : :py:attr:`float`
+        dft energy of adsorbing species
+    thermochem : :py:attr:`array_like`
+        Numpy array containing thermochemcial data downloaded from NIST_JANAF
+        for the adsorbing species, or a :py:class:`surfinpy.thermo.ThermoTable`
+    T : :py:attr:`array_like`
+        Temperatures to calculate the surface energy at
+    P : :py:attr:`array_like`
+        log10 of the pressures to calculate the surface energy at
+    coverage : :py:attr:`array_like`
+        Coverage of adsorbed specied on the surface.
+
+    Returns
+    -------
+    SEs : :py:attr:`array_like`
+        (nT, nP, nsurfaces) array of surface energies, with the
+        stoichiometric surface first
+    """
     if coverage is None:
         coverage = ut.calculate_coverage(data)
     R = value('molar gas constant')
     N_A = value('Avogadro constant')
-    lnP = np.log(10 ** P)
+    T = np.atleast_1d(np.asarray(T, dtype=float))
+    lnP = np.log(10 ** np.atleast_1d(np.asarray(P, dtype=float)))
     adsorbant = temperature_correction(T, thermochem, adsorbant)
-    AE = pt.adsorption_energy(data, stoich, adsorbant)
-    SEs = np.array([SE])
-    for i in range(0, len(data)):
-        S = SE + (coverage[i] / N_A) * (AE[i] - (lnP * (T * R)))
-        SEs = np.append(SEs, S)
+    AE = np.reshape(pt.adsorption_energy(data, stoich, adsorbant),
+                    (len(data), T.size))
+    coverage = np.asarray(coverage)[np.newaxis, np.newaxis, :]
+    AE = AE.T[:, np.newaxis, :]
+    lnP = lnP[np.newaxis, :, np.newaxis]
+    RT = (T * R)[:, np.newaxis, np.newaxis]
+    SEs = np.empty((T.size, lnP.size, len(data) + 1))
+    SEs[:, :, 0] = SE
+    SEs[:, :, 1:] = SE + (coverage / N_A) * (AE - (lnP * RT))
     return SEs
+
+
+def calculate_facet_energies(facets, adsorbant, thermochem, T, P):
+    """Calculate the surface energies of several facets over a grid of
+    temperatures and pressures, see :py:func:`calculate_surface_energies`.
+    Facets with fewer surfaces are padded with infinite energies, so the
+    most stable surface of each facet is the minimum over the last axis.
+
+    Parameters
+    ----------
+    facets : :py:attr:`list`
+        One dictionary per facet, with the keys 'stoich', 'data' and 'SE',
+        and optionally 'coverage', as the arguments of
+        :py:func:`calculate_surface_energies`
+    adsorbant : :py:attr:`float`
+        dft energy of adsorbing species
+    thermochem : :py:attr:`array_like`
+        Numpy array containing thermochemcial data downloaded from NIST_JANAF
+        for the adsorbing species, or a :py:class:`surfinpy.thermo.ThermoTable`
+    T : :py:attr:`array_like`
+        Temperatures to calculate the surface energy at
+    P : :py:attr:`array_like`
+        log10 of the pressures to calculate the surface energy at
+
+    Returns
+    -------
+    SEs : :py:attr:`array_like`
+        (nfacets, nT, nP, nsurfaces) array of surface energies
+    """
+    table = thermo.get_table(thermochem)
+    energies = [calculate_surface_energies(facet['stoich'], facet['data'],
+                                           facet['SE'], adsorbant, table,
+                                           T, P, facet.get('coverage'))
+                for facet in facets]
+    nsurfaces = max([energy.shape[-1] for energy in energies])
+    SEs = np.full((len(facets), ) + energies[0].shape[:2] + (nsurfaces, ),
+                  np.inf)
+    for i, energy in enumerate(energies):
+        SEs[i, :, :, :energy.shape[-1]] = energy
+    return SEs
+
+
+def _planes(normals):
+    """Unit normals of every plane and the facet each belongs to, from a
+    list with either one normal or an array of equivalent normals per
+    facet."""
+    planes = []
+    facet = []
+    for i, normal in enumerate(normals):
+        normal = np.atleast_2d(np.asarray(normal, dtype=float))
+        planes.append(normal / np.linalg.norm(normal, axis=1)[:, np.newaxis])
+        facet += [i] * normal.shape[0]
+    return np.concatenate(planes), np.array(facet)
+
+
+def _wulff_template(planes, offsets):
+    """Builds the Wulff shape for one set of plane offsets and records its
+    structure, i.e. the planes meeting at each vertex and the order of the
+    vertices around each face, so that it can be reused for other offsets.
+
+    Returns
+    -------
+    template : :py:attr:`dict`
+        The three planes defining each vertex, the inverse of their
+        normals, the planes each vertex lies on, and the edges of every
+        face
+    """
+    from scipy.spatial import HalfspaceIntersection
+    halfspaces = np.hstack((planes, -offsets[:, np.newaxis]))
+    vertices = HalfspaceIntersection(halfspaces, np.zeros(3)).intersections
+    tolerance = 1e-9 * np.amax(offsets)
+    unique = []
+    for vertex in vertices:
+        if not any(np.all(np.abs(vertex - u) <= tolerance) for u in unique):
+            unique.append(vertex)
+    vertices = np.array(unique)
+    incident = np.abs(vertices @ planes.T - offsets) <= tolerance
+
+    triples = []
+    for v in range(0, vertices.shape[0]):
+        on = np.flatnonzero(incident[v])
+        for triple in combinations(on, 3):
+            if abs(np.linalg.det(planes[list(triple)])) > 1e-6:
+                triples.append(triple)
+                break
+    triples = np.array(triples)
+
+    edges = []
+    for k in range(0, planes.shape[0]):
+        on = np.flatnonzero(incident[:, k])
+        if on.size < 3:
+            continue
+        centre = np.mean(vertices[on], axis=0)
+        u = vertices[on[0]] - centre
+        u = u / np.linalg.norm(u)
+        w = np.cross(planes[k], u)
+        angle = np.arctan2((vertices[on] - centre) @ w,
+                           (vertices[on] - centre) @ u)
+        order = on[np.argsort(angle)]
+        for a, b in zip(order, np.roll(order, -1)):
+            edges.append((a, b, k))
+    edges = np.array(edges)
+    return {'triples': triples,
+            'inverse': np.linalg.inv(planes[triples]),
+            'incident': incident,
+            'edges': edges}
+
+
+def _apply_template(template, planes, offsets):
+    """Calculates the area of every plane of the Wulff shape for many sets
+    of offsets at once, assuming the structure of the template.
+
+    Returns
+    -------
+    areas : :py:attr:`array_like`
+        (npoints, nplanes) array of face areas
+    valid : :py:attr:`array_like`
+        Whether the template describes the shape for each set of offsets
+    """
+    triples = template['triples']
+    edges = template['edges']
+    vertices = np.einsum('vij,pvj->pvi', template['inverse'],
+                         offsets[:, triples])
+    residual = vertices @ planes.T - offsets[:, np.newaxis, :]
+    tolerance = 1e-9 * np.amax(offsets, axis=1)[:, np.newaxis, np.newaxis]
+    valid = np.all(np.where(template['incident'], np.abs(residual), residual)
+                   <= tolerance, axis=(1, 2))
+    cross = np.cross(vertices[:, edges[:, 0]], vertices[:, edges[:, 1]])
+    contribution = np.einsum('pei,ei->pe', cross, planes[edges[:, 2]])
+    areas = np.zeros((offsets.shape[0], planes.shape[0]))
+    for k in np.unique(edges[:, 2]):
+        areas[:, k] = 0.5 * np.abs(np.sum(contribution[:, edges[:, 2] == k],
+                                          axis=1))
+    return areas, valid
+
+
+def facet_fractions(normals, energies):
+    r"""Wulff construction. Finds the equilibrium crystal shape, the
+    intersection of the half spaces
+
+    .. math::
+        \hat{n}_i \cdot x \leq \gamma_i
+
+    and the fraction of its surface area belonging to each facet. The
+    fractions only depend on the ratios of the surface energies, so points
+    with the same ratios are only constructed once. The structure of each
+    shape that is built, its vertices and faces, is then reused for every
+    other point where it still holds, so a full construction is only
+    needed where the set of active facets or the way they meet changes.
+
+    Parameters
+    ----------
+    normals : :py:attr:`list`
+        Normal of each facet, either a single normal or an array of all of
+        its symmetry equivalent normals
+    energies : :py:attr:`array_like`
+        (..., nfacets) array of surface energies
+
+    Returns
+    -------
+    fractions : :py:attr:`array_like`
+        (..., nfacets) array of area fractions, NaN wherever a surface
+        energy is not positive
+    """
+    planes, facet = _planes(normals)
+    energies = np.asarray(energies, dtype=float)
+    shape = energies.shape
+    energies = np.reshape(energies, (-1, shape[-1]))
+    fractions = np.full(energies.shape, np.nan)
+    usable = np.all(np.isfinite(energies) & (energies > 0), axis=1)
+    if not np.any(usable):
+        return np.reshape(fractions, shape)
+    scaled = energies[usable] / np.amax(energies[usable], axis=1)[:,
+                                                                  np.newaxis]
+    scaled, inverse = np.unique(np.round(scaled, 12), axis=0,
+                                return_inverse=True)
+    offsets = scaled[:, facet]
+    areas = np.zeros(offsets.shape)
+    remaining = np.arange(0, offsets.shape[0])
+    while remaining.size > 0:
+        template = _wulff_template(planes, offsets[remaining[0]])
+        found, valid = _apply_template(template, planes, offsets[remaining])
+        valid[0] = True
+        areas[remaining[valid]] = found[valid]
+        remaining = remaining[~valid]
+    facet_areas = np.zeros(scaled.shape)
+    for i in range(0, scaled.shape[1]):
+        facet_areas[:, i] = np.sum(areas[:, facet == i], axis=1)
+    facet_areas = facet_areas / np.sum(facet_areas, axis=1)[:, np.newaxis]
+    fractions[usable] = facet_areas[np.ravel(inverse)]
+    return np.reshape(fractions, shape)
+
+
+def calculate_facet_fractions(facets, normals, adsorbant, thermochem, T, P):
+    """Calculates the facet area fractions of the Wulff shape over a grid
+    of temperatures and pressures. Each facet takes the energy of its most
+    stable surface, see :py:func:`calculate_facet_energies` and
+    :py:func:`facet_fractions`.
+
+    Parameters
+    ----------
+    facets : :py:attr:`list`
+        One dictionary per facet, see :py:func:`calculate_facet_energies`
+    normals : :py:attr:`list`
+        Normal, or equivalent normals, of each facet
+    adsorbant : :py:attr:`float`
+        dft energy of adsorbing species
+    thermochem : :py:attr:`array_like`
+        Numpy array containing thermochemcial data downloaded from NIST_JANAF
+        for the adsorbing species, or a :py:class:`surfinpy.thermo.ThermoTable`
+    T : :py:attr:`array_like`
+        Temperatures
+    P : :py:attr:`array_like`
+        log10 of the pressures
+
+    Returns
+    -------
+    fractions : :py:attr:`array_like`
+        (nT, nP, nfacets) array of area fractions
+    """
+    SEs = calculate_facet_energies(facets, adsorbant, thermochem, T, P)
+    energies = np.moveaxis(np.amin(SEs, axis=-1), 0, -1)
+    return facet_fractions(normals, energies)